@@ -0,0 +1,79 @@
+"""Memory benchmark for holding large batches of Paper objects.
+
+Run from the repository root:
+
+    python benchmarks/bench_models.py [count]
+"""
+
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from paper_digest.models import Paper, PaperDict  # noqa: E402
+
+SOURCES = ["arxiv", "nature", "aps-prl", "nature-journal"]
+KEYWORDS = ["spintronics", "spin-orbit torque", "antiferromagnet", "mram"]
+
+
+@dataclass(eq=False)
+class DictPaper:
+    """The previous, __dict__-backed layout of Paper, kept for comparison."""
+
+    title: str
+    authors: list[str]
+    link: str
+    published_date: str
+    source: str
+    keywords_matched: list[str] = field(default_factory=list)
+
+
+def _records(count: int) -> list[PaperDict]:
+    # Build every string freshly, as json.loads would, so interning matters.
+    return [
+        {
+            "title": f"Synthetic paper {index}",
+            "authors": [f"Author {index}", f"Author {index + 1}"],
+            "link": f"https://arxiv.org/abs/2401.{index:05d}",
+            "published_date": "".join(["2024-01-", f"{index % 28 + 1:02d}"]),
+            "source": "".join(SOURCES[index % len(SOURCES)]),
+            "keywords_matched": ["".join(KEYWORDS[index % len(KEYWORDS)])],
+        }
+        for index in range(count)
+    ]
+
+
+def _measure(factory: type, count: int) -> int:
+    """Return the bytes still held by the papers once the raw records are gone."""
+    tracemalloc.start()
+    records = _records(count)
+    papers = [
+        factory(
+            title=record["title"],
+            authors=record["authors"],
+            link=record["link"],
+            published_date=record["published_date"],
+            source=record["source"],
+            keywords_matched=record["keywords_matched"],
+        )
+        for record in records
+    ]
+    del records
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del papers
+    return retained
+
+
+def main() -> int:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    for label, factory in (("dict dataclass", DictPaper), ("slotted Paper", Paper)):
+        used = _measure(factory, count)
+        print(f"{label:>15}: {used / count:8.1f} bytes/paper ({count} papers)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,75 @@
+"""Rendering benchmark for large digests and multi-recipient fan-out.
+
+Run from the repository root:
+
+    python benchmarks/bench_rendering.py [count] [recipients]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from paper_digest.config import Config  # noqa: E402
+from paper_digest.emailer import Emailer  # noqa: E402
+from paper_digest.models import Paper  # noqa: E402
+
+SOURCES = ["arxiv", "nature", "aps-prl", "nature-journal"]
+
+
+def _config() -> Config:
+    return Config(
+        smtp_host="",
+        smtp_port=587,
+        smtp_user="",
+        smtp_password="",
+        email_from="from@example.com",
+        email_to="to@example.com",
+        arxiv_url="",
+        nature_url="",
+        user_agent="PaperDigestBench/1.0",
+        keywords=["spin-orbit torque", "mram"],
+    )
+
+
+def _papers(count: int) -> list[Paper]:
+    return [
+        Paper(
+            title=f"Spin-orbit torque <switching> & MRAM, part {index}",
+            authors=[f"Author {index}", f"Author {index + 1}"],
+            link=f"https://arxiv.org/abs/2401.{index:05d}",
+            published_date=f"2024-01-{index % 28 + 1:02d}",
+            source=SOURCES[index % len(SOURCES)],
+            keywords_matched=["spin-orbit torque", "mram"],
+        )
+        for index in range(count)
+    ]
+
+
+def main() -> int:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    recipients = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    papers = _papers(count)
+    emailer = Emailer(_config())
+
+    started = time.perf_counter()
+    message = emailer.build_message(papers)
+    first = time.perf_counter() - started
+    size = len(message.as_bytes())
+
+    started = time.perf_counter()
+    for index in range(recipients):
+        _ = emailer.build_message(papers, f"reader{index}@example.com")
+    repeated = time.perf_counter() - started
+
+    print(f"first digest ({count} papers): {first:7.3f}s, {size / 1024:.0f} KiB")
+    print(
+        f"{recipients} more recipients (cached fragments): {repeated:7.3f}s "
+        f"({repeated / recipients:.3f}s each)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
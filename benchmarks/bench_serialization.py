@@ -0,0 +1,87 @@
+"""Throughput benchmark for batch and JSONL serialization of papers.
+
+Run from the repository root:
+
+    python benchmarks/bench_serialization.py [count]
+"""
+
+import io
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from paper_digest.models import Paper  # noqa: E402
+from paper_digest.serialization import (  # noqa: E402
+    JSON_BACKENDS,
+    available_backends,
+    decode_papers,
+    encode_papers,
+    iter_jsonl,
+    write_jsonl,
+)
+
+
+def _papers(count: int) -> list[Paper]:
+    return [
+        Paper(
+            title=f"Synthetic paper {index} on spin-orbit torque",
+            authors=[f"Author {index}", f"Author {index + 1}"],
+            link=f"https://arxiv.org/abs/2401.{index:05d}",
+            published_date=f"2024-01-{index % 28 + 1:02d}",
+            source="arxiv",
+            keywords_matched=["spin-orbit torque"],
+        )
+        for index in range(count)
+    ]
+
+
+def _timed(label: str, count: int, func) -> None:
+    started = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started
+    print(f"{label:>32}: {elapsed:7.3f}s ({count / elapsed:10.0f} papers/s)")
+
+
+def main() -> int:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    papers = _papers(count)
+
+    _timed(
+        "baseline json.dumps(indent=2)",
+        count,
+        lambda: json.dumps([paper.to_dict() for paper in papers], indent=2),
+    )
+    for backend in available_backends():
+        encoded = encode_papers(papers, backend=backend)
+        _timed(
+            f"encode_papers[{backend}]",
+            count,
+            lambda: encode_papers(papers, backend=backend),
+        )
+        _timed(
+            f"decode_papers[{backend}]",
+            count,
+            lambda: decode_papers(encoded, backend=backend, pause_gc=True),
+        )
+        if backend not in JSON_BACKENDS:
+            continue
+        stream = io.BytesIO()
+        _timed(
+            f"write_jsonl[{backend}]",
+            count,
+            lambda: write_jsonl(stream, papers, backend=backend),
+        )
+        raw = stream.getvalue()
+        _timed(
+            f"iter_jsonl[{backend}]",
+            count,
+            lambda: sum(1 for _ in iter_jsonl(io.BytesIO(raw), backend=backend)),
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,284 @@
+"""Component benchmark suite with a stored regression baseline.
+
+Measures throughput and peak traced memory for feed parsing, arXiv listing
+parsing, keyword matching and PaperStorage on synthetic inputs.
+
+Run from the repository root:
+
+    python benchmarks/bench_suite.py                      # report only
+    python benchmarks/bench_suite.py --save-baseline      # record this machine
+    python benchmarks/bench_suite.py --check              # fail on regressions
+    python benchmarks/bench_suite.py --sizes 100,100000 --state-sizes 1000000
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks.synthetic import (  # noqa: E402
+    arxiv_listing,
+    keyword_list,
+    paper_links,
+    rss_feed,
+    write_state_file,
+)
+from paper_digest.config import Config  # noqa: E402
+from paper_digest.fetchers.arxiv import ArxivFetcher  # noqa: E402
+from paper_digest.fetchers.common import match_keywords  # noqa: E402
+from paper_digest.fetchers.rss import fetch_feed_entries  # noqa: E402
+from paper_digest.storage import PaperStorage  # noqa: E402
+
+BASELINE_FILE = Path(__file__).resolve().parent / "baseline.json"
+COMPONENTS = ("rss", "rdf", "arxiv", "match", "storage-load", "storage-lookup")
+# Small inputs have noisy allocation peaks; ignore growth below this.
+MEMORY_SLACK_KIB = 256.0
+
+
+@dataclass
+class Result:
+    name: str
+    items: int
+    seconds: float
+    items_per_second: float
+    peak_kib: float
+
+
+class _Response:
+    status_code: int = 200
+
+    def __init__(self, text: str) -> None:
+        self.text: str = text
+        self.content: bytes = text.encode("utf-8")
+        self.headers: dict[str, str] = {}
+
+    def raise_for_status(self) -> None:
+        return None
+
+
+class _StaticSession:
+    """Stands in for ``requests.Session`` so only parsing is measured."""
+
+    def __init__(self, text: str) -> None:
+        self.response: _Response = _Response(text)
+
+    def get(self, _url: str, **_kwargs: object) -> _Response:
+        return self.response
+
+
+def _config(keywords: list[str]) -> Config:
+    return Config(
+        smtp_host="",
+        smtp_port=587,
+        smtp_user="",
+        smtp_password="",
+        email_from="",
+        email_to="",
+        arxiv_url="https://arxiv.org/list/cond-mat/new",
+        nature_url="",
+        user_agent="PaperDigestBench/1.0",
+        keywords=keywords,
+    )
+
+
+def _measure(
+    name: str, items: int, run: Callable[[], object], repeat: int
+) -> Result:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        _ = run()
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    try:
+        _ = run()
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return Result(name, items, best, items / best if best else 0.0, peak / 1024)
+
+
+def _feed_case(count: int, rdf: bool) -> Callable[[], object]:
+    session = _StaticSession(rss_feed(count, rdf=rdf))
+    return lambda: fetch_feed_entries(
+        "https://example.org/feed.xml",
+        "PaperDigestBench/1.0",
+        max_entries=count,
+        http=session,  # pyright: ignore[reportArgumentType]
+    )
+
+
+def _arxiv_case(count: int) -> Callable[[], object]:
+    html = arxiv_listing(count)
+    fetcher = ArxivFetcher(_config(keyword_list(10)))
+    return lambda: fetcher._parse_html(html)  # pyright: ignore[reportPrivateUsage]
+
+
+def _match_case(count: int) -> Callable[[], object]:
+    keywords = keyword_list(50)
+    texts = [
+        f"Entry {index}: {' '.join(keywords[index % 7 :: 9])}" for index in range(count)
+    ]
+    return lambda: [match_keywords(text, keywords) for text in texts]
+
+
+def run_suite(
+    components: list[str], sizes: list[int], state_sizes: list[int], repeat: int
+) -> list[Result]:
+    results: list[Result] = []
+    for component in components:
+        if component in ("storage-load", "storage-lookup"):
+            for size in state_sizes:
+                results.append(_storage_result(component, size, repeat))
+            continue
+        for size in sizes:
+            if component in ("rss", "rdf"):
+                run = _feed_case(size, rdf=component == "rdf")
+            elif component == "arxiv":
+                run = _arxiv_case(size)
+            else:
+                run = _match_case(size)
+            results.append(_measure(f"{component}[{size}]", size, run, repeat))
+            print(_format(results[-1]), flush=True)
+    return results
+
+
+def _storage_result(component: str, size: int, repeat: int) -> Result:
+    with tempfile.TemporaryDirectory() as tmp:
+        state_file = Path(tmp) / "seen_papers.json"
+        links = write_state_file(state_file, size)
+        if component == "storage-load":
+            result = _measure(
+                f"{component}[{size}]", size, lambda: PaperStorage(state_file), repeat
+            )
+        else:
+            storage = PaperStorage(state_file)
+            # Half hits, half misses.
+            misses = paper_links(len(links) // 2, "https://example.org/new")
+            probes = links[::2] + misses
+            is_seen = storage.is_seen_link
+            result = _measure(
+                f"{component}[{size}]",
+                len(probes),
+                lambda: sum(1 for link in probes if is_seen(link)),
+                repeat,
+            )
+    print(_format(result), flush=True)
+    return result
+
+
+def _format(result: Result) -> str:
+    return (
+        f"{result.name:<24} {result.items_per_second:>14,.0f} items/s "
+        f"{result.seconds * 1000:>10.1f} ms {result.peak_kib:>12,.0f} KiB peak"
+    )
+
+
+def check_regressions(
+    results: list[Result], baseline: dict[str, dict[str, float]], tolerance: float
+) -> list[str]:
+    failures: list[str] = []
+    for result in results:
+        reference = baseline.get(result.name)
+        if reference is None:
+            # A result with nothing to compare against must not pass silently.
+            failures.append(f"{result.name}: no baseline entry")
+            continue
+        floor = reference["items_per_second"] * (1 - tolerance)
+        if result.items_per_second < floor:
+            failures.append(
+                f"{result.name}: {result.items_per_second:,.0f} items/s is below "
+                f"{floor:,.0f} (baseline {reference['items_per_second']:,.0f})"
+            )
+        ceiling = reference["peak_kib"] * (1 + tolerance) + MEMORY_SLACK_KIB
+        if result.peak_kib > ceiling:
+            failures.append(
+                f"{result.name}: {result.peak_kib:,.0f} KiB peak is above "
+                f"{ceiling:,.0f} (baseline {reference['peak_kib']:,.0f})"
+            )
+    return failures
+
+
+def _int_list(raw: str) -> list[int]:
+    return [int(part) for part in raw.split(",") if part.strip()]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    _ = parser.add_argument("--sizes", type=_int_list, default=[100, 1_000, 10_000])
+    _ = parser.add_argument(
+        "--state-sizes", type=_int_list, default=[10_000, 100_000, 1_000_000]
+    )
+    _ = parser.add_argument(
+        "--only",
+        default=",".join(COMPONENTS),
+        help=f"comma-separated subset of: {', '.join(COMPONENTS)}",
+    )
+    _ = parser.add_argument("--repeat", type=int, default=3)
+    _ = parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    _ = parser.add_argument("--save-baseline", action="store_true")
+    _ = parser.add_argument("--check", action="store_true")
+    _ = parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="allowed fractional slowdown or memory growth (default: 0.25)",
+    )
+    args = parser.parse_args(argv)
+
+    components = [part.strip() for part in args.only.split(",") if part.strip()]
+    unknown = sorted(set(components) - set(COMPONENTS))
+    if unknown:
+        parser.error(f"unknown components: {', '.join(unknown)}")
+
+    results = run_suite(components, args.sizes, args.state_sizes, args.repeat)
+
+    if args.save_baseline:
+        baseline: dict[str, dict[str, float]] = {}
+        if args.baseline.exists():
+            baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        for result in results:
+            baseline[result.name] = {
+                "items_per_second": result.items_per_second,
+                "peak_kib": result.peak_kib,
+            }
+        _ = args.baseline.write_text(
+            json.dumps(baseline, indent=2, sort_keys=True) + "\n", encoding="utf-8"
+        )
+        print(f"baseline written to {args.baseline}")
+
+    if args.check:
+        if not args.baseline.exists():
+            print(
+                f"error: no baseline at {args.baseline}; "
+                "run with --save-baseline first",
+                file=sys.stderr,
+            )
+            return 2
+        failures = check_regressions(
+            results,
+            json.loads(args.baseline.read_text(encoding="utf-8")),
+            args.tolerance,
+        )
+        for failure in failures:
+            print(f"REGRESSION {failure}")
+        if any(failure.endswith("no baseline entry") for failure in failures):
+            print(
+                "Record the missing entries with --save-baseline and the same "
+                "--sizes/--state-sizes",
+                file=sys.stderr,
+            )
+        return 1 if failures else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,172 @@
+"""End-to-end load test of ``run_digest`` against local feed and SMTP servers.
+
+Every combination of the comma-separated ``--latency-ms``, ``--error-rate``
+and ``--entries`` values is one configuration. Each configuration starts a
+fresh local feed server and SMTP sink, then runs the real runner ``--runs``
+times, each time with an empty state directory so every run does the full
+fetch-parse-render-send work.
+
+Run from the repository root:
+
+    python benchmarks/load_test.py
+    python benchmarks/load_test.py --latency-ms 0,100,500 --jitter-ms 50 \\
+        --error-rate 0,0.2 --entries 200,2000 --recipients 8 --runs 10
+"""
+
+import argparse
+import itertools
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks.local_servers import FeedBehaviour, FeedServer, SmtpSink  # noqa: E402
+from benchmarks.synthetic import KEYWORD_POOL  # noqa: E402
+from paper_digest.config import Config, RecipientProfile  # noqa: E402
+from paper_digest.metrics import Metrics  # noqa: E402
+from paper_digest.runner import run_digest  # noqa: E402
+
+
+@dataclass
+class RunSample:
+    seconds: float
+    exit_code: int
+    papers: int
+
+
+def _config(
+    server: FeedServer, sink: SmtpSink, state_dir: Path, recipients: int, workers: int
+) -> Config:
+    profiles = [
+        RecipientProfile(
+            name=f"reader{index}",
+            email=f"reader{index}@example.com",
+            keywords=[KEYWORD_POOL[index % len(KEYWORD_POOL)]],
+        )
+        for index in range(recipients)
+    ]
+    return Config(
+        smtp_host="127.0.0.1",
+        smtp_port=sink.port,
+        smtp_user="",
+        smtp_password="",
+        smtp_starttls=False,
+        email_from="digest@example.com",
+        email_to="reader@example.com",
+        arxiv_url=f"{server.base_url}/arxiv/list/cond-mat/new",
+        nature_url=f"{server.base_url}/ncomms.rss",
+        aps_prl_rss_url=f"{server.base_url}/prl.xml",
+        nature_journal_rss_url=f"{server.base_url}/nature.rss",
+        user_agent="PaperDigestLoadTest/1.0",
+        keywords=KEYWORD_POOL[:4],
+        rss_max_entries=1_000_000,
+        recipient_profiles=profiles,
+        delivery_workers=workers,
+        # Every feed lives on the one local server, which needs no politeness.
+        rate_limit_per_host=0.0,
+        respect_robots_txt=False,
+        state_dir=state_dir,
+    )
+
+
+def run_configuration(
+    behaviour: FeedBehaviour, runs: int, recipients: int, workers: int
+) -> tuple[list[RunSample], FeedServer, SmtpSink]:
+    samples: list[RunSample] = []
+    with FeedServer(behaviour) as server, SmtpSink() as sink:
+        for _ in range(runs):
+            with tempfile.TemporaryDirectory() as tmp:
+                config = _config(server, sink, Path(tmp), recipients, workers)
+                metrics = Metrics()
+                started = time.perf_counter()
+                code = run_digest(config, metrics)
+                elapsed = time.perf_counter() - started
+            samples.append(
+                RunSample(elapsed, code, metrics.counters.get(("papers_new", ()), 0))
+            )
+    return samples, server, sink
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _report(
+    behaviour: FeedBehaviour,
+    samples: list[RunSample],
+    server: FeedServer,
+    sink: SmtpSink,
+) -> str:
+    seconds = [sample.seconds for sample in samples]
+    total = sum(seconds)
+    papers = sum(sample.papers for sample in samples)
+    failed = sum(1 for sample in samples if sample.exit_code != 0)
+    return (
+        f"latency={behaviour.latency * 1000:>5.0f}ms "
+        f"jitter={behaviour.jitter * 1000:>4.0f}ms "
+        f"errors={behaviour.error_rate:>4.0%} entries={behaviour.entries:>6} | "
+        f"p50={_percentile(seconds, 0.5):7.3f}s "
+        f"p90={_percentile(seconds, 0.9):7.3f}s "
+        f"p99={_percentile(seconds, 0.99):7.3f}s "
+        f"mean={statistics.fmean(seconds):7.3f}s | "
+        f"{len(samples) / total:6.2f} runs/s {papers / total:9.1f} papers/s | "
+        f"http={server.requests} (5xx={server.errors}) "
+        f"mails={sink.messages} ({sink.bytes_received / 1024:.0f} KiB) "
+        f"failed_runs={failed}"
+    )
+
+
+def _floats(raw: str) -> list[float]:
+    return [float(part) for part in raw.split(",") if part.strip()]
+
+
+def _ints(raw: str) -> list[int]:
+    return [int(part) for part in raw.split(",") if part.strip()]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    _ = parser.add_argument("--latency-ms", type=_floats, default=[0.0, 100.0])
+    _ = parser.add_argument("--jitter-ms", type=float, default=20.0)
+    _ = parser.add_argument("--error-rate", type=_floats, default=[0.0])
+    _ = parser.add_argument("--entries", type=_ints, default=[200])
+    _ = parser.add_argument("--runs", type=int, default=5)
+    _ = parser.add_argument(
+        "--recipients",
+        type=int,
+        default=0,
+        help="recipient profiles to fan out to (0 sends one EMAIL_TO digest)",
+    )
+    _ = parser.add_argument("--workers", type=int, default=4)
+    _ = parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    # Injected HTTP errors are expected; keep fetcher tracebacks out of the report.
+    logging.basicConfig(level=logging.CRITICAL)
+
+    for latency, error_rate, entries in itertools.product(
+        args.latency_ms, args.error_rate, args.entries
+    ):
+        behaviour = FeedBehaviour(
+            latency=latency / 1000,
+            jitter=args.jitter_ms / 1000,
+            error_rate=error_rate,
+            entries=entries,
+            seed=args.seed,
+        )
+        samples, server, sink = run_configuration(
+            behaviour, args.runs, args.recipients, args.workers
+        )
+        print(_report(behaviour, samples, server, sink), flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,207 @@
+"""Local stand-ins for the feed hosts and the SMTP relay used by load tests.
+
+``FeedServer`` serves synthetic arXiv listings and RSS feeds with configurable
+latency, jitter and error rate. ``SmtpSink`` accepts and counts messages
+without delivering them.
+"""
+
+import random
+import socketserver
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import TracebackType
+
+from benchmarks.synthetic import arxiv_listing, rss_feed
+
+
+@dataclass
+class FeedBehaviour:
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    entries: int = 200
+    seed: int = 0
+
+
+FEED_ROUTES = {
+    "/arxiv/list/cond-mat/new": "arxiv",
+    "/ncomms.rss": "rss",
+    "/prl.xml": "rdf",
+    "/nature.rss": "rss",
+}
+
+
+class _FeedHandler(BaseHTTPRequestHandler):
+    server: "_FeedHTTPServer"
+
+    def do_GET(self) -> None:  # noqa: N802
+        server = self.server
+        behaviour = server.behaviour
+        with server.lock:
+            server.requests += 1
+            delay = behaviour.latency + server.rng.uniform(0, behaviour.jitter)
+            fail = server.rng.random() < behaviour.error_rate
+        if delay:
+            time.sleep(delay)
+
+        body = server.bodies.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+        if fail:
+            with server.lock:
+                server.errors += 1
+            self.send_error(503)
+            return
+
+        is_html = self.path.startswith("/arxiv")
+        content_type = "text/html" if is_html else "application/xml"
+        self.send_response(200)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        _ = self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        return None
+
+
+class _FeedHTTPServer(ThreadingHTTPServer):
+    daemon_threads: bool = True
+
+    def __init__(self, behaviour: FeedBehaviour) -> None:
+        super().__init__(("127.0.0.1", 0), _FeedHandler)
+        self.behaviour: FeedBehaviour = behaviour
+        self.lock: threading.Lock = threading.Lock()
+        self.rng: random.Random = random.Random(behaviour.seed)
+        self.requests: int = 0
+        self.errors: int = 0
+        self.bodies: dict[str, bytes] = {}
+        for path, kind in FEED_ROUTES.items():
+            base_url = f"https://example.org{path.rsplit('.', 1)[0]}"
+            if kind == "arxiv":
+                text = arxiv_listing(behaviour.entries, seed=behaviour.seed)
+            else:
+                text = rss_feed(
+                    behaviour.entries,
+                    rdf=kind == "rdf",
+                    seed=behaviour.seed,
+                    base_url=base_url,
+                )
+            self.bodies[path] = text.encode("utf-8")
+
+
+class FeedServer:
+    def __init__(self, behaviour: FeedBehaviour) -> None:
+        self._server: _FeedHTTPServer = _FeedHTTPServer(behaviour)
+        self._thread: threading.Thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    @property
+    def requests(self) -> int:
+        return self._server.requests
+
+    @property
+    def errors(self) -> int:
+        return self._server.errors
+
+    def __enter__(self) -> "FeedServer":
+        self._thread.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class _SmtpHandler(socketserver.StreamRequestHandler):
+    server: "_SmtpServer"
+
+    def _reply(self, line: str) -> None:
+        _ = self.wfile.write(f"{line}\r\n".encode("ascii"))
+
+    def handle(self) -> None:
+        self._reply("220 localhost paper-digest sink")
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                return
+            command = raw.decode("ascii", "replace").strip().upper()
+            if command.startswith("EHLO"):
+                self._reply("250-localhost")
+                self._reply("250 8BITMIME")
+            elif command.startswith("DATA"):
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                size = 0
+                while True:
+                    line = self.rfile.readline()
+                    if not line or line in (b".\r\n", b".\n"):
+                        break
+                    size += len(line)
+                with self.server.lock:
+                    self.server.messages += 1
+                    self.server.bytes_received += size
+                self._reply("250 OK")
+            elif command.startswith("QUIT"):
+                self._reply("221 Bye")
+                return
+            else:
+                # HELO, MAIL, RCPT, RSET and NOOP are all simply accepted.
+                self._reply("250 OK")
+
+
+class _SmtpServer(socketserver.ThreadingTCPServer):
+    daemon_threads: bool = True
+    allow_reuse_address: bool = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _SmtpHandler)
+        self.lock: threading.Lock = threading.Lock()
+        self.messages: int = 0
+        self.bytes_received: int = 0
+
+
+class SmtpSink:
+    def __init__(self) -> None:
+        self._server: _SmtpServer = _SmtpServer()
+        self._thread: threading.Thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+
+    @property
+    def port(self) -> int:
+        return int(self._server.server_address[1])
+
+    @property
+    def messages(self) -> int:
+        return self._server.messages
+
+    @property
+    def bytes_received(self) -> int:
+        return self._server.bytes_received
+
+    def __enter__(self) -> "SmtpSink":
+        self._thread.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,160 @@
+"""Deterministic generators for synthetic feeds, listings, keywords and state.
+
+Shared by the benchmark suite and the load-test harness. Every generator is
+seeded so repeated runs produce byte-identical inputs.
+"""
+
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from html import escape
+from pathlib import Path
+
+KEYWORD_POOL = [
+    "spintronics",
+    "spin-orbit torque",
+    "antiferromagnet",
+    "mram",
+    "magnon",
+    "skyrmion",
+    "topological insulator",
+    "superconductivity",
+    "quantum anomalous hall",
+    "altermagnet",
+]
+
+FILLER_WORDS = [
+    "thin",
+    "film",
+    "transport",
+    "interface",
+    "phase",
+    "dynamics",
+    "lattice",
+    "electronic",
+    "structure",
+    "measurement",
+    "ultrafast",
+    "response",
+    "symmetry",
+    "heterostructure",
+    "thermal",
+    "coupling",
+]
+
+SECTIONS = ["Condensed Matter and Materials", "Atomic Physics", "Nuclear Physics"]
+
+_EPOCH = datetime(2024, 1, 1, 9, 0, tzinfo=timezone.utc)
+
+
+def keyword_list(count: int, seed: int = 0) -> list[str]:
+    """``count`` distinct lowercase keywords, starting with the real pool."""
+    rng = random.Random(seed)
+    keywords = KEYWORD_POOL[:count]
+    while len(keywords) < count:
+        first, second = rng.choice(FILLER_WORDS), rng.choice(FILLER_WORDS)
+        keywords.append(f"{first} {second} {len(keywords)}")
+    return keywords
+
+
+def _sentence(rng: random.Random, words: int, match_rate: float) -> str:
+    parts = [rng.choice(FILLER_WORDS) for _ in range(words)]
+    if rng.random() < match_rate:
+        parts.insert(rng.randrange(len(parts) + 1), rng.choice(KEYWORD_POOL))
+    return " ".join(parts)
+
+
+def paper_links(count: int, prefix: str = "https://example.org/papers") -> list[str]:
+    return [f"{prefix}/{index:08d}" for index in range(count)]
+
+
+def rss_feed(
+    count: int,
+    rdf: bool = False,
+    match_rate: float = 0.1,
+    seed: int = 0,
+    base_url: str = "https://example.org/papers",
+) -> str:
+    """An RSS 2.0 (or RSS 1.0/RDF) feed with ``count`` items."""
+    rng = random.Random(seed)
+    items: list[str] = []
+    for index in range(count):
+        title = escape(_sentence(rng, 6, match_rate).capitalize())
+        summary = escape(_sentence(rng, 40, match_rate))
+        link = f"{base_url}/{index:08d}?utm_source=rss"
+        published = _EPOCH + timedelta(minutes=index)
+        authors = [f"Author {rng.randrange(10_000)}" for _ in range(rng.randint(1, 6))]
+        section = SECTIONS[index % len(SECTIONS)]
+        if rdf:
+            creators = "".join(f"<dc:creator>{name}</dc:creator>" for name in authors)
+            items.append(
+                f'<item rdf:about="{link}"><title>{title}</title><link>{link}</link>'
+                f"<dc:date>{published.isoformat()}</dc:date>{creators}"
+                f"<dc:subject>{section}</dc:subject>"
+                f"<description>{summary}</description></item>"
+            )
+        else:
+            items.append(
+                f"<item><title>{title}</title><link>{link}</link>"
+                f"<pubDate>{format_datetime(published)}</pubDate>"
+                f"<author>{', '.join(authors)}</author>"
+                f"<category>{section}</category>"
+                f"<description>{summary}</description></item>"
+            )
+
+    if rdf:
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" '
+            'xmlns="http://purl.org/rss/1.0/" '
+            'xmlns:dc="http://purl.org/dc/elements/1.1/">'
+            f'<channel rdf:about="{base_url}"><title>Synthetic RDF</title>'
+            f"<link>{base_url}</link><description>Synthetic</description></channel>"
+            + "".join(items)
+            + "</rdf:RDF>\n"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n<rss version="2.0"><channel>'
+        f"<title>Synthetic RSS</title><link>{base_url}</link>"
+        + "".join(items)
+        + "</channel></rss>\n"
+    )
+
+
+def arxiv_listing(count: int, match_rate: float = 0.1, seed: int = 0) -> str:
+    """An arXiv ``/list/<category>/new`` page with ``count`` entries."""
+    rng = random.Random(seed)
+    entries: list[str] = []
+    for index in range(count):
+        arxiv_id = f"2401.{index:05d}"
+        title = escape(_sentence(rng, 8, match_rate).capitalize())
+        abstract = escape(_sentence(rng, 120, match_rate))
+        authors = "".join(
+            f"<a href='/a/author_{rng.randrange(10_000)}'>Author {index}-{n}</a>"
+            for n in range(rng.randint(1, 8))
+        )
+        entries.append(
+            f"<dt><a href='/abs/{arxiv_id}' title='Abstract'>arXiv:{arxiv_id}</a></dt>"
+            "<dd><div class='meta'>"
+            "<div class='list-title mathjax'>"
+            f"<span class='descriptor'>Title:</span> {title}</div>"
+            f"<div class='list-authors'>{authors}</div>"
+            f"<p class='mathjax'>{abstract}</p>"
+            "</div></dd>"
+        )
+    return (
+        "<!DOCTYPE html><html><head><title>New submissions</title></head><body>"
+        "<h3>New submissions</h3><dl>" + "".join(entries) + "</dl></body></html>"
+    )
+
+
+def write_state_file(path: Path, count: int, queued: int = 0) -> list[str]:
+    """Write a ``PaperStorage`` state file holding ``count`` seen links."""
+    links = paper_links(count + queued)
+    state: dict[str, list[str]] = {"seen_links": links[:count]}
+    if queued:
+        state["queued_links"] = links[count:]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _ = path.write_text(json.dumps(state, indent=2), encoding="utf-8")
+    return links
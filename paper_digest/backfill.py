@@ -0,0 +1,248 @@
+# pyright: reportMissingImports=false, reportUnknownVariableType=false, reportUnknownMemberType=false, reportUnknownArgumentType=false
+
+import hashlib
+import json
+import logging
+import os
+import re
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field, replace
+from datetime import date, timedelta
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import requests
+
+from paper_digest.config import Config
+from paper_digest.fetchers.common import match_keywords, normalize_date, request_headers
+from paper_digest.fetchers.rss import parse_feed
+from paper_digest.http_archive import open_http_session
+from paper_digest.models import Paper
+from paper_digest.parsing import current as current_parser
+from paper_digest.resilience import RetryPolicy, get_with_retries
+from paper_digest.serialization import write_jsonl
+from paper_digest.storage import PaperStorage
+
+logger = logging.getLogger(__name__)
+
+ARXIV_PAGE_SIZE = 200
+_ARXIV_ID = re.compile(r"/abs/(?P<id>[^/]+?)(?:v\d+)?$")
+
+
+@dataclass(frozen=True)
+class DateWindow:
+    start: date
+    end: date
+
+    @property
+    def key(self) -> str:
+        return f"{self.start.isoformat()}..{self.end.isoformat()}"
+
+
+def split_windows(start: date, end: date, days: int) -> list[DateWindow]:
+    """Split the inclusive range ``start``..``end`` into ``days``-long windows."""
+    if days < 1:
+        raise ValueError(f"Window length must be at least one day: {days}")
+    windows: list[DateWindow] = []
+    cursor = start
+    while cursor <= end:
+        window_end = min(cursor + timedelta(days=days - 1), end)
+        windows.append(DateWindow(cursor, window_end))
+        cursor = window_end + timedelta(days=1)
+    return windows
+
+
+@dataclass
+class BackfillCheckpoint:
+    """Windows already harvested for one backfill job, keyed by window."""
+
+    job: str
+    completed: dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path, job: str) -> "BackfillCheckpoint":
+        try:
+            loaded: object = json.loads(path.read_text(encoding="utf-8"))  # pyright: ignore[reportAny]
+        except FileNotFoundError:
+            return cls(job)
+        except (OSError, json.JSONDecodeError) as exc:
+            logger.warning("Ignoring unreadable backfill checkpoint %s: %s", path, exc)
+            return cls(job)
+        if not isinstance(loaded, dict) or loaded.get("job") != job:
+            return cls(job)
+        completed = loaded.get("completed", {})
+        if not isinstance(completed, dict):
+            return cls(job)
+        return cls(
+            job,
+            {str(key): int(value) for key, value in completed.items()},
+        )
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        _ = tmp_path.write_text(
+            json.dumps({"job": self.job, "completed": self.completed}, indent=2),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, path)
+
+
+def arxiv_category(arxiv_url: str) -> str:
+    match = re.search(r"/list/([^/]+)/", arxiv_url)
+    if match is None:
+        raise ValueError(f"Cannot find an arXiv category in {arxiv_url}")
+    return match.group(1)
+
+
+def arxiv_search_query(category: str, window: DateWindow) -> str:
+    # A bare archive such as "cond-mat" has to be widened to its subjects.
+    subject = category if "." in category else f"{category}*"
+    return (
+        f"cat:{subject} AND submittedDate:"
+        f"[{window.start:%Y%m%d}0000 TO {window.end:%Y%m%d}2359]"
+    )
+
+
+def canonical_arxiv_link(link: str) -> str:
+    """Map API entry ids (``http://arxiv.org/abs/2401.00001v2``) to listing links."""
+    match = _ARXIV_ID.search(link)
+    if match is None:
+        return link
+    return f"https://arxiv.org/abs/{match.group('id')}"
+
+
+def harvest_arxiv_window(
+    config: Config,
+    window: DateWindow,
+    http: requests.Session,
+) -> list[Paper]:
+    query = arxiv_search_query(arxiv_category(config.arxiv_url), window)
+    papers: list[Paper] = []
+    start = 0
+    while True:
+        response = get_with_retries(
+            http.get,
+            config.arxiv_api_url,
+            RetryPolicy.from_config(config),
+            params={
+                "search_query": query,
+                "start": start,
+                "max_results": ARXIV_PAGE_SIZE,
+                "sortBy": "submittedDate",
+                "sortOrder": "ascending",
+            },
+            headers=request_headers(config.user_agent),
+            timeout=60,
+        )
+        page = current_parser().run(parse_feed, response.text)
+
+        for entry in page["entries"]:
+            matched = match_keywords(
+                f"{entry['title']} {entry['summary']}", config.keywords
+            )
+            if not matched:
+                continue
+            papers.append(
+                Paper(
+                    title=" ".join(entry["title"].split()),
+                    authors=entry["authors"],
+                    link=canonical_arxiv_link(entry["link"]),
+                    published_date=normalize_date(entry["published"]),
+                    source="arxiv",
+                    keywords_matched=matched,
+                )
+            )
+
+        if page["entry_count"] < ARXIV_PAGE_SIZE:
+            return papers
+        start += ARXIV_PAGE_SIZE
+
+
+def backfill_job(config: Config, since: date, until: date, window_days: int) -> str:
+    keywords = hashlib.sha256("\0".join(sorted(config.keywords)).encode("utf-8"))
+    return (
+        f"arxiv-{arxiv_category(config.arxiv_url)}-{since.isoformat()}-"
+        f"{until.isoformat()}-{window_days}d-{keywords.hexdigest()[:8]}"
+    )
+
+
+def run_backfill(
+    config: Config,
+    since: date,
+    until: date,
+    window_days: int = 7,
+) -> int:
+    """Harvest matching arXiv papers submitted between ``since`` and ``until``.
+
+    Unseen matches are appended to ``<job>.jsonl`` under
+    ``config.backfill_dir`` and marked as seen, so regular digests do not
+    email them. Completed windows are checkpointed, so rerunning the same
+    command resumes where it stopped.
+    """
+    job = backfill_job(config, since, until, window_days)
+    checkpoint_path = config.backfill_dir / f"{job}.checkpoint.json"
+    archive_path = config.backfill_dir / f"{job}.jsonl"
+    checkpoint = BackfillCheckpoint.load(checkpoint_path, job)
+    windows = [
+        window
+        for window in split_windows(since, until, window_days)
+        if window.key not in checkpoint.completed
+    ]
+    logger.info(
+        "Backfill %s: %d window(s) to harvest, %d already done",
+        job,
+        len(windows),
+        len(checkpoint.completed),
+    )
+
+    storage = PaperStorage(config.state_file)
+    api_host = urlsplit(config.arxiv_api_url).netloc.lower()
+    http = open_http_session(
+        replace(
+            config,
+            host_rate_limits={
+                api_host: 1 / config.backfill_request_interval
+                if config.backfill_request_interval > 0
+                else 0.0,
+                **config.host_rate_limits,
+            },
+        )
+    )
+    failures = 0
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, config.backfill_workers)) as pool:
+            futures: dict[Future[list[Paper]], DateWindow] = {
+                pool.submit(harvest_arxiv_window, config, window, http): window
+                for window in windows
+            }
+            for future in as_completed(futures):
+                window = futures[future]
+                try:
+                    papers = future.result()
+                except (requests.RequestException, ValueError):
+                    logger.exception("Backfill window %s failed", window.key)
+                    failures += 1
+                    continue
+                # Skips papers already emailed, and duplicates from a window
+                # that was harvested before an interruption but not checkpointed.
+                papers = [paper for paper in papers if not storage.is_seen(paper)]
+                _archive(archive_path, papers)
+                storage.mark_delivered(paper.link for paper in papers)
+                checkpoint.completed[window.key] = len(papers)
+                checkpoint.save(checkpoint_path)
+                logger.info("Backfill window %s: %d paper(s)", window.key, len(papers))
+    finally:
+        http.close()
+
+    total = sum(checkpoint.completed.values())
+    logger.info("Backfill %s: %d paper(s) archived in %s", job, total, archive_path)
+    return 1 if failures else 0
+
+
+def _archive(path: Path, papers: list[Paper]) -> None:
+    if not papers:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("ab") as archive:
+        _ = write_jsonl(archive, papers)
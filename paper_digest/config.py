@@ -1,3 +1,4 @@
+import json
 import os
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -9,6 +10,191 @@ _ = load_dotenv()
 BASE_DIR = Path(__file__).resolve().parent.parent
 STATE_DIR = BASE_DIR / "state"
 STATE_FILE = STATE_DIR / "seen_papers.json"
+WATERMARK_FILE = STATE_DIR / "watermarks.json"
+OUTBOX_DIR = STATE_DIR / "outbox"
+POLL_HISTORY_FILE = STATE_DIR / "poll_history.json"
+METRICS_DIR = STATE_DIR / "metrics"
+PROFILE_DIR = STATE_DIR / "profiles"
+HTTP_ARCHIVE_DIR = STATE_DIR / "http_archive"
+BACKFILL_DIR = STATE_DIR / "backfill"
+CIRCUIT_BREAKER_FILE = STATE_DIR / "circuit_breakers.json"
+FEED_METADATA_FILE = STATE_DIR / "feed_metadata.json"
+
+
+# Raw feed fields the generic feed fetcher falls back on when the standard
+# category, date or author fields are empty.
+SECTION_FIELDS = ("dc_subject", "prism_section", "dc:subject", "prism:section")
+DATE_FIELDS = (
+    "dc_date",
+    "dc:date",
+    "prism_publicationdate",
+    "prism:publicationdate",
+    "prism_publicationDate",
+    "prism:publicationDate",
+)
+AUTHOR_FIELDS = ("dc_creator", "dc:creator", "author")
+PARSER_BACKENDS = ("", "inline", "process")
+
+
+@dataclass
+class FeedSource:
+    """One RSS or Atom feed followed by the generic feed fetcher.
+
+    ``section_filter`` keeps entries whose categories or section fields
+    contain it; ``categories`` keeps entries with one of those exact
+    categories. Both are case-insensitive and empty means no filter.
+    ``parser`` forces where the feed is parsed: ``"inline"`` or
+    ``"process"``; empty uses the recorded validation metadata.
+    """
+
+    source: str
+    url: str
+    name: str
+    section_filter: str = ""
+    categories: list[str] = field(default_factory=list)
+    section_fields: tuple[str, ...] = SECTION_FIELDS
+    date_fields: tuple[str, ...] = DATE_FIELDS
+    author_fields: tuple[str, ...] = AUTHOR_FIELDS
+    parser: str = ""
+
+    @property
+    def extra_fields(self) -> tuple[str, ...]:
+        return self.section_fields + self.date_fields + self.author_fields
+
+
+def _feed_fields(
+    item: dict[str, object], key: str, default: tuple[str, ...], path: Path
+) -> tuple[str, ...]:
+    value = item.get(key)
+    if value is None:
+        return default
+    if not isinstance(value, list):
+        raise ValueError(f"Feed {key} must be a list in {path}: {item!r}")
+    return tuple(str(name).strip() for name in value if str(name).strip())
+
+
+def load_feed_sources(path: Path) -> list[FeedSource]:
+    loaded: object = json.loads(path.read_text(encoding="utf-8"))  # pyright: ignore[reportAny]
+    if not isinstance(loaded, list):
+        raise ValueError(f"Feeds file must contain a JSON list: {path}")
+
+    feeds: list[FeedSource] = []
+    # Sources key watermarks and seen state, so they must be unique.
+    taken = {"arxiv"}
+    for item in loaded:
+        if not isinstance(item, dict):
+            raise ValueError(f"Invalid feed in {path}: {item!r}")
+        source = str(item.get("source", "")).strip().lower()
+        url = str(item.get("url", "")).strip()
+        if not source or not url:
+            raise ValueError(f"Feed without source or url in {path}: {item!r}")
+        if source in taken:
+            raise ValueError(f"Duplicate feed source {source!r} in {path}")
+        taken.add(source)
+        parser = str(item.get("parser", "")).strip().lower()
+        if parser not in PARSER_BACKENDS:
+            raise ValueError(f"Unknown feed parser {parser!r} in {path}: {item!r}")
+        feeds.append(
+            FeedSource(
+                source=source,
+                url=url,
+                name=str(item.get("name", "")).strip() or source,
+                section_filter=str(item.get("section_filter", "")).strip(),
+                categories=[
+                    category.lower()
+                    for category in _feed_fields(item, "categories", (), path)
+                ],
+                section_fields=_feed_fields(
+                    item, "section_fields", SECTION_FIELDS, path
+                ),
+                date_fields=_feed_fields(item, "date_fields", DATE_FIELDS, path),
+                author_fields=_feed_fields(
+                    item, "author_fields", AUTHOR_FIELDS, path
+                ),
+                parser=parser,
+            )
+        )
+    return feeds
+
+
+@dataclass
+class RecipientProfile:
+    name: str
+    email: str
+    keywords: list[str]
+
+
+def load_recipient_profiles(path: Path) -> list[RecipientProfile]:
+    loaded: object = json.loads(path.read_text(encoding="utf-8"))  # pyright: ignore[reportAny]
+    if not isinstance(loaded, list):
+        raise ValueError(f"Recipients file must contain a JSON list: {path}")
+
+    profiles: list[RecipientProfile] = []
+    names: set[str] = set()
+    for item in loaded:
+        if not isinstance(item, dict):
+            raise ValueError(f"Invalid recipient profile in {path}: {item!r}")
+        email = str(item.get("email", "")).strip()
+        if not email:
+            raise ValueError(f"Recipient profile without email in {path}: {item!r}")
+        keywords_obj = item.get("keywords", [])
+        if not isinstance(keywords_obj, list):
+            raise ValueError(f"Recipient keywords must be a list in {path}: {item!r}")
+        # Papers are assigned by profile name, so names must be unique.
+        name = str(item.get("name", "")).strip() or email
+        if name in names:
+            raise ValueError(f"Duplicate recipient profile name in {path}: {name!r}")
+        names.add(name)
+        profiles.append(
+            RecipientProfile(
+                name=name,
+                email=email,
+                keywords=[
+                    str(keyword).strip().lower()
+                    for keyword in keywords_obj
+                    if str(keyword).strip()
+                ],
+            )
+        )
+    return profiles
+
+
+def parse_source_intervals(raw: str) -> dict[str, int]:
+    intervals: dict[str, int] = {}
+    for part in raw.split(","):
+        if not part.strip():
+            continue
+        source, sep, seconds = part.partition("=")
+        if not sep or not source.strip():
+            raise ValueError(f"Invalid source poll interval: {part!r}")
+        intervals[source.strip().lower()] = int(seconds)
+    return intervals
+
+
+def parse_host_rates(raw: str) -> dict[str, float]:
+    rates: dict[str, float] = {}
+    for part in raw.split(","):
+        if not part.strip():
+            continue
+        host, sep, rate = part.partition("=")
+        if not sep or not host.strip():
+            raise ValueError(f"Invalid host rate limit: {part!r}")
+        rates[host.strip().lower()] = float(rate)
+    return rates
+
+
+def parse_source_timeouts(raw: str) -> dict[str, tuple[float, float]]:
+    """Parse ``source=connect:read`` pairs; a single number sets both timeouts."""
+    timeouts: dict[str, tuple[float, float]] = {}
+    for part in raw.split(","):
+        if not part.strip():
+            continue
+        source, sep, value = part.partition("=")
+        if not sep or not source.strip():
+            raise ValueError(f"Invalid source timeout: {part!r}")
+        connect, _, read = value.partition(":")
+        timeouts[source.strip().lower()] = (float(connect), float(read or connect))
+    return timeouts
 
 
 @dataclass
@@ -28,6 +214,108 @@ class Config:
     nature_journal_rss_url: str = "https://www.nature.com/nature/current_issue/rss"
     nature_journal_category_allowlist: list[str] = field(default_factory=list)
     rss_max_entries: int = 200
+    outbox_enabled: bool = False
+    recipient_profiles: list[RecipientProfile] = field(default_factory=list)
+    delivery_workers: int = 4
+    max_papers_per_message: int = 0
+    max_message_bytes: int = 0
+    poll_interval: int = 3600
+    source_poll_intervals: dict[str, int] = field(default_factory=dict)
+    adaptive_polling: bool = False
+    min_poll_interval: int = 300
+    max_poll_interval: int = 21600
+    metrics_enabled: bool = False
+    # Overrides metrics_output_dir; None keeps metrics under state_dir.
+    metrics_dir: Path | None = None
+    smtp_starttls: bool = True
+    smtp_timeout: float = 60.0
+    state_dir: Path = STATE_DIR
+    http_record: bool = False
+    http_replay: Path | None = None
+    http_replay_realtime: bool = True
+    parse_workers: int = 0
+    arxiv_api_url: str = "https://export.arxiv.org/api/query"
+    backfill_workers: int = 4
+    backfill_request_interval: float = 3.0
+    fetch_workers: int = 4
+    rate_limit_per_host: float = 1.0
+    rate_limit_burst: int = 2
+    host_rate_limits: dict[str, float] = field(default_factory=dict)
+    respect_robots_txt: bool = True
+    max_host_wait: float = 300.0
+    fetch_retries: int = 3
+    retry_base_delay: float = 1.0
+    retry_max_delay: float = 30.0
+    connect_timeout: float = 10.0
+    read_timeout: float = 30.0
+    source_timeouts: dict[str, tuple[float, float]] = field(default_factory=dict)
+    breaker_threshold: int = 3
+    breaker_cooldown: float = 1800.0
+    run_deadline: float = 0.0
+    feeds: list[FeedSource] = field(default_factory=list)
+    feeds_file: Path | None = None
+
+    def __post_init__(self) -> None:
+        # Profiles replace KEYWORDS as they replace EMAIL_TO. Fetchers match
+        # the union of the profiles' keywords, so every matched paper has a
+        # recipient; each profile's digest is then narrowed to its own subset.
+        if not self.recipient_profiles:
+            return
+        merged: list[str] = []
+        for profile in self.recipient_profiles:
+            for keyword in profile.keywords:
+                if keyword not in merged:
+                    merged.append(keyword)
+        self.keywords = merged
+
+    def poll_interval_for(self, source: str) -> int:
+        return self.source_poll_intervals.get(source, self.poll_interval)
+
+    def timeout_for(self, source: str) -> tuple[float, float]:
+        """``(connect, read)`` timeouts in seconds for requests made by ``source``."""
+        return self.source_timeouts.get(
+            source, (self.connect_timeout, self.read_timeout)
+        )
+
+    @property
+    def state_file(self) -> Path:
+        return self.state_dir / STATE_FILE.name
+
+    @property
+    def watermark_file(self) -> Path:
+        return self.state_dir / WATERMARK_FILE.name
+
+    @property
+    def outbox_dir(self) -> Path:
+        return self.state_dir / OUTBOX_DIR.name
+
+    @property
+    def poll_history_file(self) -> Path:
+        return self.state_dir / POLL_HISTORY_FILE.name
+
+    @property
+    def profile_dir(self) -> Path:
+        return self.state_dir / PROFILE_DIR.name
+
+    @property
+    def metrics_output_dir(self) -> Path:
+        return self.metrics_dir or self.state_dir / METRICS_DIR.name
+
+    @property
+    def http_archive_dir(self) -> Path:
+        return self.state_dir / HTTP_ARCHIVE_DIR.name
+
+    @property
+    def backfill_dir(self) -> Path:
+        return self.state_dir / BACKFILL_DIR.name
+
+    @property
+    def circuit_breaker_file(self) -> Path:
+        return self.state_dir / CIRCUIT_BREAKER_FILE.name
+
+    @property
+    def feed_metadata_file(self) -> Path:
+        return self.state_dir / FEED_METADATA_FILE.name
 
     @classmethod
     def from_env(cls) -> "Config":
@@ -44,6 +332,20 @@ class Config:
             if part.strip()
         ]
 
+        metrics_dir = os.getenv("METRICS_DIR", "").strip()
+        feeds_file = os.getenv("FEEDS_FILE", "").strip()
+        # A missing feeds file is a feed list not yet created by --import-opml.
+        feeds = (
+            load_feed_sources(Path(feeds_file))
+            if feeds_file and Path(feeds_file).exists()
+            else []
+        )
+        recipients_file = os.getenv("RECIPIENTS_FILE", "").strip()
+        recipient_profiles = (
+            load_recipient_profiles(Path(recipients_file)) if recipients_file else []
+        )
+        http_replay = os.getenv("HTTP_REPLAY", "").strip()
+
         return cls(
             smtp_host=os.getenv("SMTP_HOST", ""),
             smtp_port=int(os.getenv("SMTP_PORT", "587")),
@@ -65,6 +367,60 @@ class Config:
             ),
             nature_journal_category_allowlist=nature_journal_category_allowlist,
             rss_max_entries=int(os.getenv("RSS_MAX_ENTRIES", "200")),
+            outbox_enabled=os.getenv("OUTBOX_ENABLED", "").strip().lower()
+            in ("1", "true", "yes"),
+            recipient_profiles=recipient_profiles,
+            delivery_workers=int(os.getenv("DELIVERY_WORKERS", "4")),
+            max_papers_per_message=int(os.getenv("MAX_PAPERS_PER_MESSAGE", "0")),
+            max_message_bytes=int(os.getenv("MAX_MESSAGE_BYTES", "0")),
+            poll_interval=int(os.getenv("POLL_INTERVAL", "3600")),
+            source_poll_intervals=parse_source_intervals(
+                os.getenv("SOURCE_POLL_INTERVALS", "")
+            ),
+            adaptive_polling=os.getenv("ADAPTIVE_POLLING", "").strip().lower()
+            in ("1", "true", "yes"),
+            min_poll_interval=int(os.getenv("MIN_POLL_INTERVAL", "300")),
+            max_poll_interval=int(os.getenv("MAX_POLL_INTERVAL", "21600")),
+            metrics_enabled=os.getenv("METRICS_ENABLED", "").strip().lower()
+            in ("1", "true", "yes"),
+            metrics_dir=Path(metrics_dir) if metrics_dir else None,
+            smtp_starttls=os.getenv("SMTP_STARTTLS", "true").strip().lower()
+            not in ("0", "false", "no"),
+            smtp_timeout=float(os.getenv("SMTP_TIMEOUT", "60")),
+            state_dir=Path(os.getenv("STATE_DIR", "").strip() or STATE_DIR),
+            http_record=os.getenv("HTTP_RECORD", "").strip().lower()
+            in ("1", "true", "yes"),
+            http_replay=Path(http_replay) if http_replay else None,
+            http_replay_realtime=os.getenv("HTTP_REPLAY_REALTIME", "true")
+            .strip()
+            .lower()
+            not in ("0", "false", "no"),
+            parse_workers=int(os.getenv("PARSE_WORKERS", "0")),
+            arxiv_api_url=os.getenv(
+                "ARXIV_API_URL", "https://export.arxiv.org/api/query"
+            ),
+            backfill_workers=int(os.getenv("BACKFILL_WORKERS", "4")),
+            backfill_request_interval=float(
+                os.getenv("BACKFILL_REQUEST_INTERVAL", "3.0")
+            ),
+            fetch_workers=int(os.getenv("FETCH_WORKERS", "4")),
+            rate_limit_per_host=float(os.getenv("RATE_LIMIT_PER_HOST", "1.0")),
+            rate_limit_burst=int(os.getenv("RATE_LIMIT_BURST", "2")),
+            host_rate_limits=parse_host_rates(os.getenv("HOST_RATE_LIMITS", "")),
+            respect_robots_txt=os.getenv("RESPECT_ROBOTS_TXT", "true").strip().lower()
+            not in ("0", "false", "no"),
+            max_host_wait=float(os.getenv("MAX_HOST_WAIT", "300")),
+            fetch_retries=int(os.getenv("FETCH_RETRIES", "3")),
+            retry_base_delay=float(os.getenv("RETRY_BASE_DELAY", "1.0")),
+            retry_max_delay=float(os.getenv("RETRY_MAX_DELAY", "30")),
+            connect_timeout=float(os.getenv("CONNECT_TIMEOUT", "10")),
+            read_timeout=float(os.getenv("READ_TIMEOUT", "30")),
+            source_timeouts=parse_source_timeouts(os.getenv("SOURCE_TIMEOUTS", "")),
+            breaker_threshold=int(os.getenv("BREAKER_THRESHOLD", "3")),
+            breaker_cooldown=float(os.getenv("BREAKER_COOLDOWN", "1800")),
+            run_deadline=float(os.getenv("RUN_DEADLINE", "0")),
+            feeds=feeds,
+            feeds_file=Path(feeds_file) if feeds_file else None,
             user_agent=os.getenv(
                 "USER_AGENT", "Mozilla/5.0 (compatible; PaperDigest/1.0)"
             ),
@@ -0,0 +1,173 @@
+# pyright: reportMissingImports=false, reportUnknownVariableType=false, reportUnknownMemberType=false, reportUnknownArgumentType=false
+
+import logging
+import signal
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from types import FrameType
+
+import requests
+
+from paper_digest.config import Config
+from paper_digest.emailer import Emailer
+from paper_digest.fetchers.common import Fetcher
+from paper_digest.http_archive import open_http_session
+from paper_digest.metrics import NULL_METRICS, Metrics, collecting
+from paper_digest.parsing import ParseExecutor, create_parse_executor, parsing_with
+from paper_digest.polling import AdaptivePoller
+from paper_digest.runner import (
+    build_fetchers,
+    deliver_papers,
+    fetch_new_papers,
+    open_circuit_breakers,
+    write_metrics,
+)
+from paper_digest.smtp_session import SmtpSession
+from paper_digest.storage import PaperStorage
+from paper_digest.watermarks import WatermarkStore
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ScheduledSource:
+    fetcher: Fetcher
+    interval: float
+    next_run: float = 0.0
+
+
+class Daemon:
+    def __init__(
+        self,
+        config: Config,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.config: Config = config
+        self.clock: Callable[[], float] = clock
+        self.wall_clock: Callable[[], float] = wall_clock
+        self._stopping: threading.Event = threading.Event()
+        self.http: requests.Session = open_http_session(config)
+        self.session: SmtpSession = SmtpSession(config)
+        self.parser: ParseExecutor = create_parse_executor(config.parse_workers)
+        self.storage: PaperStorage = PaperStorage(config.state_file)
+        self.watermarks: WatermarkStore = WatermarkStore(config.watermark_file)
+        self.emailer: Emailer = Emailer(config, self.session)
+        self.poller: AdaptivePoller | None = (
+            AdaptivePoller(
+                config.poll_history_file,
+                min_interval=config.min_poll_interval,
+                max_interval=config.max_poll_interval,
+            )
+            if config.adaptive_polling
+            else None
+        )
+        self.sources: list[ScheduledSource] = [
+            ScheduledSource(fetcher, config.poll_interval_for(fetcher.SOURCE))
+            for fetcher in build_fetchers(
+                config,
+                self.storage,
+                self.watermarks,
+                self.http,
+                open_circuit_breakers(config),
+            )
+        ]
+
+    def due_sources(self, now: float) -> list[ScheduledSource]:
+        return [source for source in self.sources if source.next_run <= now]
+
+    def seconds_until_next(self, now: float) -> float:
+        if not self.sources:
+            return float(self.config.poll_interval)
+        return max(0.0, min(source.next_run for source in self.sources) - now)
+
+    def poll(self, sources: list[ScheduledSource]) -> int:
+        metrics = Metrics() if self.config.metrics_enabled else NULL_METRICS
+        with collecting(metrics), parsing_with(self.parser):
+            code = self._poll(sources)
+        metrics.set_gauge("last_run_exit_code", code)
+        write_metrics(metrics, self.config)
+        return code
+
+    def _poll(self, sources: list[ScheduledSource]) -> int:
+        now = self.clock()
+        # With a large feed list many sources fall due together; fetch them
+        # on the bounded worker pool rather than one after another.
+        new_papers = fetch_new_papers(
+            [source.fetcher for source in sources],
+            self.storage,
+            self.config.fetch_workers,
+        )
+        for source in sources:
+            source.next_run = now + self._next_delay(source)
+        code = 1
+        try:
+            code = deliver_papers(
+                self.config,
+                self.emailer,
+                self.session,
+                self.storage,
+                self.watermarks,
+                new_papers,
+            )
+        finally:
+            # The store outlives this poll: a watermark left staged here would
+            # be committed by the next successful poll, past papers never sent.
+            if code != 0:
+                self.watermarks.discard()
+        return code
+
+    def _next_delay(self, source: ScheduledSource) -> float:
+        if self.poller is None:
+            return source.interval
+        # Must run before deliver_papers commits this poll's watermarks.
+        name = source.fetcher.SOURCE
+        now = self.wall_clock()
+        self.poller.record(name, self.watermarks.changed(name), now)
+        return self.poller.next_delay(name, source.interval, now)
+
+    def run(self) -> int:
+        try:
+            while not self._stopping.is_set():
+                due = self.due_sources(self.clock())
+                if due:
+                    try:
+                        _ = self.poll(due)
+                    except Exception:
+                        logger.exception("Poll failed; will retry on schedule")
+                    continue
+                _ = self._stopping.wait(self.seconds_until_next(self.clock()))
+        finally:
+            self.close()
+        return 0
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    def close(self) -> None:
+        self.session.close()
+        self.parser.close()
+        self.http.close()
+
+    def install_signal_handlers(self) -> None:
+        def handle(signum: int, _frame: FrameType | None) -> None:
+            logger.info("Received %s, shutting down", signal.Signals(signum).name)
+            self.stop()
+
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            _ = signal.signal(signum, handle)
+
+
+def run_daemon(config: Config) -> int:
+    daemon = Daemon(config)
+    daemon.install_signal_handlers()
+    logger.info(
+        "Daemon started, polling %s",
+        ", ".join(
+            f"{source.fetcher.SOURCE} every {source.interval:.0f}s"
+            for source in daemon.sources
+        ),
+    )
+    return daemon.run()
@@ -1,124 +1,118 @@
 # pyright: reportMissingImports=false, reportUnknownVariableType=false, reportUnknownParameterType=false, reportUnknownMemberType=false, reportUnknownArgumentType=false, reportUnusedCallResult=false
 
-import smtplib
+from collections.abc import Callable
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 
 from paper_digest.config import Config
+from paper_digest.metrics import current
 from paper_digest.models import Paper
+from paper_digest.rendering import SOURCE_NAMES, DigestRenderer, matched_keywords
+from paper_digest.smtp_session import SmtpSession
+
+
+def source_names(config: Config) -> dict[str, str]:
+    if not config.feeds:
+        return SOURCE_NAMES
+    names = {"arxiv": SOURCE_NAMES["arxiv"]}
+    names.update((feed.source, feed.name) for feed in config.feeds)
+    return names
+
+
+def send_parts(
+    session: SmtpSession,
+    messages: list[tuple[MIMEMultipart, list[Paper]]],
+    on_sent: Callable[[list[Paper]], None] | None = None,
+) -> list[tuple[MIMEMultipart, list[Paper]]]:
+    sent: list[tuple[MIMEMultipart, list[Paper]]] = []
+    for message, papers in messages:
+        session.send(message)
+        sent.append((message, papers))
+        if on_sent is not None:
+            on_sent(papers)
+    return sent
 
 
 class Emailer:
-    def __init__(self, config: Config) -> None:
+    def __init__(self, config: Config, session: SmtpSession | None = None) -> None:
         self.config: Config = config
+        self.session: SmtpSession | None = session
+        self.renderer: DigestRenderer = DigestRenderer(
+            source_names=source_names(config)
+        )
 
-    def send_digest(self, papers: list[Paper]) -> bool:
+    def send_digest(
+        self,
+        papers: list[Paper],
+        to: str | None = None,
+        on_sent: Callable[[list[Paper]], None] | None = None,
+    ) -> list[tuple[MIMEMultipart, list[Paper]]]:
+        """Send ``papers`` in as many parts as the size limits need.
+
+        Returns the parts that went out, in order. ``on_sent`` gets each
+        part's papers as soon as that part is sent, so when a later part
+        raises, the earlier ones are already recorded.
+        """
         if not papers:
-            return False
+            return []
 
-        message = self._build_message(papers)
-        with smtplib.SMTP(self.config.smtp_host, self.config.smtp_port) as smtp:
-            _ = smtp.starttls()
-            _ = smtp.login(self.config.smtp_user, self.config.smtp_password)
-            _ = smtp.send_message(message)
-        return True
+        messages = self.build_messages(papers, to)
+        if self.session is not None:
+            return send_parts(self.session, messages, on_sent)
 
-    def _build_message(self, papers: list[Paper]) -> MIMEMultipart:
-        matched_keywords = self._matched_keywords(papers)
-        message = MIMEMultipart("alternative")
-        message["Subject"] = (
-            f"Paper Digest ({len(papers)}): {', '.join(matched_keywords)}"
-        )
-        message["From"] = self.config.email_from
-        message["To"] = self.config.email_to
-        message.attach(
-            MIMEText(self._build_plain_body(papers, matched_keywords), "plain")
-        )
-        message.attach(
-            MIMEText(self._build_html_body(papers, matched_keywords), "html")
-        )
-        return message
+        with SmtpSession(self.config) as session:
+            return send_parts(session, messages, on_sent)
 
-    def _build_plain_body(
-        self, papers: list[Paper], matched_keywords: list[str]
-    ) -> str:
-        lines: list[str] = ["Daily Paper Digest", ""]
+    def build_message(
+        self, papers: list[Paper], to: str | None = None
+    ) -> MIMEMultipart:
+        with current().stage("render"):
+            matched = matched_keywords(papers)
+            parts = self.renderer.render_parts(papers, matched)
+            return self._message(
+                f"Paper Digest ({len(papers)}): {', '.join(matched)}",
+                parts.plain,
+                parts.html,
+                to,
+            )
 
-        source_counts = self._source_counts(papers)
-        lines.append(
-            "Sources checked: arXiv (cond-mat/new), Nature Communications, Physical Review Letters, Nature (journal)"
+    def build_messages(
+        self, papers: list[Paper], to: str | None = None
+    ) -> list[tuple[MIMEMultipart, list[Paper]]]:
+        with current().stage("render"):
+            return self._build_messages(papers, to)
+
+    def _build_messages(
+        self, papers: list[Paper], to: str | None
+    ) -> list[tuple[MIMEMultipart, list[Paper]]]:
+        matched = matched_keywords(papers)
+        parts = self.renderer.render_parts(papers, matched)
+        chunks = parts.split(
+            self.config.max_papers_per_message, self.config.max_message_bytes
         )
-        lines.append(f"Related papers found: {len(papers)}")
-        lines.append("")
-        lines.append(f"arXiv (cond-mat/new): {source_counts.get('arxiv', 0)}")
-        lines.append(f"Nature Communications: {source_counts.get('nature', 0)}")
-        lines.append(f"Physical Review Letters: {source_counts.get('aps-prl', 0)}")
-        lines.append(f"Nature (journal): {source_counts.get('nature-journal', 0)}")
-        lines.append("")
-
-        for paper in papers:
-            authors = ", ".join(paper.authors) if paper.authors else "N/A"
-            paper_keywords = ", ".join(paper.keywords_matched)
-            lines.extend(
-                [
-                    f"Title: {paper.title}",
-                    f"Authors: {authors}",
-                    f"Link: {paper.link}",
-                    f"Date: {paper.published_date}",
-                    f"Keywords: {paper_keywords}",
-                    "",
-                ]
-            )
+        if len(chunks) == 1:
+            subject = f"Paper Digest ({len(papers)}): {', '.join(matched)}"
+            return [(self._message(subject, parts.plain, parts.html, to), papers)]
 
-        lines.append(f"Matched keywords: {', '.join(matched_keywords)}")
-        return "\n".join(lines)
-
-    def _build_html_body(self, papers: list[Paper], matched_keywords: list[str]) -> str:
-        source_counts = self._source_counts(papers)
-        items: list[str] = []
-        for paper in papers:
-            authors = ", ".join(paper.authors) if paper.authors else "N/A"
-            paper_keywords = ", ".join(paper.keywords_matched)
-            item = (
-                "<li>"
-                + f"<strong>{paper.title}</strong><br/>"
-                + f"Authors: {authors}<br/>"
-                + f'Link: <a href="{paper.link}">{paper.link}</a><br/>'
-                + f"Date: {paper.published_date}<br/>"
-                + f"Keywords: {paper_keywords}"
-                + "</li>"
+        messages: list[tuple[MIMEMultipart, list[Paper]]] = []
+        for number, chunk in enumerate(chunks, start=1):
+            subject = (
+                f"Paper Digest ({len(papers)}) [part {number}/{len(chunks)}]: "
+                f"{', '.join(matched)}"
             )
-            items.append(item)
-
-        return (
-            "<html><body>"
-            + "<h2>Daily Paper Digest</h2>"
-            + "<p><strong>Sources checked:</strong> arXiv (cond-mat/new), Nature Communications, Physical Review Letters, Nature (journal)</p>"
-            + f"<p><strong>Related papers found:</strong> {len(papers)}</p>"
-            + "<ul>"
-            + f"<li>arXiv (cond-mat/new): {source_counts.get('arxiv', 0)}</li>"
-            + f"<li>Nature Communications: {source_counts.get('nature', 0)}</li>"
-            + f"<li>Physical Review Letters: {source_counts.get('aps-prl', 0)}</li>"
-            + f"<li>Nature (journal): {source_counts.get('nature-journal', 0)}</li>"
-            + "</ul>"
-            + f"<p>Matched keywords: {', '.join(matched_keywords)}</p>"
-            + "<ul>"
-            + "".join(items)
-            + "</ul></body></html>"
-        )
+            message = self._message(
+                subject, parts.plain_for(chunk), parts.html_for(chunk), to
+            )
+            messages.append((message, papers[chunk.start : chunk.stop]))
+        return messages
 
-    def _matched_keywords(self, papers: list[Paper]) -> list[str]:
-        seen: set[str] = set()
-        ordered: list[str] = []
-        for paper in papers:
-            for keyword in paper.keywords_matched:
-                if keyword not in seen:
-                    seen.add(keyword)
-                    ordered.append(keyword)
-        return ordered
-
-    def _source_counts(self, papers: list[Paper]) -> dict[str, int]:
-        counts: dict[str, int] = {}
-        for paper in papers:
-            counts[paper.source] = counts.get(paper.source, 0) + 1
-        return counts
+    def _message(
+        self, subject: str, plain: str, html: str, to: str | None
+    ) -> MIMEMultipart:
+        message = MIMEMultipart("alternative")
+        message["Subject"] = subject
+        message["From"] = self.config.email_from
+        message["To"] = to or self.config.email_to
+        message.attach(MIMEText(plain, "plain"))
+        message.attach(MIMEText(html, "html"))
+        return message
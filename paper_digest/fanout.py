@@ -0,0 +1,124 @@
+# pyright: reportMissingImports=false, reportUnknownVariableType=false, reportUnknownMemberType=false, reportUnknownArgumentType=false
+
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from email.mime.multipart import MIMEMultipart
+
+from paper_digest.config import RecipientProfile
+from paper_digest.emailer import Emailer
+from paper_digest.models import Paper
+from paper_digest.smtp_session import SmtpSessionPool
+
+logger = logging.getLogger(__name__)
+
+
+def assign_papers(
+    papers: list[Paper], profiles: list[RecipientProfile]
+) -> dict[str, list[Paper]]:
+    assignments: dict[str, list[Paper]] = {profile.name: [] for profile in profiles}
+    wanted = {profile.name: set(profile.keywords) for profile in profiles}
+    for paper in papers:
+        for profile in profiles:
+            keywords = [
+                keyword
+                for keyword in paper.keywords_matched
+                if keyword.lower() in wanted[profile.name]
+            ]
+            if not keywords:
+                continue
+            if keywords == paper.keywords_matched:
+                assignments[profile.name].append(paper)
+                continue
+            assignments[profile.name].append(
+                Paper(
+                    title=paper.title,
+                    authors=paper.authors,
+                    link=paper.link,
+                    published_date=paper.published_date,
+                    source=paper.source,
+                    keywords_matched=keywords,
+                )
+            )
+    return assignments
+
+
+@dataclass
+class ProfileDelivery:
+    """The parts of one profile's digest that went out; ``ok`` once all did."""
+
+    sent: list[tuple[MIMEMultipart, list[Paper]]] = field(default_factory=list)
+    ok: bool = False
+
+
+def _send_profile_digest(
+    emailer: Emailer,
+    pool: SmtpSessionPool,
+    profile: RecipientProfile,
+    papers: list[Paper],
+    delivery: ProfileDelivery,
+) -> None:
+    messages = emailer.build_messages(papers, profile.email)
+    with pool.session() as session:
+        for message, part_papers in messages:
+            session.send(message)
+            delivery.sent.append((message, part_papers))
+
+
+def send_profile_digests(
+    emailer: Emailer,
+    pool: SmtpSessionPool,
+    profiles: list[RecipientProfile],
+    assignments: dict[str, list[Paper]],
+    max_workers: int,
+) -> dict[str, ProfileDelivery]:
+    results = {
+        profile.name: ProfileDelivery()
+        for profile in profiles
+        if assignments.get(profile.name)
+    }
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {
+            executor.submit(
+                _send_profile_digest,
+                emailer,
+                pool,
+                profile,
+                assignments[profile.name],
+                results[profile.name],
+            ): profile.name
+            for profile in profiles
+            if profile.name in results
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                future.result()
+            except Exception:
+                logger.exception("Failed to send digest to profile %s", name)
+            else:
+                results[name].ok = True
+    return results
+
+
+def delivered_papers(
+    papers: list[Paper],
+    assignments: dict[str, list[Paper]],
+    results: dict[str, ProfileDelivery],
+) -> list[Paper]:
+    """Papers that reached every profile they were assigned to.
+
+    A part that went out counts even when a later part of the same digest
+    failed, so the next run does not send it again.
+    """
+    sent_links = {
+        name: {paper.link for _, part in delivery.sent for paper in part}
+        for name, delivery in results.items()
+    }
+    pending_links = {
+        paper.link
+        for name, assigned in assignments.items()
+        for paper in assigned
+        if paper.link not in sent_links.get(name, set())
+    }
+    return [paper for paper in papers if paper.link not in pending_links]
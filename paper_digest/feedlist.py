@@ -0,0 +1,268 @@
+# pyright: reportMissingImports=false, reportMissingTypeStubs=false, reportUnknownVariableType=false, reportUnknownMemberType=false, reportUnknownArgumentType=false
+
+import json
+import logging
+import os
+import re
+import time
+import xml.etree.ElementTree as ET
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, fields, replace
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import feedparser
+import requests
+
+from paper_digest.config import (
+    AUTHOR_FIELDS,
+    DATE_FIELDS,
+    SECTION_FIELDS,
+    Config,
+    FeedSource,
+    load_feed_sources,
+)
+from paper_digest.fetchers.common import request_headers
+from paper_digest.http_archive import open_http_session
+
+logger = logging.getLogger(__name__)
+
+# Feeds that parse faster than this stay in the fetching thread: shipping
+# the text to a worker process and the entries back costs about as much.
+PROCESS_PARSE_SECONDS = 0.05
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+def parse_opml(text: str) -> list[FeedSource]:
+    """Turn every outline with an ``xmlUrl`` into a feed, in document order.
+
+    Source ids are slugs of the outline title, made unique with a numeric
+    suffix; outlines repeating an earlier URL are dropped.
+    """
+    try:
+        root = ET.fromstring(text)
+    except ET.ParseError as exc:
+        raise ValueError(f"Invalid OPML: {exc}") from exc
+
+    feeds: list[FeedSource] = []
+    urls: set[str] = set()
+    for outline in root.iter("outline"):
+        url = (outline.get("xmlUrl") or outline.get("xmlurl") or "").strip()
+        if not url or url in urls:
+            continue
+        urls.add(url)
+        name = (outline.get("title") or outline.get("text") or "").strip()
+        source = _slug(name) or _slug(urlsplit(url).netloc) or "feed"
+        feeds.append(FeedSource(source=source, url=url, name=name or source))
+    return feeds
+
+
+def merge_feeds(
+    existing: list[FeedSource], imported: list[FeedSource]
+) -> list[FeedSource]:
+    """Append imported feeds whose URL is new, renaming clashing source ids."""
+    merged = list(existing)
+    urls = {feed.url for feed in existing}
+    taken = {"arxiv"} | {feed.source for feed in existing}
+    for feed in imported:
+        if feed.url in urls:
+            continue
+        source = feed.source
+        suffix = 2
+        while source in taken:
+            source = f"{feed.source}-{suffix}"
+            suffix += 1
+        urls.add(feed.url)
+        taken.add(source)
+        merged.append(replace(feed, source=source))
+    return merged
+
+
+def feed_source_to_dict(feed: FeedSource) -> dict[str, object]:
+    """Serialize ``feed`` for the feeds file, leaving out default values."""
+    data: dict[str, object] = {"source": feed.source, "url": feed.url}
+    if feed.name != feed.source:
+        data["name"] = feed.name
+    if feed.section_filter:
+        data["section_filter"] = feed.section_filter
+    if feed.categories:
+        data["categories"] = feed.categories
+    for key, value, default in (
+        ("section_fields", feed.section_fields, SECTION_FIELDS),
+        ("date_fields", feed.date_fields, DATE_FIELDS),
+        ("author_fields", feed.author_fields, AUTHOR_FIELDS),
+    ):
+        if value != default:
+            data[key] = list(value)
+    if feed.parser:
+        data["parser"] = feed.parser
+    return data
+
+
+def _write_json(path: Path, data: object) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    _ = tmp_path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def save_feed_sources(path: Path, feeds: list[FeedSource]) -> None:
+    _write_json(path, [feed_source_to_dict(feed) for feed in feeds])
+
+
+@dataclass
+class FeedCheck:
+    """What validating one feed found; ``parser`` is the backend to use."""
+
+    source: str
+    url: str
+    ok: bool = False
+    status: int = 0
+    format: str = ""
+    entries: int = 0
+    size: int = 0
+    response_time: float = 0.0
+    parse_time: float = 0.0
+    parser: str = ""
+    error: str = ""
+    checked_at: float = 0.0
+
+
+def check_feed(
+    config: Config,
+    feed: FeedSource,
+    http: requests.Session,
+    clock: Callable[[], float] = time.time,
+) -> FeedCheck:
+    check = FeedCheck(source=feed.source, url=feed.url, checked_at=clock())
+    started = time.perf_counter()
+    try:
+        response = http.get(
+            feed.url,
+            headers=request_headers(config.user_agent),
+            timeout=config.timeout_for(feed.source),
+        )
+        check.response_time = time.perf_counter() - started
+        check.status = response.status_code
+        response.raise_for_status()
+    except requests.RequestException as exc:
+        check.response_time = time.perf_counter() - started
+        check.error = str(exc)
+        return check
+
+    check.size = len(response.content)
+    started = time.perf_counter()
+    parsed = feedparser.parse(response.text)
+    check.parse_time = time.perf_counter() - started
+    check.format = str(parsed.get("version", "")) or "unknown"
+    check.entries = len(parsed.entries)
+    if check.format == "unknown":
+        check.error = "not an RSS or Atom feed"
+        return check
+
+    check.ok = True
+    check.parser = "process" if check.parse_time >= PROCESS_PARSE_SECONDS else "inline"
+    return check
+
+
+def validate_feeds(
+    config: Config, feeds: list[FeedSource], http: requests.Session
+) -> list[FeedCheck]:
+    """Check every feed on the ``FETCH_WORKERS`` pool, in input order."""
+    with ThreadPoolExecutor(max_workers=max(1, config.fetch_workers)) as pool:
+        return list(pool.map(lambda feed: check_feed(config, feed, http), feeds))
+
+
+def load_feed_metadata(path: Path) -> dict[str, FeedCheck]:
+    if not path.exists():
+        return {}
+    try:
+        loaded: object = json.loads(path.read_text(encoding="utf-8"))  # pyright: ignore[reportAny]
+    except (OSError, json.JSONDecodeError) as exc:
+        logger.warning("Failed to load feed metadata, ignoring it: %s", exc)
+        return {}
+    if not isinstance(loaded, dict):
+        logger.warning("Failed to load feed metadata, ignoring it")
+        return {}
+
+    known = {item.name for item in fields(FeedCheck)}
+    checks: dict[str, FeedCheck] = {}
+    for source, data in loaded.items():
+        if not isinstance(data, dict):
+            continue
+        try:
+            checks[str(source)] = FeedCheck(
+                **{key: value for key, value in data.items() if key in known}
+            )
+        except TypeError:
+            continue
+    return checks
+
+
+def save_feed_metadata(path: Path, checks: list[FeedCheck]) -> None:
+    """Record ``checks``, keeping earlier results for feeds not re-checked."""
+    metadata = load_feed_metadata(path)
+    metadata.update((check.source, check) for check in checks)
+    _write_json(
+        path, {source: asdict(check) for source, check in sorted(metadata.items())}
+    )
+
+
+def with_recorded_parsers(config: Config) -> list[FeedSource]:
+    """``config.feeds`` with each unpinned feed's parser taken from metadata."""
+    metadata = load_feed_metadata(config.feed_metadata_file)
+    feeds: list[FeedSource] = []
+    for feed in config.feeds:
+        check = metadata.get(feed.source)
+        if not feed.parser and check is not None and check.url == feed.url:
+            feed = replace(feed, parser=check.parser)
+        feeds.append(feed)
+    return feeds
+
+
+def run_feed_validation(config: Config, feeds: list[FeedSource]) -> int:
+    http = open_http_session(config)
+    try:
+        checks = validate_feeds(config, feeds, http)
+    finally:
+        http.close()
+    save_feed_metadata(config.feed_metadata_file, checks)
+
+    for check in checks:
+        if check.ok:
+            logger.info(
+                "%s: %s, %d entries, %.2fs response, %s parser",
+                check.source,
+                check.format,
+                check.entries,
+                check.response_time,
+                check.parser,
+            )
+        else:
+            logger.warning("%s: %s (%s)", check.source, check.error, check.url)
+    failed = sum(1 for check in checks if not check.ok)
+    logger.info("Validated %d feed(s), %d failed", len(checks), failed)
+    return 1 if failed else 0
+
+
+def import_opml(config: Config, opml_path: Path) -> int:
+    """Add the feeds in ``opml_path`` to ``FEEDS_FILE``, then validate them all."""
+    if config.feeds_file is None:
+        raise ValueError("FEEDS_FILE must be set to import OPML")
+    imported = parse_opml(opml_path.read_text(encoding="utf-8"))
+    existing = (
+        load_feed_sources(config.feeds_file) if config.feeds_file.exists() else []
+    )
+    feeds = merge_feeds(existing, imported)
+    save_feed_sources(config.feeds_file, feeds)
+    logger.info(
+        "Imported %d new feed(s) from %s into %s",
+        len(feeds) - len(existing),
+        opml_path,
+        config.feeds_file,
+    )
+    return run_feed_validation(config, feeds)
@@ -4,10 +4,12 @@ from paper_digest.fetchers.arxiv import ArxivFetcher
 from paper_digest.fetchers.aps_prl_rss import ApsPrlRssFetcher
 from paper_digest.fetchers.nature import NatureFetcher
 from paper_digest.fetchers.nature_journal_rss import NatureJournalRssFetcher
+from paper_digest.fetchers.feed import FeedFetcher
 
 __all__ = [
     "ArxivFetcher",
     "ApsPrlRssFetcher",
+    "FeedFetcher",
     "NatureFetcher",
     "NatureJournalRssFetcher",
 ]
@@ -1,95 +1,179 @@
 # pyright: reportMissingImports=false, reportUnknownVariableType=false, reportUnknownParameterType=false, reportUnknownMemberType=false, reportUnknownArgumentType=false
 
 import logging
+from collections.abc import Iterator
+from typing import TypedDict
 
 import requests
 from bs4 import BeautifulSoup
 
 from paper_digest.config import Config
-from paper_digest.fetchers.common import match_keywords, normalize_date
+from paper_digest.fetchers.common import (
+    SeenLookup,
+    match_keywords,
+    never_seen,
+    normalize_date,
+    record_validators,
+    request_headers,
+    response_size,
+)
+from paper_digest.metrics import current
 from paper_digest.models import Paper
+from paper_digest.parsing import current as current_parser
+from paper_digest.resilience import RetryPolicy, get_with_retries
+from paper_digest.watermarks import Watermark, WatermarkStore
 
 logger = logging.getLogger(__name__)
 
 
-class ArxivFetcher:
-    def __init__(self, config: Config):
-        self.config: Config = config
+class ListingEntry(TypedDict):
+    href: str
+    title: str
+    abstract: str
+    authors: list[str]
+    date: str
 
-    def fetch(self) -> list[Paper]:
-        try:
-            response = requests.get(
-                self.config.arxiv_url,
-                headers={"User-Agent": self.config.user_agent},
-                timeout=30,
-            )
-            response.raise_for_status()
-        except requests.RequestException:
-            logger.exception("Failed to fetch arXiv page")
-            return []
 
-        return self._parse_html(response.text)
+class ParsedListing(TypedDict):
+    entry_count: int
+    entries: list[ListingEntry]
 
-    def _parse_html(self, html_content: str) -> list[Paper]:
-        soup = BeautifulSoup(html_content, "lxml")
-        papers: list[Paper] = []
 
-        dts = soup.select("dl dt")
-        dds = soup.select("dl dd")
+def parse_listing(html_content: str) -> ParsedListing:
+    """Extract listing entries as picklable dicts; runs inside the parse executor."""
+    soup = BeautifulSoup(html_content, "lxml")
+    dts = soup.select("dl dt")
+    dds = soup.select("dl dd")
 
-        for dt, dd in zip(dts, dds):
-            link_elem = dt.select_one("a[href*='/abs/']")
-            if link_elem is None:
-                continue
+    entries: list[ListingEntry] = []
+    for dt, dd in zip(dts, dds):
+        link_elem = dt.select_one("a[href*='/abs/']")
+        if link_elem is None:
+            continue
 
-            href_obj: object = link_elem.get("href", "")
-            if not isinstance(href_obj, str) or not href_obj:
-                continue
-
-            href = href_obj
-            link = href if href.startswith("http") else f"https://arxiv.org{href}"
+        href_obj: object = link_elem.get("href", "")
+        if not isinstance(href_obj, str) or not href_obj:
+            continue
 
-            title_elem = dd.select_one(".list-title")
-            title = ""
-            if title_elem is not None:
-                title = (
-                    title_elem.get_text(" ", strip=True).replace("Title:", "").strip()
-                )
+        title_elem = dd.select_one(".list-title")
+        title = ""
+        if title_elem is not None:
+            title = title_elem.get_text(" ", strip=True).replace("Title:", "").strip()
 
-            abstract = ""
-            abstract_elem = dd.select_one(".list-abstract") or dd.select_one(
-                "p.mathjax"
+        abstract = ""
+        abstract_elem = dd.select_one(".list-abstract") or dd.select_one("p.mathjax")
+        if abstract_elem is not None:
+            abstract = (
+                abstract_elem.get_text(" ", strip=True).replace("Abstract:", "").strip()
             )
-            if abstract_elem is not None:
-                abstract = (
-                    abstract_elem.get_text(" ", strip=True)
-                    .replace("Abstract:", "")
-                    .strip()
-                )
 
-            authors = [a.get_text(strip=True) for a in dd.select(".list-authors a")]
+        date_text = ""
+        date_elem = dd.select_one(".list-date") or dd.select_one(".dateline")
+        if date_elem is not None:
+            date_text = date_elem.get_text(" ", strip=True)
 
-            date_text = ""
-            date_elem = dd.select_one(".list-date") or dd.select_one(".dateline")
-            if date_elem is not None:
-                date_text = self._parse_date(date_elem.get_text(" ", strip=True))
+        entries.append(
+            {
+                "href": href_obj,
+                "title": title,
+                "abstract": abstract,
+                "authors": [
+                    a.get_text(strip=True) for a in dd.select(".list-authors a")
+                ],
+                "date": date_text,
+            }
+        )
 
-            matched = self._match_keywords(title, self.config.keywords, abstract)
-            if not matched:
+    return {"entry_count": min(len(dts), len(dds)), "entries": entries}
+
+
+class ArxivFetcher:
+    SOURCE: str = "arxiv"
+
+    def __init__(
+        self,
+        config: Config,
+        is_seen: SeenLookup = never_seen,
+        watermarks: WatermarkStore | None = None,
+        http: requests.Session | None = None,
+    ):
+        self.config: Config = config
+        self.is_seen: SeenLookup = is_seen
+        self.watermarks: WatermarkStore | None = watermarks
+        self.http: requests.Session | None = http
+
+    def fetch(self) -> list[Paper]:
+        return list(self.iter_papers())
+
+    def iter_papers(self) -> Iterator[Paper]:
+        watermark = (
+            self.watermarks.get(self.SOURCE) if self.watermarks is not None else None
+        )
+        metrics = current()
+        get = self.http.get if self.http is not None else requests.get
+        with metrics.stage("download"):
+            response = get_with_retries(
+                get,
+                self.config.arxiv_url,
+                RetryPolicy.from_config(self.config),
+                headers=request_headers(self.config.user_agent, watermark),
+                timeout=self.config.timeout_for(self.SOURCE),
+            )
+        metrics.increment("bytes_downloaded", response_size(response))
+
+        if watermark is not None:
+            if response.status_code == 304:
+                return
+            record_validators(watermark, response)
+
+        with metrics.stage("parse"):
+            entries = self._parse_listing(response.text)
+        yield from self._papers(entries, watermark)
+        if self.watermarks is not None and watermark is not None:
+            self.watermarks.stage(self.SOURCE, watermark)
+
+    def _parse_html(
+        self, html_content: str, watermark: Watermark | None = None
+    ) -> list[Paper]:
+        return list(self._papers(self._parse_listing(html_content), watermark))
+
+    def _parse_listing(self, html_content: str) -> list[ListingEntry]:
+        listing = current_parser().run(parse_listing, html_content)
+        current().increment("entries_parsed", listing["entry_count"])
+        return listing["entries"]
+
+    def _papers(
+        self, entries: list[ListingEntry], watermark: Watermark | None
+    ) -> Iterator[Paper]:
+        metrics = current()
+        for entry in entries:
+            href = entry["href"]
+            link = href if href.startswith("http") else f"https://arxiv.org{href}"
+            if watermark is not None:
+                # Only recorded, never used as a cutoff: /new listings put
+                # cross-lists and replacements, with older IDs, after the new
+                # submissions. Seen-dedup and the conditional GET skip repeats.
+                watermark.advance_arxiv_id(href.rsplit("/abs/", 1)[-1])
+            if self.is_seen(link):
+                metrics.increment("entries_filtered", reason="seen")
                 continue
 
-            papers.append(
-                Paper(
-                    title=title,
-                    authors=authors,
-                    link=link,
-                    published_date=date_text,
-                    source="arxiv",
-                    keywords_matched=matched,
-                )
+            title = entry["title"]
+            matched = self._match_keywords(
+                title, self.config.keywords, entry["abstract"]
             )
+            if not matched:
+                metrics.increment("entries_filtered", reason="keyword")
+                continue
 
-        return papers
+            yield Paper(
+                title=title,
+                authors=entry["authors"],
+                link=link,
+                published_date=self._parse_date(entry["date"]),
+                source=self.SOURCE,
+                keywords_matched=matched,
+            )
 
     def _match_keywords(
         self, title: str, keywords: list[str], abstract: str = ""
@@ -1,10 +1,73 @@
+import logging
 import re
+from collections.abc import Callable, Iterator
+from typing import Protocol
 from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
+import requests
 from dateutil import parser as date_parser
 
+from paper_digest.metrics import current
+from paper_digest.models import Paper
+from paper_digest.resilience import CircuitBreakers
+from paper_digest.watermarks import Watermark
+
+logger = logging.getLogger(__name__)
+
+SeenLookup = Callable[[str], bool]
+
+
+class Fetcher(Protocol):
+    SOURCE: str
+
+    def fetch(self) -> list[Paper]: ...
+
+    def iter_papers(self) -> Iterator[Paper]:
+        """Yield matching papers as entries are filtered.
+
+        Watermarks are only staged once the iterator is exhausted.
+        """
+        ...
+
+
+class GuardedFetcher:
+    """Runs a fetcher only while its source's circuit breaker allows it.
+
+    Any exception from the wrapped fetcher counts as a failure and is
+    re-raised; a fetcher that is fully consumed closes the breaker.
+    """
+
+    def __init__(self, fetcher: Fetcher, breakers: CircuitBreakers):
+        self.fetcher: Fetcher = fetcher
+        self.breakers: CircuitBreakers = breakers
+        self.SOURCE: str = fetcher.SOURCE
+
+    def fetch(self) -> list[Paper]:
+        return list(self.iter_papers())
+
+    def iter_papers(self) -> Iterator[Paper]:
+        if not self.breakers.allow(self.SOURCE):
+            logger.warning("Skipping %s: circuit open after failures", self.SOURCE)
+            current().increment("fetch_skipped", source=self.SOURCE)
+            return
+        try:
+            yield from self.fetcher.iter_papers()
+        except Exception:
+            self.breakers.record_failure(self.SOURCE)
+            raise
+        self.breakers.record_success(self.SOURCE)
+
+
+def never_seen(_link: str) -> bool:
+    return False
+
 
 def match_keywords(text: str, keywords: list[str]) -> list[str]:
+    with current().stage("match"):
+        return _match_keywords(text, keywords)
+
+
+def _match_keywords(text: str, keywords: list[str]) -> list[str]:
     content = text.lower()
     matched: list[str] = []
     seen_lower: set[str] = set()
@@ -40,3 +103,30 @@ def canonicalize_link(url: str) -> str:
     ]
     query = urlencode(filtered_query, doseq=True)
     return urlunsplit((parts.scheme, parts.netloc, parts.path, query, ""))
+
+
+def request_headers(
+    user_agent: str, watermark: Watermark | None = None
+) -> dict[str, str]:
+    headers = {"User-Agent": user_agent}
+    if watermark is None:
+        return headers
+    if watermark.etag:
+        headers["If-None-Match"] = watermark.etag
+    if watermark.last_modified:
+        headers["If-Modified-Since"] = watermark.last_modified
+    return headers
+
+
+def response_size(response: requests.Response) -> int:
+    content: object = response.content
+    return len(content) if isinstance(content, bytes) else 0
+
+
+def record_validators(watermark: Watermark, response: requests.Response) -> None:
+    etag = response.headers.get("ETag")
+    if isinstance(etag, str) and etag:
+        watermark.etag = etag
+    last_modified = response.headers.get("Last-Modified")
+    if isinstance(last_modified, str) and last_modified:
+        watermark.last_modified = last_modified
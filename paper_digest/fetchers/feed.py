@@ -0,0 +1,174 @@
+# pyright: reportMissingImports=false, reportUnknownVariableType=false, reportUnknownMemberType=false, reportUnknownArgumentType=false
+
+import logging
+import re
+from collections.abc import Iterator
+
+import requests
+from bs4 import BeautifulSoup
+
+from paper_digest.config import Config, FeedSource
+from paper_digest.fetchers.common import (
+    SeenLookup,
+    match_keywords,
+    never_seen,
+    normalize_date,
+)
+from paper_digest.fetchers.rss import NormalizedFeedEntry, iter_feed_entries
+from paper_digest.metrics import current
+from paper_digest.models import Paper
+from paper_digest.parsing import INLINE_PARSER
+from paper_digest.resilience import RetryPolicy
+from paper_digest.watermarks import WatermarkStore
+
+logger = logging.getLogger(__name__)
+
+
+class FeedFetcher:
+    """Fetches one configured RSS or Atom feed.
+
+    Every journal feed goes through this class; what differs between them
+    (URL, filters, raw field fallbacks) lives in its ``FeedSource``.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        feed: FeedSource,
+        is_seen: SeenLookup = never_seen,
+        watermarks: WatermarkStore | None = None,
+        http: requests.Session | None = None,
+    ):
+        self.config: Config = config
+        self.feed: FeedSource = feed
+        self.SOURCE: str = feed.source
+        self.is_seen: SeenLookup = is_seen
+        self.watermarks: WatermarkStore | None = watermarks
+        self.http: requests.Session | None = http
+        self._categories: set[str] = {
+            category.strip().lower() for category in feed.categories if category.strip()
+        }
+
+    def fetch(self) -> list[Paper]:
+        return list(self.iter_papers())
+
+    def iter_papers(self) -> Iterator[Paper]:
+        watermark = (
+            self.watermarks.get(self.SOURCE) if self.watermarks is not None else None
+        )
+        entries = iter_feed_entries(
+            self.feed.url,
+            self.config.user_agent,
+            max_entries=self.config.rss_max_entries,
+            extra_fields=self.feed.extra_fields,
+            is_seen=self.is_seen,
+            watermark=watermark,
+            http=self.http,
+            timeout=self.config.timeout_for(self.SOURCE),
+            retry=RetryPolicy.from_config(self.config),
+            # Small feeds parse faster inline than shipped to a worker process.
+            parser=INLINE_PARSER if self.feed.parser == "inline" else None,
+        )
+
+        metrics = current()
+        for entry in entries:
+            title = str(entry.get("title", "")).strip()
+            link = str(entry.get("link", "")).strip()
+            if not title or not link:
+                continue
+
+            extra = entry.get("extra", {})
+            if not self._matches_section_filter(entry, extra):
+                metrics.increment("entries_filtered", reason="section")
+                continue
+            if not self._matches_categories(entry):
+                metrics.increment("entries_filtered", reason="category")
+                continue
+
+            summary = str(entry.get("summary", "")).strip()
+            if "<" in summary:
+                summary = BeautifulSoup(summary, "lxml").get_text(" ", strip=True)
+            matched = self._match_keywords(title, self.config.keywords, summary)
+            if not matched:
+                metrics.increment("entries_filtered", reason="keyword")
+                continue
+
+            published = str(entry.get("published", "")).strip()
+            if not published:
+                published = self._fallback_published(extra)
+
+            authors = entry.get("authors")
+            author_list = authors if isinstance(authors, list) else []
+            if not author_list:
+                author_list = self._fallback_authors(extra)
+
+            yield Paper(
+                title=title,
+                authors=author_list,
+                link=link,
+                published_date=published,
+                source=self.SOURCE,
+                keywords_matched=matched,
+            )
+
+        if self.watermarks is not None and watermark is not None:
+            self.watermarks.stage(self.SOURCE, watermark)
+
+    def _matches_section_filter(
+        self, entry: NormalizedFeedEntry, extra: dict[str, str | list[str]]
+    ) -> bool:
+        section_filter = self.feed.section_filter.strip().lower()
+        if not section_filter:
+            return True
+
+        haystacks: list[str] = []
+
+        categories = entry.get("categories")
+        if isinstance(categories, list):
+            haystacks.extend(str(category) for category in categories)
+
+        for key in self.feed.section_fields:
+            value = extra.get(key)
+            if isinstance(value, list):
+                haystacks.extend(value)
+            elif value is not None:
+                haystacks.append(value)
+
+        return any(section_filter in item.lower() for item in haystacks)
+
+    def _matches_categories(self, entry: NormalizedFeedEntry) -> bool:
+        if not self._categories:
+            return True
+
+        categories = entry.get("categories")
+        if not isinstance(categories, list):
+            return False
+        return any(
+            str(category).strip().lower() in self._categories for category in categories
+        )
+
+    def _fallback_published(self, extra: dict[str, str | list[str]]) -> str:
+        for key in self.feed.date_fields:
+            raw_value = extra.get(key)
+            if raw_value is None:
+                continue
+            normalized = normalize_date(str(raw_value).strip())
+            if normalized:
+                return normalized
+        return ""
+
+    def _fallback_authors(self, extra: dict[str, str | list[str]]) -> list[str]:
+        for key in self.feed.author_fields:
+            raw_value = extra.get(key)
+            if raw_value is None:
+                continue
+            pieces = re.split(r"\s+and\s+|,", str(raw_value))
+            authors = [piece.strip() for piece in pieces if piece.strip()]
+            if authors:
+                return authors
+        return []
+
+    def _match_keywords(
+        self, title: str, keywords: list[str], summary: str = ""
+    ) -> list[str]:
+        return match_keywords(f"{title} {summary}", keywords)
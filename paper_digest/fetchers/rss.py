@@ -1,11 +1,26 @@
 # pyright: reportMissingImports=false, reportMissingTypeStubs=false, reportUnknownVariableType=false, reportUnknownMemberType=false, reportUnknownArgumentType=false
 
+from collections.abc import Iterator, Sequence
+from dataclasses import replace
 from typing import TypedDict
 
 import feedparser
 import requests
 
-from paper_digest.fetchers.common import canonicalize_link, normalize_date
+from paper_digest.fetchers.common import (
+    SeenLookup,
+    canonicalize_link,
+    never_seen,
+    normalize_date,
+    record_validators,
+    request_headers,
+    response_size,
+)
+from paper_digest.metrics import current
+from paper_digest.parsing import ParseExecutor
+from paper_digest.parsing import current as current_parser
+from paper_digest.resilience import NO_RETRY, RetryPolicy, get_with_retries
+from paper_digest.watermarks import Watermark
 
 
 class NormalizedFeedEntry(TypedDict):
@@ -15,28 +30,57 @@ class NormalizedFeedEntry(TypedDict):
     authors: list[str]
     summary: str
     categories: list[str]
-    raw: object
+    extra: dict[str, str | list[str]]
 
 
-def fetch_feed_entries(
-    url: str,
-    user_agent: str,
-    max_entries: int = 200,
-) -> list[NormalizedFeedEntry]:
-    response = requests.get(
-        url,
-        headers={"User-Agent": user_agent},
-        timeout=30,
-    )
-    response.raise_for_status()
-    parsed_feed = feedparser.parse(response.text)
+class ParsedFeed(TypedDict):
+    updated: str
+    entry_count: int
+    seen_count: int
+    # "published" still holds the feed's raw date string.
+    entries: list[NormalizedFeedEntry]
+
+
+def _extract_extra_fields(
+    entry: object, extra_fields: Sequence[str]
+) -> dict[str, str | list[str]]:
+    extra: dict[str, str | list[str]] = {}
+    get_method = getattr(entry, "get", None)
+    if not callable(get_method):
+        return extra
+
+    for key in extra_fields:
+        value = get_method(key)
+        if value in (None, ""):
+            continue
+        if isinstance(value, list):
+            extra[key] = [str(item) for item in value]
+        else:
+            extra[key] = str(value)
+    return extra
 
-    normalized: list[NormalizedFeedEntry] = []
+
+def parse_feed(
+    text: str, extra_fields: Sequence[str] = (), is_seen: SeenLookup = never_seen
+) -> ParsedFeed:
+    """Parse a feed into picklable entries; runs inside the parse executor.
+
+    Entries whose link ``is_seen`` are dropped before their summary, authors,
+    categories and extra fields are extracted. ``is_seen`` has to pickle to
+    reach a worker process, so process pools leave it at the default. Dates
+    are left raw so entries that turn out to be seen are never normalized.
+    """
+    parsed_feed = feedparser.parse(text)
+    entries: list[NormalizedFeedEntry] = []
+    seen_count = 0
     for entry in parsed_feed.entries:
         title = str(entry.get("title", "")).strip()
         link = canonicalize_link(str(entry.get("link", "")))
         if not title or not link:
             continue
+        if is_seen(link):
+            seen_count += 1
+            continue
 
         published_raw = str(
             entry.get("published") or entry.get("updated") or entry.get("pubDate") or ""
@@ -78,18 +122,134 @@ def fetch_feed_entries(
             if category:
                 categories = [category]
 
-        normalized.append(
+        entries.append(
             {
                 "title": title,
                 "link": link,
-                "published": normalize_date(published_raw),
+                "published": published_raw,
                 "authors": authors,
                 "summary": summary,
                 "categories": categories,
-                "raw": entry,
+                "extra": _extract_extra_fields(entry, extra_fields),
             }
         )
-        if len(normalized) >= max_entries:
-            break
 
-    return normalized
+    return {
+        "updated": str(parsed_feed.feed.get("updated", "")).strip(),
+        "entry_count": len(parsed_feed.entries),
+        "seen_count": seen_count,
+        "entries": entries,
+    }
+
+
+def fetch_feed_entries(
+    url: str,
+    user_agent: str,
+    max_entries: int = 200,
+    extra_fields: Sequence[str] = (),
+    is_seen: SeenLookup = never_seen,
+    watermark: Watermark | None = None,
+    http: requests.Session | None = None,
+    timeout: float | tuple[float, float] = 30,
+    retry: RetryPolicy = NO_RETRY,
+    parser: ParseExecutor | None = None,
+) -> list[NormalizedFeedEntry]:
+    return list(
+        iter_feed_entries(
+            url,
+            user_agent,
+            max_entries,
+            extra_fields,
+            is_seen,
+            watermark,
+            http,
+            timeout,
+            retry,
+            parser,
+        )
+    )
+
+
+def iter_feed_entries(
+    url: str,
+    user_agent: str,
+    max_entries: int = 200,
+    extra_fields: Sequence[str] = (),
+    is_seen: SeenLookup = never_seen,
+    watermark: Watermark | None = None,
+    http: requests.Session | None = None,
+    timeout: float | tuple[float, float] = 30,
+    retry: RetryPolicy = NO_RETRY,
+    parser: ParseExecutor | None = None,
+) -> Iterator[NormalizedFeedEntry]:
+    """Download and parse the feed now; filter and normalize entries lazily.
+
+    Request errors are raised by this call rather than on first iteration,
+    once ``retry`` gives up. ``parser`` overrides the run's parse executor.
+    ``watermark`` advances as entries are consumed, so it is only complete
+    once the iterator is exhausted.
+    """
+    metrics = current()
+    get = http.get if http is not None else requests.get
+    with metrics.stage("download"):
+        response = get_with_retries(
+            get,
+            url,
+            retry,
+            headers=request_headers(user_agent, watermark),
+            timeout=timeout,
+        )
+    metrics.increment("bytes_downloaded", response_size(response))
+    if watermark is not None:
+        if response.status_code == 304:
+            return iter(())
+        record_validators(watermark, response)
+
+    parser = parser or current_parser()
+    # Worker processes cannot call back into the seen store; their entries
+    # are checked in _normalized_entries instead.
+    parse_is_seen = is_seen if parser.workers == 0 else never_seen
+    with metrics.stage("parse"):
+        parsed_feed = parser.run(
+            parse_feed, response.text, tuple(extra_fields), parse_is_seen
+        )
+    if watermark is not None:
+        feed_updated = parsed_feed["updated"]
+        if feed_updated and feed_updated == watermark.feed_updated:
+            return iter(())
+        watermark.feed_updated = feed_updated
+
+    metrics.increment("entries_parsed", parsed_feed["entry_count"])
+    if parsed_feed["seen_count"]:
+        metrics.increment("entries_filtered", parsed_feed["seen_count"], reason="seen")
+    return _normalized_entries(parsed_feed["entries"], max_entries, is_seen, watermark)
+
+
+def _normalized_entries(
+    entries: list[NormalizedFeedEntry],
+    max_entries: int,
+    is_seen: SeenLookup,
+    watermark: Watermark | None,
+) -> Iterator[NormalizedFeedEntry]:
+    metrics = current()
+    # Filter against the date committed before this run; ``watermark`` only
+    # collects the new maximum, or a newest-first feed would cut itself off
+    # after its first entry.
+    cutoff = replace(watermark) if watermark is not None else None
+    yielded = 0
+    for entry in entries:
+        if is_seen(entry["link"]):
+            metrics.increment("entries_filtered", reason="seen")
+            continue
+
+        published = normalize_date(entry["published"])
+        if cutoff is not None and watermark is not None:
+            if cutoff.is_before_published(published):
+                metrics.increment("entries_filtered", reason="watermark")
+                continue
+            watermark.advance_published(published)
+
+        yield {**entry, "published": published}
+        yielded += 1
+        if yielded >= max_entries:
+            return
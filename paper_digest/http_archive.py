@@ -0,0 +1,166 @@
+# pyright: reportMissingImports=false, reportUnknownVariableType=false, reportUnknownMemberType=false, reportUnknownArgumentType=false, reportIncompatibleMethodOverride=false
+
+import base64
+import gzip
+import json
+import logging
+import threading
+import time
+from collections import deque
+from datetime import timedelta
+from pathlib import Path
+from typing import IO
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from paper_digest.config import Config
+from paper_digest.ratelimit import create_rate_limiter, mount_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_SUFFIX = ".jsonl.gz"
+# The archived body is already decoded; these would describe the wire format.
+_DROPPED_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+
+class RecordingSession(requests.Session):
+    """A ``requests.Session`` that appends every response to a gzip JSONL archive.
+
+    Each line holds the method, URL, status, headers, base64 body, the time
+    the request started relative to the first one and how long it took.
+    """
+
+    def __init__(self, archive_path: Path) -> None:
+        super().__init__()
+        self.archive_path: Path = archive_path
+        self._archive: IO[bytes] | None = None
+        self._lock: threading.Lock = threading.Lock()
+        self._started: float | None = None
+
+    def send(
+        self, request: requests.PreparedRequest, **kwargs: object
+    ) -> requests.Response:
+        started = time.monotonic()
+        response = super().send(request, **kwargs)
+        elapsed = time.monotonic() - started
+        self._record(request, response, started, elapsed)
+        return response
+
+    def _record(
+        self,
+        request: requests.PreparedRequest,
+        response: requests.Response,
+        started: float,
+        elapsed: float,
+    ) -> None:
+        entry = {
+            "method": request.method,
+            "url": request.url,
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": dict(response.headers),
+            "body": base64.b64encode(response.content).decode("ascii"),
+            "elapsed": elapsed,
+        }
+        with self._lock:
+            if self._started is None:
+                self._started = started
+            entry["offset"] = started - self._started
+            if self._archive is None:
+                self.archive_path.parent.mkdir(parents=True, exist_ok=True)
+                self._archive = gzip.open(self.archive_path, "ab")
+            _ = self._archive.write(json.dumps(entry).encode("utf-8") + b"\n")
+            self._archive.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._archive is not None:
+                self._archive.close()
+                self._archive = None
+        super().close()
+
+
+class ReplaySession(requests.Session):
+    """Serves responses from an archive written by ``RecordingSession``.
+
+    Responses are matched by method and URL, in recorded order when the same
+    URL was fetched more than once. With ``realtime`` each response is
+    delayed by its original duration. Unknown requests raise
+    ``requests.ConnectionError``, which fetchers already treat as a failed
+    fetch.
+    """
+
+    def __init__(self, archive_path: Path, realtime: bool = True) -> None:
+        super().__init__()
+        self.archive_path: Path = archive_path
+        self.realtime: bool = realtime
+        self._lock: threading.Lock = threading.Lock()
+        self._entries: dict[tuple[str, str], deque[dict[str, object]]] = {}
+        with gzip.open(archive_path, "rt", encoding="utf-8") as archive:
+            for line in archive:
+                if not line.strip():
+                    continue
+                entry: dict[str, object] = json.loads(line)  # pyright: ignore[reportAny]
+                key = (str(entry["method"]), str(entry["url"]))
+                self._entries.setdefault(key, deque()).append(entry)
+
+    def send(
+        self, request: requests.PreparedRequest, **kwargs: object
+    ) -> requests.Response:
+        key = (str(request.method), str(request.url))
+        with self._lock:
+            recorded = self._entries.get(key)
+            if not recorded:
+                raise requests.ConnectionError(
+                    f"{request.method} {request.url} is not in {self.archive_path}",
+                    request=request,
+                )
+            # Once the others are used up, the last response keeps being served.
+            entry = recorded.popleft() if len(recorded) > 1 else recorded[0]
+
+        elapsed = float(entry.get("elapsed", 0.0))  # pyright: ignore[reportArgumentType]
+        if self.realtime and elapsed > 0:
+            time.sleep(elapsed)
+
+        headers = CaseInsensitiveDict(
+            {
+                str(name): str(value)
+                for name, value in dict(entry.get("headers", {})).items()  # pyright: ignore[reportArgumentType]
+                if str(name).lower() not in _DROPPED_HEADERS
+            }
+        )
+        response = requests.Response()
+        response.status_code = int(entry["status"])  # pyright: ignore[reportArgumentType]
+        response.reason = str(entry.get("reason", ""))
+        response.headers = headers
+        response._content = base64.b64decode(str(entry["body"]))  # pyright: ignore[reportPrivateUsage]
+        response.encoding = get_encoding_from_headers(headers)
+        response.url = str(request.url)
+        response.request = request
+        response.elapsed = timedelta(seconds=elapsed)
+        return response
+
+
+def archive_path_for(config: Config, started: float | None = None) -> Path:
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(started or time.time()))
+    return config.http_archive_dir / f"{stamp}{ARCHIVE_SUFFIX}"
+
+
+def open_http_session(config: Config) -> requests.Session:
+    """The HTTP session fetchers share, rate limited per host.
+
+    Replayed responses never touch the network and are not rate limited.
+    """
+    if config.http_replay is not None:
+        logger.info("Replaying HTTP responses from %s", config.http_replay)
+        return ReplaySession(config.http_replay, realtime=config.http_replay_realtime)
+    if config.http_record:
+        path = archive_path_for(config)
+        logger.info("Recording HTTP responses to %s", path)
+        session: requests.Session = RecordingSession(path)
+    else:
+        session = requests.Session()
+    mount_rate_limiter(session, create_rate_limiter(config))
+    return session
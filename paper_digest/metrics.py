@@ -0,0 +1,179 @@
+import json
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from pathlib import Path
+
+Labels = tuple[tuple[str, str], ...]
+
+PROMETHEUS_FILE = "paper_digest.prom"
+SUMMARY_FILE = "run_summary.json"
+
+
+def _merge(base: Labels, labels: dict[str, str]) -> Labels:
+    if not labels:
+        return base
+    merged = dict(base)
+    merged.update(labels)
+    return tuple(sorted(merged.items()))
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (key, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in labels
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+class Metrics:
+    """Per-run stage durations, counters and gauges.
+
+    Stages nest: labels given to a stage (for example ``source``) are inherited
+    by every counter and nested stage recorded on the same thread.
+    """
+
+    enabled: bool = True
+
+    def __init__(self) -> None:
+        self.started_at: float = time.time()
+        self.durations: dict[tuple[str, Labels], float] = {}
+        self.counters: dict[tuple[str, Labels], int] = {}
+        self.gauges: dict[str, float] = {}
+        self._lock: threading.Lock = threading.Lock()
+        self._local: threading.local = threading.local()
+
+    def _labels(self) -> Labels:
+        return getattr(self._local, "labels", ())
+
+    @contextmanager
+    def _timed(self, name: str, labels: dict[str, str]) -> Iterator[None]:
+        outer = self._labels()
+        inner = _merge(outer, labels)
+        self._local.labels = inner
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._local.labels = outer
+            key = (name, inner)
+            with self._lock:
+                self.durations[key] = self.durations.get(key, 0.0) + elapsed
+
+    def stage(self, name: str, **labels: str) -> AbstractContextManager[None]:
+        return self._timed(name, labels)
+
+    def add_duration(self, name: str, seconds: float, **labels: str) -> None:
+        """Record time for a stage that was measured piecemeal, not as one block."""
+        key = (name, _merge(self._labels(), labels))
+        with self._lock:
+            self.durations[key] = self.durations.get(key, 0.0) + seconds
+
+    def increment(self, name: str, amount: int = 1, **labels: str) -> None:
+        key = (name, _merge(self._labels(), labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def set_gauge(self, name: str, value: float) -> None:
+        with self._lock:
+            self.gauges[name] = value
+
+    def summary(self) -> dict[str, object]:
+        with self._lock:
+            return {
+                "started_at": self.started_at,
+                "finished_at": time.time(),
+                "stages": [
+                    {"stage": name, "labels": dict(labels), "seconds": seconds}
+                    for (name, labels), seconds in sorted(self.durations.items())
+                ],
+                "counters": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(self.counters.items())
+                ],
+                "gauges": dict(sorted(self.gauges.items())),
+            }
+
+    def prometheus_text(self) -> str:
+        lines = [
+            "# HELP paper_digest_stage_seconds Time spent in each run stage.",
+            "# TYPE paper_digest_stage_seconds gauge",
+        ]
+        with self._lock:
+            durations = sorted(self.durations.items())
+            counters = sorted(self.counters.items())
+            gauges = sorted(self.gauges.items())
+        for (name, labels), seconds in durations:
+            stage_labels = _format_labels(_merge(labels, {"stage": name}))
+            lines.append(f"paper_digest_stage_seconds{stage_labels} {seconds:.6f}")
+
+        typed: set[str] = set()
+        for (name, labels), value in counters:
+            metric = f"paper_digest_{name}_total"
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric}{_format_labels(labels)} {value}")
+        for name, value in gauges:
+            lines.append(f"# TYPE paper_digest_{name} gauge")
+            lines.append(f"paper_digest_{name} {value}")
+        lines.append("# TYPE paper_digest_last_run_timestamp_seconds gauge")
+        lines.append(f"paper_digest_last_run_timestamp_seconds {self.started_at:.0f}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, directory: Path) -> None:
+        directory.mkdir(parents=True, exist_ok=True)
+        # Written via rename so the textfile collector never reads half a file.
+        for filename, payload in (
+            (PROMETHEUS_FILE, self.prometheus_text()),
+            (SUMMARY_FILE, json.dumps(self.summary(), indent=2)),
+        ):
+            path = directory / filename
+            tmp_path = path.with_suffix(path.suffix + ".tmp")
+            _ = tmp_path.write_text(payload, encoding="utf-8")
+            os.replace(tmp_path, path)
+
+
+class _NullMetrics(Metrics):
+    enabled: bool = False
+
+    def stage(self, name: str, **labels: str) -> AbstractContextManager[None]:
+        return _NULL_STAGE
+
+    def add_duration(self, name: str, seconds: float, **labels: str) -> None:
+        return None
+
+    def increment(self, name: str, amount: int = 1, **labels: str) -> None:
+        return None
+
+    def set_gauge(self, name: str, value: float) -> None:
+        return None
+
+    def write(self, directory: Path) -> None:
+        return None
+
+
+_NULL_STAGE: AbstractContextManager[None] = nullcontext()
+NULL_METRICS: Metrics = _NullMetrics()
+_current: Metrics = NULL_METRICS
+
+
+def current() -> Metrics:
+    return _current
+
+
+@contextmanager
+def collecting(metrics: Metrics) -> Iterator[Metrics]:
+    """Make ``metrics`` the collector seen by ``current()`` on every thread."""
+    global _current
+    previous = _current
+    _current = metrics
+    try:
+        yield metrics
+    finally:
+        _current = previous
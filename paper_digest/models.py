@@ -1,5 +1,6 @@
 # pyright: reportImplicitOverride=false
 
+import sys
 from dataclasses import dataclass, field
 from typing import TypedDict
 
@@ -13,7 +14,7 @@ class PaperDict(TypedDict):
     keywords_matched: list[str]
 
 
-@dataclass(eq=False)
+@dataclass(eq=False, slots=True)
 class Paper:
     title: str
     authors: list[str]
@@ -23,7 +24,14 @@ class Paper:
     keywords_matched: list[str] = field(default_factory=list)
 
     def __post_init__(self) -> None:
+        # Sources, dates and keywords repeat across nearly every paper in a
+        # batch, so intern them to share one string object per distinct value.
         self.link = self._normalize_link(self.link)
+        self.published_date = sys.intern(self.published_date)
+        self.source = sys.intern(self.source)
+        self.keywords_matched = [
+            sys.intern(keyword) for keyword in self.keywords_matched
+        ]
 
     @staticmethod
     def _normalize_link(link: str) -> str:
@@ -35,8 +43,25 @@ class Paper:
         return self.link == other.link
 
     def __hash__(self) -> int:
+        # str caches its own hash, so this is computed once per link string
+        # and still follows the link if it is reassigned.
         return hash(self.link)
 
+    def __reduce__(self) -> tuple[type["Paper"], tuple[object, ...]]:
+        # Rebuild through __init__ so the receiving process interns the
+        # repeated strings again.
+        return (
+            Paper,
+            (
+                self.title,
+                self.authors,
+                self.link,
+                self.published_date,
+                self.source,
+                self.keywords_matched,
+            ),
+        )
+
     def to_dict(self) -> PaperDict:
         return {
             "title": self.title,
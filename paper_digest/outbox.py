@@ -0,0 +1,207 @@
+# pyright: reportMissingImports=false, reportUnknownVariableType=false, reportUnknownMemberType=false, reportUnknownArgumentType=false
+
+import hashlib
+import json
+import logging
+import os
+import smtplib
+import time
+from dataclasses import asdict, dataclass, field
+from email import message_from_bytes, policy
+from email.message import Message
+from pathlib import Path
+
+from paper_digest.smtp_session import SmtpSession
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class OutboxItem:
+    message_id: str
+    recipients: str
+    links: list[str] = field(default_factory=list)
+    attempts: int = 0
+    next_attempt_at: float = 0.0
+    last_error: str = ""
+
+
+def make_message_id(recipients: str, links: list[str]) -> str:
+    digest = hashlib.sha256()
+    digest.update(recipients.encode("utf-8"))
+    for link in sorted(links):
+        digest.update(b"\0")
+        digest.update(link.encode("utf-8"))
+    return f"<{digest.hexdigest()[:32]}@paper-digest>"
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    _ = tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+class Outbox:
+    def __init__(
+        self,
+        directory: Path,
+        max_attempts: int = 10,
+        base_delay: float = 60.0,
+        max_delay: float = 3600.0,
+    ):
+        self.directory: Path = directory
+        self.sent_directory: Path = directory / "sent"
+        self.failed_directory: Path = directory / "failed"
+        self.max_attempts: int = max_attempts
+        self.base_delay: float = base_delay
+        self.max_delay: float = max_delay
+        for path in (self.directory, self.sent_directory, self.failed_directory):
+            path.mkdir(parents=True, exist_ok=True)
+
+    def _stem(self, message_id: str) -> str:
+        return message_id.strip("<>").split("@", 1)[0]
+
+    def _meta_path(self, directory: Path, message_id: str) -> Path:
+        return directory / f"{self._stem(message_id)}.json"
+
+    def _message_path(self, directory: Path, message_id: str) -> Path:
+        return directory / f"{self._stem(message_id)}.eml"
+
+    def spool(self, message: Message, links: list[str]) -> str:
+        recipients = str(message.get("To", ""))
+        message_id = make_message_id(recipients, links)
+        meta_path = self._meta_path(self.directory, message_id)
+        if meta_path.exists() or self._meta_path(
+            self.sent_directory, message_id
+        ).exists():
+            return message_id
+
+        del message["Message-ID"]
+        message["Message-ID"] = message_id
+        # The message body is written first: a metadata file is what marks an
+        # item as spooled, so a crash in between leaves nothing half-queued.
+        _write_atomic(
+            self._message_path(self.directory, message_id), message.as_bytes()
+        )
+        self._write_item(
+            meta_path,
+            OutboxItem(message_id=message_id, recipients=recipients, links=links),
+        )
+        return message_id
+
+    def pending(self) -> list[OutboxItem]:
+        items: list[OutboxItem] = []
+        for meta_path in sorted(self.directory.glob("*.json")):
+            item = self._read_item(meta_path)
+            if item is not None:
+                items.append(item)
+        return items
+
+    def deliver(
+        self, session: SmtpSession, now: float | None = None
+    ) -> list[OutboxItem]:
+        current = time.time() if now is None else now
+        delivered: list[OutboxItem] = []
+        for item in self.pending():
+            if item.next_attempt_at > current:
+                continue
+            if self._meta_path(self.sent_directory, item.message_id).exists():
+                self._finish(item)
+                delivered.append(item)
+                continue
+
+            try:
+                raw = self._message_path(self.directory, item.message_id).read_bytes()
+                session.send(message_from_bytes(raw, policy=policy.SMTP))
+            except (smtplib.SMTPException, OSError) as exc:
+                self._record_failure(item, exc, current)
+                # The relay is struggling; leave the rest for the next drain.
+                break
+
+            self._finish(item)
+            delivered.append(item)
+        return delivered
+
+    def requeue_failed(self) -> list[OutboxItem]:
+        """Move given-up messages back into the outbox with fresh attempts."""
+        requeued: list[OutboxItem] = []
+        for meta_path in sorted(self.failed_directory.glob("*.json")):
+            item = self._read_item(meta_path)
+            if item is None:
+                continue
+            failed_message = self._message_path(self.failed_directory, item.message_id)
+            if failed_message.exists():
+                os.replace(
+                    failed_message, self._message_path(self.directory, item.message_id)
+                )
+            elif not self._message_path(self.directory, item.message_id).exists():
+                logger.warning(
+                    "Cannot requeue outbox message %s: message file is missing",
+                    item.message_id,
+                )
+                continue
+            item.attempts = 0
+            item.next_attempt_at = 0.0
+            item.last_error = ""
+            self._write_item(self._meta_path(self.directory, item.message_id), item)
+            meta_path.unlink()
+            requeued.append(item)
+        return requeued
+
+    def _finish(self, item: OutboxItem) -> None:
+        self._write_item(self._meta_path(self.sent_directory, item.message_id), item)
+        self._meta_path(self.directory, item.message_id).unlink(missing_ok=True)
+        self._message_path(self.directory, item.message_id).unlink(missing_ok=True)
+
+    def _record_failure(self, item: OutboxItem, exc: Exception, now: float) -> None:
+        item.attempts += 1
+        item.last_error = str(exc)
+        if item.attempts >= self.max_attempts:
+            logger.error(
+                "Giving up on outbox message %s after %d attempts: %s",
+                item.message_id,
+                item.attempts,
+                exc,
+            )
+            # The message moves with its metadata so requeue_failed() can send
+            # it again; its papers stay queued until then.
+            message_path = self._message_path(self.directory, item.message_id)
+            if message_path.exists():
+                os.replace(
+                    message_path,
+                    self._message_path(self.failed_directory, item.message_id),
+                )
+            self._write_item(
+                self._meta_path(self.failed_directory, item.message_id), item
+            )
+            self._meta_path(self.directory, item.message_id).unlink(missing_ok=True)
+            return
+
+        delay = min(self.base_delay * 2 ** (item.attempts - 1), self.max_delay)
+        item.next_attempt_at = now + delay
+        logger.warning(
+            "Outbox delivery of %s failed (attempt %d), retrying in %.0fs: %s",
+            item.message_id,
+            item.attempts,
+            delay,
+            exc,
+        )
+        self._write_item(self._meta_path(self.directory, item.message_id), item)
+
+    def _write_item(self, path: Path, item: OutboxItem) -> None:
+        _write_atomic(path, json.dumps(asdict(item), indent=2).encode("utf-8"))
+
+    def _read_item(self, path: Path) -> OutboxItem | None:
+        try:
+            loaded: object = json.loads(path.read_text(encoding="utf-8"))  # pyright: ignore[reportAny]
+        except (OSError, json.JSONDecodeError) as exc:
+            logger.warning("Skipping unreadable outbox entry %s: %s", path.name, exc)
+            return None
+        if not isinstance(loaded, dict):
+            logger.warning("Skipping unreadable outbox entry %s", path.name)
+            return None
+        try:
+            return OutboxItem(**loaded)
+        except TypeError as exc:
+            logger.warning("Skipping unreadable outbox entry %s: %s", path.name, exc)
+            return None
@@ -0,0 +1,86 @@
+import threading
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from types import TracebackType
+from typing import ParamSpec, TypeVar
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+class ParseExecutor:
+    """Runs parse functions in the calling thread."""
+
+    workers: int = 0
+
+    def run(self, func: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+        return func(*args, **kwargs)
+
+    def close(self) -> None:
+        return None
+
+    def __enter__(self) -> "ParseExecutor":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+class ProcessParseExecutor(ParseExecutor):
+    """Runs parse functions in a pool of worker processes.
+
+    ``func`` must be a module-level function and its arguments and result
+    must pickle, so callers send raw response text and get back plain dicts
+    rather than parser objects. The pool starts on first use.
+    """
+
+    def __init__(self, workers: int) -> None:
+        self.workers: int = workers
+        self._pool: ProcessPoolExecutor | None = None
+        # Fetcher threads call run() concurrently; only one may start the pool.
+        self._lock: threading.Lock = threading.Lock()
+
+    def run(self, func: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            pool = self._pool
+        return pool.submit(func, *args, **kwargs).result()
+
+    def close(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+
+
+INLINE_PARSER = ParseExecutor()
+
+
+def create_parse_executor(workers: int) -> ParseExecutor:
+    return ProcessParseExecutor(workers) if workers > 0 else ParseExecutor()
+
+
+_current: ParseExecutor = INLINE_PARSER
+
+
+def current() -> ParseExecutor:
+    return _current
+
+
+@contextmanager
+def parsing_with(executor: ParseExecutor) -> Iterator[ParseExecutor]:
+    """Make ``executor`` the one seen by ``current()`` on every thread."""
+    global _current
+    previous = _current
+    _current = executor
+    try:
+        yield executor
+    finally:
+        _current = previous
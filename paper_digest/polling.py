@@ -0,0 +1,148 @@
+# pyright: reportMissingImports=false, reportUnknownVariableType=false, reportUnknownMemberType=false, reportUnknownArgumentType=false
+
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+WEEK_SECONDS = 7 * 24 * 3600
+
+
+@dataclass
+class PollHistory:
+    changes: list[float] = field(default_factory=list)
+    unchanged_streak: int = 0
+
+
+def _week_offset(start: float, end: float) -> float:
+    """Seconds from ``start`` forward to ``end``, both taken modulo one week."""
+    return (end - start) % WEEK_SECONDS
+
+
+class AdaptivePoller:
+    """Chooses per-source poll delays from when each source actually changed.
+
+    Changes are folded onto a weekly cycle, which captures both daily and
+    weekday-only release schedules. A time of week that saw at least
+    ``min_observations`` changes is treated as an expected release: polling
+    tightens to ``min_interval`` inside ``window`` seconds of it, until the
+    release is observed. Outside those windows every unchanged poll doubles
+    the delay, up to ``max_interval``.
+    """
+
+    MAX_CHANGES: int = 60
+
+    def __init__(
+        self,
+        state_file: Path,
+        min_interval: float = 300.0,
+        max_interval: float = 6 * 3600.0,
+        window: float = 1800.0,
+        backoff: float = 2.0,
+        min_observations: int = 2,
+    ):
+        self.state_file: Path = state_file
+        self.min_interval: float = min_interval
+        self.max_interval: float = max_interval
+        self.window: float = window
+        self.backoff: float = backoff
+        self.min_observations: int = min_observations
+        self._history: dict[str, PollHistory] = self._load()
+
+    def _load(self) -> dict[str, PollHistory]:
+        if not self.state_file.exists():
+            return {}
+        try:
+            loaded: object = json.loads(self.state_file.read_text(encoding="utf-8"))  # pyright: ignore[reportAny]
+        except (OSError, json.JSONDecodeError) as exc:
+            logger.warning("Failed to load poll history, starting fresh: %s", exc)
+            return {}
+        if not isinstance(loaded, dict):
+            logger.warning("Failed to load poll history, starting fresh")
+            return {}
+
+        history: dict[str, PollHistory] = {}
+        for source, data in loaded.items():
+            if not isinstance(data, dict):
+                continue
+            changes = data.get("changes", [])
+            streak = data.get("unchanged_streak", 0)
+            history[str(source)] = PollHistory(
+                changes=[
+                    float(value)
+                    for value in changes
+                    if isinstance(value, (int, float))
+                ]
+                if isinstance(changes, list)
+                else [],
+                unchanged_streak=streak if isinstance(streak, int) else 0,
+            )
+        return history
+
+    def _save(self) -> None:
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_file.with_suffix(self.state_file.suffix + ".tmp")
+        payload = json.dumps(
+            {source: asdict(item) for source, item in sorted(self._history.items())},
+            indent=2,
+        )
+        _ = tmp_path.write_text(payload, encoding="utf-8")
+        os.replace(tmp_path, self.state_file)
+
+    def history(self, source: str) -> PollHistory:
+        return self._history.setdefault(source, PollHistory())
+
+    def record(self, source: str, changed: bool, now: float) -> None:
+        item = self.history(source)
+        if changed:
+            item.changes.append(now)
+            del item.changes[: -self.MAX_CHANGES]
+            item.unchanged_streak = 0
+        else:
+            item.unchanged_streak += 1
+        self._save()
+
+    def release_slots(self, source: str) -> list[float]:
+        changes = self.history(source).changes
+        slots: list[float] = []
+        for change in changes:
+            nearby = sum(
+                1
+                for other in changes
+                if min(_week_offset(change, other), _week_offset(other, change))
+                <= self.window
+            )
+            if nearby >= self.min_observations:
+                slots.append(change % WEEK_SECONDS)
+        return slots
+
+    def _next_release(self, source: str, now: float) -> float | None:
+        item = self.history(source)
+        last_change = item.changes[-1] if item.changes else None
+        upcoming: float | None = None
+        for slot in self.release_slots(source):
+            offset = _week_offset(now, slot)
+            if offset > WEEK_SECONDS - self.window:
+                # The expected time has just passed; we are still inside its window.
+                offset -= WEEK_SECONDS
+            expected = now + offset
+            if last_change is not None and abs(last_change - expected) <= self.window:
+                continue
+            if upcoming is None or expected < upcoming:
+                upcoming = expected
+        return upcoming
+
+    def next_delay(self, source: str, base_interval: float, now: float) -> float:
+        item = self.history(source)
+        delay = min(
+            base_interval * self.backoff**item.unchanged_streak, self.max_interval
+        )
+        upcoming = self._next_release(source, now)
+        if upcoming is not None:
+            if upcoming - now <= self.window:
+                return self.min_interval
+            delay = min(delay, upcoming - self.window - now)
+        return max(self.min_interval, delay)
@@ -0,0 +1,149 @@
+import cProfile
+import io
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager
+from pathlib import Path
+from types import TracebackType
+
+from paper_digest.metrics import Metrics
+
+# "dedup" is timed per paper as papers stream in, so it has no block to profile.
+PROFILED_STAGES = frozenset({"fetch", "storage", "render", "send"})
+
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+)
+
+# cProfile can only have one active profiler per interpreter (3.12+) or per
+# thread (earlier); stages that start while one is running are only timed.
+_active_profile = threading.Lock()
+
+
+def _stage_key(name: str, labels: dict[str, str]) -> str:
+    parts = [name, *(labels[key] for key in sorted(labels))]
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", "-".join(parts))
+
+
+class Profiler(Metrics):
+    """Metrics collector that also profiles the outermost stage of each kind.
+
+    Each stage in ``PROFILED_STAGES`` gets its own cProfile statistics and a
+    tracemalloc diff, keyed by stage name and labels (``fetch-arxiv``).
+    Use as a context manager to start and stop tracemalloc around a run.
+    """
+
+    def __init__(self, top: int = 20) -> None:
+        super().__init__()
+        self.top: int = top
+        self.profiles: dict[str, pstats.Stats] = {}
+        # Per stage: "file:line" -> [bytes allocated, blocks allocated].
+        self.allocations: dict[str, dict[str, list[int]]] = {}
+        self._started_tracemalloc: bool = False
+
+    def __enter__(self) -> "Profiler":
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def stage(self, name: str, **labels: str) -> AbstractContextManager[None]:
+        if name not in PROFILED_STAGES:
+            return super().stage(name, **labels)
+        return self._profiled(name, labels)
+
+    @contextmanager
+    def _profiled(self, name: str, labels: dict[str, str]) -> Iterator[None]:
+        if not _active_profile.acquire(blocking=False):
+            with self._timed(name, labels):
+                yield
+            return
+
+        key = _stage_key(name, labels)
+        tracing = tracemalloc.is_tracing()
+        before = tracemalloc.take_snapshot() if tracing else None
+        profile = cProfile.Profile()
+        try:
+            with self._timed(name, labels):
+                profile.enable()
+                try:
+                    yield
+                finally:
+                    profile.disable()
+        finally:
+            _active_profile.release()
+            self._record(key, profile, before)
+
+    def _record(
+        self,
+        key: str,
+        profile: cProfile.Profile,
+        before: tracemalloc.Snapshot | None,
+    ) -> None:
+        diffs: list[tracemalloc.StatisticDiff] = []
+        if before is not None and tracemalloc.is_tracing():
+            after = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+            diffs = after.compare_to(before.filter_traces(_SNAPSHOT_FILTERS), "lineno")
+        with self._lock:
+            stats = self.profiles.get(key)
+            if stats is None:
+                self.profiles[key] = pstats.Stats(profile)
+            else:
+                _ = stats.add(profile)
+            allocations = self.allocations.setdefault(key, {})
+            for diff in diffs:
+                frame = diff.traceback[0]
+                location = f"{frame.filename}:{frame.lineno}"
+                totals = allocations.setdefault(location, [0, 0])
+                totals[0] += diff.size_diff
+                totals[1] += diff.count_diff
+
+    def report(self) -> str:
+        out = io.StringIO()
+        for key in sorted(self.profiles):
+            stats = self.profiles[key]
+            _ = out.write(f"== {key} ({stats.total_tt:.3f}s profiled) ==\n")
+            _ = out.write(f"Top {self.top} functions by cumulative time:\n")
+            stats.stream = out  # pyright: ignore[reportAttributeAccessIssue]
+            _ = stats.sort_stats("cumulative").print_stats(self.top)
+
+            allocations = sorted(
+                self.allocations.get(key, {}).items(),
+                key=lambda item: item[1][0],
+                reverse=True,
+            )[: self.top]
+            _ = out.write(f"Top {self.top} allocations:\n")
+            if not allocations:
+                _ = out.write("  (none recorded)\n")
+            for location, (size, count) in allocations:
+                _ = out.write(
+                    f"  {location}: {size / 1024:+.1f} KiB in {count:+d} blocks\n"
+                )
+            _ = out.write("\n")
+        return out.getvalue()
+
+    def save(self, directory: Path) -> Path:
+        run_directory = directory / time.strftime(
+            "%Y%m%d-%H%M%S", time.localtime(self.started_at)
+        )
+        run_directory.mkdir(parents=True, exist_ok=True)
+        for key, stats in self.profiles.items():
+            stats.dump_stats(run_directory / f"{key}.prof")
+        _ = (run_directory / "report.txt").write_text(self.report(), encoding="utf-8")
+        return run_directory
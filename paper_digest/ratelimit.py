@@ -0,0 +1,216 @@
+# pyright: reportMissingImports=false, reportUnknownVariableType=false, reportUnknownMemberType=false, reportUnknownArgumentType=false, reportIncompatibleMethodOverride=false
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Mapping
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from paper_digest.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Statuses whose Retry-After header asks us to stay away from the host.
+BACKOFF_STATUSES = frozenset({429, 503})
+ROBOTS_PATH = "/robots.txt"
+
+CrawlDelayLookup = Callable[[str, str, requests.Session | None], float | None]
+
+
+class HostBackoffError(requests.ConnectionError):
+    """A host asked for a longer pause than the limiter is willing to wait."""
+
+
+class TokenBucket:
+    """Hands out request slots at ``rate`` per second with ``burst`` capacity.
+
+    ``reserve`` always takes a token and returns how long the caller must
+    wait for it, so concurrent callers queue up one interval apart.
+    """
+
+    def __init__(self, rate: float, burst: int, now: float) -> None:
+        self.rate: float = rate
+        self.capacity: float = float(max(1, burst))
+        self.tokens: float = self.capacity
+        self.updated: float = now
+
+    def reserve(self, now: float) -> float:
+        refill = (now - self.updated) * self.rate
+        self.tokens = min(self.capacity, self.tokens + refill)
+        self.updated = now
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+def parse_retry_after(value: str, now: float) -> float | None:
+    """Seconds to wait for a ``Retry-After`` header (delta-seconds or HTTP-date)."""
+    value = value.strip()
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - now)
+    except (TypeError, ValueError):
+        return None
+
+
+def fetch_crawl_delay(
+    base_url: str, user_agent: str, http: requests.Session | None = None
+) -> float | None:
+    get = http.get if http is not None else requests.get
+    try:
+        response = get(
+            f"{base_url}{ROBOTS_PATH}", headers={"User-Agent": user_agent}, timeout=10
+        )
+    except requests.RequestException:
+        return None
+    if response.status_code != 200:
+        return None
+    robots = RobotFileParser()
+    robots.parse(response.text.splitlines())
+    delay = robots.crawl_delay(user_agent)
+    return float(delay) if delay is not None else None
+
+
+class HostRateLimiter:
+    """Per-host token buckets plus ``Retry-After`` and robots.txt politeness.
+
+    Each host gets ``rate`` requests per second (``host_rates`` overrides it
+    by host name) with bursts of ``burst``. A robots.txt ``Crawl-delay`` or
+    an explicit host rate caps that host further and disables bursting.
+    Waiting happens outside the limiter's lock, so threads talking to other
+    hosts are never held up by a slow one. robots.txt is fetched through
+    ``http`` (the session the limiter is mounted on) under a per-host lock.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        host_rates: Mapping[str, float] | None = None,
+        user_agent: str = "",
+        respect_robots: bool = True,
+        max_wait: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+        crawl_delay: CrawlDelayLookup = fetch_crawl_delay,
+        http: requests.Session | None = None,
+    ) -> None:
+        self.rate: float = rate
+        self.burst: int = burst
+        self.host_rates: dict[str, float] = dict(host_rates or {})
+        self.user_agent: str = user_agent
+        self.respect_robots: bool = respect_robots
+        self.max_wait: float = max_wait
+        self.clock: Callable[[], float] = clock
+        self.wall_clock: Callable[[], float] = wall_clock
+        self.sleep: Callable[[float], None] = sleep
+        self.crawl_delay: CrawlDelayLookup = crawl_delay
+        self.http: requests.Session | None = http
+        self._lock: threading.Lock = threading.Lock()
+        self._host_locks: dict[str, threading.Lock] = {}
+        self._buckets: dict[str, TokenBucket | None] = {}
+        self._blocked_until: dict[str, float] = {}
+
+    def _new_bucket(self, scheme: str, host: str, now: float) -> TokenBucket | None:
+        rate, burst = self.rate, self.burst
+        if host in self.host_rates:
+            rate, burst = self.host_rates[host], 1
+        if self.respect_robots:
+            delay = self.crawl_delay(f"{scheme}://{host}", self.user_agent, self.http)
+            if delay:
+                logger.info("robots.txt for %s asks for %.1fs per request", host, delay)
+                rate = min(rate, 1 / delay) if rate > 0 else 1 / delay
+                burst = 1
+        return TokenBucket(rate, burst, now) if rate > 0 else None
+
+    def _ensure_bucket(self, scheme: str, host: str) -> None:
+        with self._lock:
+            if host in self._buckets:
+                return
+            host_lock = self._host_locks.setdefault(host, threading.Lock())
+        # Only threads waiting on this host's robots.txt block here.
+        with host_lock:
+            if host in self._buckets:
+                return
+            bucket = self._new_bucket(scheme, host, self.clock())
+            with self._lock:
+                self._buckets[host] = bucket
+
+    def acquire(self, url: str) -> None:
+        parts = urlsplit(url)
+        if parts.path == ROBOTS_PATH:
+            # Sent while the host's bucket is being built from it.
+            return
+        host = parts.netloc.lower()
+        self._ensure_bucket(parts.scheme or "https", host)
+        with self._lock:
+            now = self.clock()
+            bucket = self._buckets[host]
+            wait = bucket.reserve(now) if bucket is not None else 0.0
+            wait = max(wait, self._blocked_until.get(host, now) - now)
+        if wait > self.max_wait:
+            raise HostBackoffError(
+                f"{host} asked to wait {wait:.0f}s, longer than {self.max_wait:.0f}s"
+            )
+        if wait > 0:
+            self.sleep(wait)
+
+    def observe(self, url: str, response: requests.Response) -> None:
+        if response.status_code not in BACKOFF_STATUSES:
+            return
+        header = response.headers.get("Retry-After")
+        if not isinstance(header, str):
+            return
+        delay = parse_retry_after(header, self.wall_clock())
+        if delay is None:
+            return
+        host = urlsplit(url).netloc.lower()
+        logger.warning(
+            "%s returned %d; pausing it for %.0fs", host, response.status_code, delay
+        )
+        with self._lock:
+            until = self.clock() + delay
+            self._blocked_until[host] = max(self._blocked_until.get(host, 0.0), until)
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """Transport adapter that waits for the host's rate limiter before sending."""
+
+    def __init__(self, limiter: HostRateLimiter) -> None:
+        super().__init__()
+        self.limiter: HostRateLimiter = limiter
+
+    def send(
+        self, request: requests.PreparedRequest, *args: object, **kwargs: object
+    ) -> requests.Response:
+        url = str(request.url)
+        self.limiter.acquire(url)
+        response = super().send(request, *args, **kwargs)
+        self.limiter.observe(url, response)
+        return response
+
+
+def mount_rate_limiter(session: requests.Session, limiter: HostRateLimiter) -> None:
+    limiter.http = session
+    adapter = RateLimitedAdapter(limiter)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+
+def create_rate_limiter(config: Config) -> HostRateLimiter:
+    return HostRateLimiter(
+        config.rate_limit_per_host,
+        burst=config.rate_limit_burst,
+        host_rates=config.host_rate_limits,
+        user_agent=config.user_agent,
+        respect_robots=config.respect_robots_txt,
+        max_wait=config.max_host_wait,
+    )
@@ -0,0 +1,243 @@
+import html
+import string
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, fields
+from functools import lru_cache
+
+from paper_digest.models import Paper
+
+# Conservative allowance for MIME encoding: base64 grows bodies by 4/3 and
+# adds a line break every 76 characters.
+MIME_ENCODING_FACTOR = 1.37
+MESSAGE_OVERHEAD_BYTES = 2048
+
+SOURCE_NAMES: dict[str, str] = {
+    "arxiv": "arXiv (cond-mat/new)",
+    "nature": "Nature Communications",
+    "aps-prl": "Physical Review Letters",
+    "nature-journal": "Nature (journal)",
+}
+
+
+class Template:
+    def __init__(self, source: str, escape: Callable[[str], str] | None = None):
+        self.source: str = source
+        self._escape: Callable[[str], str] | None = escape
+        self._parts: list[tuple[str, str | None]] = [
+            (literal, field_name)
+            for literal, field_name, _spec, _conversion in string.Formatter().parse(
+                source
+            )
+        ]
+
+    def render(self, values: Mapping[str, object]) -> str:
+        escape = self._escape
+        pieces: list[str] = []
+        for literal, field_name in self._parts:
+            pieces.append(literal)
+            if field_name is None:
+                continue
+            value = str(values[field_name])
+            pieces.append(escape(value) if escape is not None else value)
+        return "".join(pieces)
+
+
+@lru_cache(maxsize=None)
+def compile_template(source: str, escape_html: bool = False) -> Template:
+    return Template(source, html.escape if escape_html else None)
+
+
+@dataclass(frozen=True)
+class DigestTemplates:
+    plain_header: str = (
+        "Daily Paper Digest\n\nSources checked: {sources}\n"
+        "Related papers found: {count}\n\n"
+    )
+    plain_source: str = "{name}: {count}\n"
+    plain_papers_start: str = "\n"
+    plain_paper: str = (
+        "Title: {title}\nAuthors: {authors}\nLink: {link}\n"
+        "Date: {published_date}\nKeywords: {keywords}\n\n"
+    )
+    plain_footer: str = "Matched keywords: {keywords}"
+    html_header: str = (
+        "<html><body><h2>Daily Paper Digest</h2>"
+        "<p><strong>Sources checked:</strong> {sources}</p>"
+        "<p><strong>Related papers found:</strong> {count}</p><ul>"
+    )
+    html_source: str = "<li>{name}: {count}</li>"
+    html_papers_start: str = "</ul><p>Matched keywords: {keywords}</p><ul>"
+    html_paper: str = (
+        "<li><strong>{title}</strong><br/>Authors: {authors}<br/>"
+        'Link: <a href="{link}">{link}</a><br/>Date: {published_date}<br/>'
+        "Keywords: {keywords}</li>"
+    )
+    html_footer: str = "</ul></body></html>"
+
+
+@dataclass(frozen=True)
+class DigestParts:
+    plain_header: str
+    plain_papers: list[str]
+    plain_footer: str
+    html_header: str
+    html_papers: list[str]
+    html_footer: str
+
+    @property
+    def plain(self) -> str:
+        return self.plain_header + "".join(self.plain_papers) + self.plain_footer
+
+    @property
+    def html(self) -> str:
+        return self.html_header + "".join(self.html_papers) + self.html_footer
+
+    def plain_for(self, chunk: range) -> str:
+        return (
+            self.plain_header
+            + "".join(self.plain_papers[chunk.start : chunk.stop])
+            + self.plain_footer
+        )
+
+    def html_for(self, chunk: range) -> str:
+        return (
+            self.html_header
+            + "".join(self.html_papers[chunk.start : chunk.stop])
+            + self.html_footer
+        )
+
+    def split(self, max_papers: int = 0, max_bytes: int = 0) -> list[range]:
+        count = len(self.plain_papers)
+        if not max_papers and not max_bytes:
+            return [range(0, count)]
+
+        fixed = MESSAGE_OVERHEAD_BYTES + MIME_ENCODING_FACTOR * _byte_length(
+            self.plain_header, self.plain_footer, self.html_header, self.html_footer
+        )
+        budget = max_bytes - fixed if max_bytes else 0.0
+
+        chunks: list[range] = []
+        start = 0
+        used = 0.0
+        for index in range(count):
+            size = MIME_ENCODING_FACTOR * _byte_length(
+                self.plain_papers[index], self.html_papers[index]
+            )
+            in_chunk = index - start
+            if in_chunk and (
+                (max_papers and in_chunk >= max_papers)
+                or (max_bytes and used + size > budget)
+            ):
+                chunks.append(range(start, index))
+                start = index
+                used = 0.0
+            used += size
+        chunks.append(range(start, count))
+        return chunks
+
+
+def _byte_length(*texts: str) -> int:
+    total = 0
+    for text in texts:
+        total += len(text) if text.isascii() else len(text.encode("utf-8"))
+    return total
+
+
+class DigestRenderer:
+    MAX_CACHED_FRAGMENTS: int = 50_000
+
+    def __init__(
+        self,
+        templates: DigestTemplates | None = None,
+        source_names: Mapping[str, str] | None = None,
+    ):
+        self.templates: DigestTemplates = templates or DigestTemplates()
+        self.source_names: Mapping[str, str] = (
+            source_names if source_names is not None else SOURCE_NAMES
+        )
+        self._compiled: dict[str, Template] = {
+            item.name: compile_template(
+                getattr(self.templates, item.name),
+                escape_html=item.name.startswith("html_"),
+            )
+            for item in fields(self.templates)
+        }
+        self._fragments: dict[tuple[str, tuple[str, ...]], tuple[str, str]] = {}
+
+    def paper_fragments(self, paper: Paper) -> tuple[str, str]:
+        # Keyed by link and matched keywords: the same paper is shared across
+        # recipient digests, but each recipient may see a narrower keyword list.
+        key = (paper.link, tuple(paper.keywords_matched))
+        cached = self._fragments.get(key)
+        if cached is not None:
+            return cached
+
+        values = {
+            "title": paper.title,
+            "authors": ", ".join(paper.authors) if paper.authors else "N/A",
+            "link": paper.link,
+            "published_date": paper.published_date,
+            "keywords": ", ".join(paper.keywords_matched),
+        }
+        fragments = (
+            self._compiled["plain_paper"].render(values),
+            self._compiled["html_paper"].render(values),
+        )
+        if len(self._fragments) >= self.MAX_CACHED_FRAGMENTS:
+            self._fragments.clear()
+        self._fragments[key] = fragments
+        return fragments
+
+    def render_parts(self, papers: list[Paper], matched: list[str]) -> DigestParts:
+        compiled = self._compiled
+        counts = source_counts(papers)
+        summary = {
+            "sources": ", ".join(self.source_names.values()),
+            "count": len(papers),
+        }
+        keywords = {"keywords": ", ".join(matched)}
+
+        plain_sources: list[str] = []
+        html_sources: list[str] = []
+        for source, name in self.source_names.items():
+            values = {"name": name, "count": counts.get(source, 0)}
+            plain_sources.append(compiled["plain_source"].render(values))
+            html_sources.append(compiled["html_source"].render(values))
+
+        plain_papers: list[str] = []
+        html_papers: list[str] = []
+        for paper in papers:
+            plain_fragment, html_fragment = self.paper_fragments(paper)
+            plain_papers.append(plain_fragment)
+            html_papers.append(html_fragment)
+
+        return DigestParts(
+            plain_header=compiled["plain_header"].render(summary)
+            + "".join(plain_sources)
+            + compiled["plain_papers_start"].render(keywords),
+            plain_papers=plain_papers,
+            plain_footer=compiled["plain_footer"].render(keywords),
+            html_header=compiled["html_header"].render(summary)
+            + "".join(html_sources)
+            + compiled["html_papers_start"].render(keywords),
+            html_papers=html_papers,
+            html_footer=compiled["html_footer"].render(keywords),
+        )
+
+
+def matched_keywords(papers: list[Paper]) -> list[str]:
+    seen: set[str] = set()
+    ordered: list[str] = []
+    for paper in papers:
+        for keyword in paper.keywords_matched:
+            if keyword not in seen:
+                seen.add(keyword)
+                ordered.append(keyword)
+    return ordered
+
+
+def source_counts(papers: list[Paper]) -> dict[str, int]:
+    counts: dict[str, int] = {}
+    for paper in papers:
+        counts[paper.source] = counts.get(paper.source, 0) + 1
+    return counts
@@ -0,0 +1,183 @@
+# pyright: reportMissingImports=false, reportUnknownVariableType=false, reportUnknownMemberType=false, reportUnknownArgumentType=false
+
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import requests
+
+from paper_digest.config import Config
+from paper_digest.metrics import current
+from paper_digest.ratelimit import HostBackoffError
+
+logger = logging.getLogger(__name__)
+
+# Statuses worth another attempt; anything else is returned or raised as is.
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Exponential backoff with full jitter between request attempts.
+
+    Attempt ``n`` (from 0) waits a random time up to
+    ``min(max_delay, base_delay * 2**n)``, so sources that fail together do
+    not retry in lockstep.
+    """
+
+    retries: int = 0
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+
+    @classmethod
+    def from_config(cls, config: Config) -> "RetryPolicy":
+        return cls(
+            retries=config.fetch_retries,
+            base_delay=config.retry_base_delay,
+            max_delay=config.retry_max_delay,
+        )
+
+    def delay(self, attempt: int, rng: Callable[[], float] = random.random) -> float:
+        return rng() * min(self.max_delay, self.base_delay * 2**attempt)
+
+
+NO_RETRY = RetryPolicy()
+
+
+def _retryable(exc: requests.RequestException) -> bool:
+    # A host that asked for a long pause will not be back within our backoff.
+    if isinstance(exc, HostBackoffError):
+        return False
+    return isinstance(exc, (requests.ConnectionError, requests.Timeout))
+
+
+def get_with_retries(
+    get: Callable[..., requests.Response],
+    url: str,
+    policy: RetryPolicy = NO_RETRY,
+    sleep: Callable[[float], None] = time.sleep,
+    **kwargs: object,
+) -> requests.Response:
+    """``get(url, **kwargs)``, retried on connection errors, timeouts and 429/5xx.
+
+    The last response still goes through ``raise_for_status``.
+    """
+    attempt = 0
+    while True:
+        try:
+            response = get(url, **kwargs)
+        except requests.RequestException as exc:
+            if attempt >= policy.retries or not _retryable(exc):
+                raise
+            logger.warning("Request to %s failed (%s); retrying", url, exc)
+        else:
+            if response.status_code not in RETRY_STATUSES or attempt >= policy.retries:
+                response.raise_for_status()
+                return response
+            logger.warning(
+                "Request to %s returned %d; retrying", url, response.status_code
+            )
+        current().increment("http_retries")
+        sleep(policy.delay(attempt))
+        attempt += 1
+
+
+@dataclass
+class CircuitState:
+    failures: int = 0
+    opened_at: float = 0.0
+
+
+class CircuitBreakers:
+    """Per-source circuit breakers that persist across runs.
+
+    ``threshold`` consecutive failed fetches open a source's breaker, and the
+    source is then skipped without a request. After ``cooldown`` seconds one
+    fetch is let through as a probe. Success closes the breaker; failure
+    keeps it open for another cooldown. A threshold of 0 never opens.
+    """
+
+    def __init__(
+        self,
+        state_file: Path,
+        threshold: int = 3,
+        cooldown: float = 1800.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.state_file: Path = state_file
+        self.threshold: int = threshold
+        self.cooldown: float = cooldown
+        self.clock: Callable[[], float] = clock
+        self._lock: threading.Lock = threading.Lock()
+        self._states: dict[str, CircuitState] = self._load()
+
+    def _load(self) -> dict[str, CircuitState]:
+        if not self.state_file.exists():
+            return {}
+        try:
+            loaded: object = json.loads(self.state_file.read_text(encoding="utf-8"))  # pyright: ignore[reportAny]
+        except (OSError, json.JSONDecodeError) as exc:
+            logger.warning("Failed to load circuit breakers, starting fresh: %s", exc)
+            return {}
+        if not isinstance(loaded, dict):
+            logger.warning("Failed to load circuit breakers, starting fresh")
+            return {}
+
+        states: dict[str, CircuitState] = {}
+        for source, data in loaded.items():
+            if not isinstance(data, dict):
+                continue
+            failures = data.get("failures", 0)
+            opened_at = data.get("opened_at", 0.0)
+            states[str(source)] = CircuitState(
+                failures=failures if isinstance(failures, int) else 0,
+                opened_at=float(opened_at)
+                if isinstance(opened_at, (int, float))
+                else 0.0,
+            )
+        return states
+
+    def _save(self) -> None:
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_file.with_suffix(self.state_file.suffix + ".tmp")
+        payload = json.dumps(
+            {source: asdict(state) for source, state in sorted(self._states.items())},
+            indent=2,
+        )
+        _ = tmp_path.write_text(payload, encoding="utf-8")
+        os.replace(tmp_path, self.state_file)
+
+    def allow(self, source: str) -> bool:
+        """Whether ``source`` may be fetched now, either closed or due a probe."""
+        with self._lock:
+            state = self._states.get(source)
+            if self.threshold <= 0 or state is None or state.failures < self.threshold:
+                return True
+            return self.clock() - state.opened_at >= self.cooldown
+
+    def record_success(self, source: str) -> None:
+        with self._lock:
+            if self._states.pop(source, None) is None:
+                return
+            logger.info("Circuit for %s closed", source)
+            self._save()
+
+    def record_failure(self, source: str) -> None:
+        with self._lock:
+            state = self._states.setdefault(source, CircuitState())
+            state.failures += 1
+            if self.threshold > 0 and state.failures >= self.threshold:
+                state.opened_at = self.clock()
+                logger.warning(
+                    "Circuit for %s open after %d failure(s); next probe in %.0fs",
+                    source,
+                    state.failures,
+                    self.cooldown,
+                )
+            self._save()
@@ -1,53 +1,570 @@
 # pyright: reportMissingImports=false, reportUnknownVariableType=false, reportUnknownMemberType=false, reportUnknownParameterType=false, reportUnknownArgumentType=false
 
+import argparse
 import logging
+import queue
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from datetime import date
+from pathlib import Path
+from typing import cast
 
-from paper_digest.config import Config, STATE_FILE, get_config
+import requests
+
+from paper_digest.config import Config, get_config
 from paper_digest.emailer import Emailer
+from paper_digest.fanout import assign_papers, delivered_papers, send_profile_digests
+from paper_digest.feedlist import (
+    import_opml,
+    run_feed_validation,
+    with_recorded_parsers,
+)
 from paper_digest.fetchers.aps_prl_rss import ApsPrlRssFetcher
 from paper_digest.fetchers.arxiv import ArxivFetcher
+from paper_digest.fetchers.common import Fetcher, GuardedFetcher
+from paper_digest.fetchers.feed import FeedFetcher
 from paper_digest.fetchers.nature import NatureFetcher
 from paper_digest.fetchers.nature_journal_rss import NatureJournalRssFetcher
+from paper_digest.http_archive import open_http_session
+from paper_digest.metrics import NULL_METRICS, Metrics, collecting, current
 from paper_digest.models import Paper
+from paper_digest.outbox import Outbox
+from paper_digest.parsing import create_parse_executor, parsing_with
+from paper_digest.profiling import Profiler
+from paper_digest.resilience import CircuitBreakers
+from paper_digest.smtp_session import SmtpSession, SmtpSessionPool
 from paper_digest.storage import PaperStorage
+from paper_digest.watermarks import WatermarkStore
 
 logger = logging.getLogger(__name__)
 
 
-def run_digest(config: Config) -> int:
-    try:
-        storage = PaperStorage(STATE_FILE)
-        emailer = Emailer(config)
-        fetchers = [
-            ArxivFetcher(config),
-            NatureFetcher(config),
-            ApsPrlRssFetcher(config),
-            NatureJournalRssFetcher(config),
-        ]
+def build_fetchers(
+    config: Config,
+    storage: PaperStorage,
+    watermarks: WatermarkStore,
+    http: requests.Session | None = None,
+    breakers: CircuitBreakers | None = None,
+) -> list[Fetcher]:
+    is_seen = storage.is_seen_link
+    fetchers: list[Fetcher] = [ArxivFetcher(config, is_seen, watermarks, http)]
+    if config.feeds:
+        fetchers.extend(
+            FeedFetcher(config, feed, is_seen, watermarks, http)
+            for feed in with_recorded_parsers(config)
+        )
+    else:
+        fetchers.extend(
+            [
+                NatureFetcher(config, is_seen, watermarks, http),
+                ApsPrlRssFetcher(config, is_seen, watermarks, http),
+                NatureJournalRssFetcher(config, is_seen, watermarks, http),
+            ]
+        )
+    if breakers is None:
+        return fetchers
+    return [GuardedFetcher(fetcher, breakers) for fetcher in fetchers]
+
+
+def open_circuit_breakers(config: Config) -> CircuitBreakers:
+    return CircuitBreakers(
+        config.circuit_breaker_file,
+        threshold=config.breaker_threshold,
+        cooldown=config.breaker_cooldown,
+    )
+
+
+# Papers buffered between fetchers and the dedup stage before fetchers block.
+STREAM_BUFFER = 256
+_DONE = object()
+
+
+def fetch_new_papers(
+    fetchers: list[Fetcher], storage: PaperStorage, workers: int = 1
+) -> list[Paper]:
+    return _collect(stream_papers(fetchers, workers), storage)
+
 
-        all_papers: list[Paper] = []
-        for fetcher in fetchers:
+def _collect(
+    papers: Iterator[tuple[int, Paper]], storage: PaperStorage
+) -> list[Paper]:
+    metrics = current()
+    new_papers = list(_unseen(papers, storage))
+    metrics.increment("papers_new", len(new_papers))
+    # Concurrent fetchers interleave; keep the digest in fetcher order.
+    new_papers.sort(key=lambda item: item[0])
+    return [paper for _index, paper in new_papers]
+
+
+class PaperStream:
+    """Papers from fetchers running on background threads.
+
+    Up to ``workers`` fetchers run at a time and hand papers over through a
+    bounded queue, so downstream stages start while slower fetchers are
+    still downloading and memory stays bounded. ``take`` can stop at a
+    deadline and be called again later to carry on where it stopped.
+    """
+
+    def __init__(self, fetchers: list[Fetcher], workers: int = 1) -> None:
+        self.fetchers: list[Fetcher] = fetchers
+        self.pending: set[int] = set(range(len(fetchers)))
+        self._buffer: queue.Queue[tuple[int, object]] = queue.Queue(
+            maxsize=STREAM_BUFFER
+        )
+        self._cancelled: threading.Event = threading.Event()
+        self._pool: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=max(1, min(workers, len(fetchers)))
+        )
+        for index, fetcher in enumerate(fetchers):
+            _ = self._pool.submit(
+                _produce, index, fetcher, self._buffer, self._cancelled
+            )
+
+    def pending_sources(self) -> list[str]:
+        return [self.fetchers[index].SOURCE for index in sorted(self.pending)]
+
+    def take(self, deadline: float | None = None) -> Iterator[tuple[int, Paper]]:
+        """Yield ``(fetcher index, paper)`` pairs as fetchers produce them.
+
+        Stops once every fetcher has finished, or when ``deadline`` (a
+        ``time.monotonic()`` value) passes.
+        """
+        while self.pending:
+            timeout = None
+            if deadline is not None:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    return
             try:
-                all_papers.extend(fetcher.fetch())
-            except Exception:
-                logger.exception("Fetcher failed: %s", fetcher.__class__.__name__)
+                index, item = self._buffer.get(timeout=timeout)
+            except queue.Empty:
+                return
+            if item is _DONE:
+                self.pending.discard(index)
+                continue
+            yield index, cast(Paper, item)
+
+    def close(self) -> None:
+        self._cancelled.set()
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+def stream_papers(
+    fetchers: list[Fetcher], workers: int = 1
+) -> Iterator[tuple[int, Paper]]:
+    """Yield ``(fetcher index, paper)`` pairs until every fetcher has finished."""
+    if not fetchers:
+        return
+    stream = PaperStream(fetchers, workers)
+    try:
+        yield from stream.take()
+    finally:
+        stream.close()
+
+
+def _produce(
+    index: int,
+    fetcher: Fetcher,
+    buffer: "queue.Queue[tuple[int, object]]",
+    cancelled: threading.Event,
+) -> None:
+    metrics = current()
+    matched = 0
+    try:
+        with metrics.stage("fetch", source=fetcher.SOURCE):
+            for paper in fetcher.iter_papers():
+                if not _hand_over(buffer, (index, paper), cancelled):
+                    return
+                matched += 1
+    except Exception:
+        logger.exception("Fetcher failed: %s", fetcher.SOURCE)
+        metrics.increment("fetch_failures", source=fetcher.SOURCE)
+    else:
+        metrics.increment("papers_matched", matched, source=fetcher.SOURCE)
+    finally:
+        _ = _hand_over(buffer, (index, _DONE), cancelled)
+
+
+def _hand_over(
+    buffer: "queue.Queue[tuple[int, object]]",
+    item: tuple[int, object],
+    cancelled: threading.Event,
+) -> bool:
+    while not cancelled.is_set():
+        try:
+            buffer.put(item, timeout=0.1)
+        except queue.Full:
+            continue
+        return True
+    return False
+
+
+def _unseen(
+    papers: Iterator[tuple[int, Paper]], storage: PaperStorage
+) -> Iterator[tuple[int, Paper]]:
+    elapsed = 0.0
+    try:
+        for item in papers:
+            started = time.perf_counter()
+            seen = storage.is_seen(item[1])
+            elapsed += time.perf_counter() - started
+            if not seen:
+                yield item
+    finally:
+        current().add_duration("dedup", elapsed)
 
-        new_papers = [paper for paper in all_papers if not storage.is_seen(paper)]
-        if not new_papers:
-            return 0
 
-        sent = emailer.send_digest(new_papers)
-        if not sent:
-            return 1
+def deliver_papers(
+    config: Config,
+    emailer: Emailer,
+    session: SmtpSession,
+    storage: PaperStorage,
+    watermarks: WatermarkStore,
+    new_papers: list[Paper],
+    sources: list[str] | None = None,
+) -> int:
+    """Send ``new_papers`` and commit the watermarks of ``sources`` (all if None).
 
-        for paper in new_papers:
-            storage.mark_seen(paper)
+    When sending fails, those watermarks are discarded instead, so the next
+    run fetches the undelivered papers again.
+    """
+    if config.outbox_enabled:
+        outbox = Outbox(config.outbox_dir)
+        for to, papers in _digests(config, new_papers):
+            for message, part_papers in emailer.build_messages(papers, to):
+                _ = outbox.spool(message, [paper.link for paper in part_papers])
+        with current().stage("storage"):
+            storage.mark_queued(new_papers)
+            watermarks.commit(sources)
+        _deliver_outbox(outbox, session, storage)
         return 0
+
+    if not new_papers:
+        watermarks.commit(sources)
+        return 0
+
+    if config.recipient_profiles:
+        return _send_profile_digests(
+            config, emailer, storage, watermarks, new_papers, sources
+        )
+
+    def mark_sent(papers: list[Paper]) -> None:
+        with current().stage("storage"):
+            for paper in papers:
+                storage.mark_seen(paper)
+
+    # Each part is marked seen as it goes out, so a failure in a later part
+    # does not make the next run send the earlier ones again.
+    try:
+        _ = emailer.send_digest(new_papers, on_sent=mark_sent)
+    except Exception:
+        logger.exception("Failed to send digest")
+        watermarks.discard(sources)
+        return 1
+
+    with current().stage("storage"):
+        watermarks.commit(sources)
+    return 0
+
+
+def run_digest(config: Config, metrics: Metrics | None = None) -> int:
+    if metrics is None:
+        metrics = Metrics() if config.metrics_enabled else NULL_METRICS
+    with collecting(metrics):
+        code = _run_digest(config)
+    metrics.set_gauge("last_run_exit_code", code)
+    if config.metrics_enabled:
+        write_metrics(metrics, config)
+    return code
+
+
+def _run_digest(config: Config) -> int:
+    metrics = current()
+    session = SmtpSession(config)
+    http = open_http_session(config)
+    parser = create_parse_executor(config.parse_workers)
+    try:
+        with metrics.stage("run"), parsing_with(parser):
+            storage = PaperStorage(config.state_file)
+            watermarks = WatermarkStore(config.watermark_file)
+            emailer = Emailer(config, session)
+            stream = PaperStream(
+                build_fetchers(
+                    config, storage, watermarks, http, open_circuit_breakers(config)
+                ),
+                config.fetch_workers,
+            )
+            try:
+                return _fetch_and_deliver(
+                    config, stream, emailer, session, storage, watermarks
+                )
+            finally:
+                stream.close()
     except Exception:
         logger.exception("Fatal error while running digest")
         return 1
+    finally:
+        session.close()
+        parser.close()
+        http.close()
+
+
+def _fetch_and_deliver(
+    config: Config,
+    stream: PaperStream,
+    emailer: Emailer,
+    session: SmtpSession,
+    storage: PaperStorage,
+    watermarks: WatermarkStore,
+) -> int:
+    """Deliver what arrived within ``RUN_DEADLINE``, then a follow-up for the rest.
+
+    Each digest commits only the watermarks of the sources that finished
+    within it. Sources still running at the deadline are committed with the
+    follow-up, so if it never goes out (the process dies, or sending fails)
+    the next run fetches their papers again.
+    """
+    deadline = (
+        time.monotonic() + config.run_deadline if config.run_deadline > 0 else None
+    )
+    papers = _collect(stream.take(deadline), storage)
+    late = stream.pending_sources()
+    # A late source may stage its watermark while the partial digest is
+    # being sent; that watermark belongs to the follow-up.
+    on_time = (
+        [fetcher.SOURCE for fetcher in stream.fetchers if fetcher.SOURCE not in late]
+        if late
+        else None
+    )
+    code = deliver_papers(
+        config, emailer, session, storage, watermarks, papers, on_time
+    )
+    if not late:
+        return code
+
+    metrics = current()
+    for source in late:
+        metrics.increment("sources_late", source=source)
+    logger.warning(
+        "Run deadline of %.0fs passed; %s will follow in a later digest",
+        config.run_deadline,
+        ", ".join(late),
+    )
+    follow_up = _collect(stream.take(), storage)
+    logger.info("Sending follow-up digest with %d paper(s)", len(follow_up))
+    follow_up_code = deliver_papers(
+        config, emailer, session, storage, watermarks, follow_up, late
+    )
+    return max(code, follow_up_code)
+
+
+def write_metrics(metrics: Metrics, config: Config) -> None:
+    try:
+        metrics.write(config.metrics_output_dir)
+    except OSError:
+        logger.exception("Failed to write run metrics")
+
+
+def _digests(
+    config: Config, new_papers: list[Paper]
+) -> list[tuple[str | None, list[Paper]]]:
+    if not new_papers:
+        return []
+    if not config.recipient_profiles:
+        return [(None, new_papers)]
+
+    assignments = assign_papers(new_papers, config.recipient_profiles)
+    return [
+        (profile.email, assignments[profile.name])
+        for profile in config.recipient_profiles
+        if assignments[profile.name]
+    ]
+
+
+def _send_profile_digests(
+    config: Config,
+    emailer: Emailer,
+    storage: PaperStorage,
+    watermarks: WatermarkStore,
+    new_papers: list[Paper],
+    sources: list[str] | None = None,
+) -> int:
+    assignments = assign_papers(new_papers, config.recipient_profiles)
+    with SmtpSessionPool(config, config.delivery_workers) as pool:
+        results = send_profile_digests(
+            emailer,
+            pool,
+            config.recipient_profiles,
+            assignments,
+            config.delivery_workers,
+        )
+
+    with current().stage("storage"):
+        storage.mark_delivered(
+            paper.link for paper in delivered_papers(new_papers, assignments, results)
+        )
+    if not all(delivery.ok for delivery in results.values()):
+        watermarks.discard(sources)
+        return 1
+    watermarks.commit(sources)
+    return 0
+
+
+def _deliver_outbox(
+    outbox: Outbox, session: SmtpSession, storage: PaperStorage
+) -> None:
+    delivered = outbox.deliver(session)
+    with current().stage("storage"):
+        for item in delivered:
+            storage.mark_delivered(item.links)
+    remaining = len(outbox.pending())
+    if remaining:
+        logger.warning("%d digest(s) still waiting in the outbox", remaining)
+
+
+def deliver_outbox(config: Config, requeue_failed: bool = False) -> int:
+    session = SmtpSession(config)
+    try:
+        outbox = Outbox(config.outbox_dir)
+        if requeue_failed:
+            requeued = outbox.requeue_failed()
+            logger.info("Requeued %d failed digest(s)", len(requeued))
+        _deliver_outbox(outbox, session, PaperStorage(config.state_file))
+        return 0
+    except Exception:
+        logger.exception("Fatal error while delivering outbox")
+        return 1
+    finally:
+        session.close()
 
 
-def main() -> int:
+def profile_digest(config: Config, top: int = 20) -> int:
+    # Only one stage at a time can hold the profiler, so fetchers running
+    # side by side would be timed but not profiled; fetch them one by one.
+    with Profiler(top=top) as profiler:
+        code = run_digest(replace(config, fetch_workers=1), profiler)
+    print(profiler.report())
+    try:
+        saved = profiler.save(config.profile_dir)
+    except OSError:
+        logger.exception("Failed to save profiles")
+    else:
+        logger.info("Profiles saved to %s", saved)
+    return code
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Fetch papers and email a digest.")
+    mode = parser.add_mutually_exclusive_group()
+    _ = mode.add_argument(
+        "--deliver",
+        action="store_true",
+        help="only drain the outbox, without fetching",
+    )
+    _ = mode.add_argument(
+        "--requeue-failed",
+        action="store_true",
+        help="move digests the outbox gave up on back into it, then drain it",
+    )
+    _ = mode.add_argument(
+        "--daemon",
+        action="store_true",
+        help="keep running and poll each source on its own interval",
+    )
+    _ = mode.add_argument(
+        "--profile",
+        action="store_true",
+        help="run once under cProfile and tracemalloc and report hot spots",
+    )
+    _ = mode.add_argument(
+        "--backfill",
+        action="store_true",
+        help="harvest older arXiv papers into the backfill archive without emailing",
+    )
+    _ = mode.add_argument(
+        "--import-opml",
+        type=Path,
+        metavar="OPML",
+        help="add the feeds in an OPML export to FEEDS_FILE, then validate them",
+    )
+    _ = mode.add_argument(
+        "--validate-feeds",
+        action="store_true",
+        help="check every feed in FEEDS_FILE and record its metadata",
+    )
+    _ = parser.add_argument(
+        "--since",
+        type=date.fromisoformat,
+        help="first submission date to backfill (YYYY-MM-DD)",
+    )
+    _ = parser.add_argument(
+        "--until",
+        type=date.fromisoformat,
+        default=date.today(),
+        help="last submission date to backfill (default: today)",
+    )
+    _ = parser.add_argument(
+        "--window-days",
+        type=int,
+        default=7,
+        help="days per backfill window (default: 7)",
+    )
+    _ = parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=20,
+        help="functions and allocation sites to show per stage (default: 20)",
+    )
+    archive = parser.add_mutually_exclusive_group()
+    _ = archive.add_argument(
+        "--record",
+        action="store_true",
+        help="archive every HTTP response under STATE_DIR/http_archive",
+    )
+    _ = archive.add_argument(
+        "--replay",
+        type=Path,
+        metavar="ARCHIVE",
+        help="serve HTTP responses from a recorded archive instead of the network",
+    )
+    _ = parser.add_argument(
+        "--replay-fast",
+        action="store_true",
+        help="replay without the recorded response times",
+    )
+    args = parser.parse_args(argv)
+    if args.backfill and args.since is None:
+        parser.error("--backfill requires --since")
+
     logging.basicConfig(level=logging.INFO, format="%(levelname)s:%(name)s:%(message)s")
-    return run_digest(get_config())
+    if args.deliver or args.requeue_failed:
+        return deliver_outbox(get_config(), requeue_failed=args.requeue_failed)
+    config = get_config()
+    if args.record:
+        config.http_record = True
+    if args.replay is not None:
+        config.http_replay = args.replay
+    if args.replay_fast:
+        config.http_replay_realtime = False
+    if args.daemon:
+        from paper_digest.daemon import run_daemon
+
+        return run_daemon(config)
+    if args.profile:
+        return profile_digest(config, args.profile_top)
+    if args.import_opml is not None:
+        if config.feeds_file is None:
+            parser.error("--import-opml requires FEEDS_FILE")
+        return import_opml(config, args.import_opml)
+    if args.validate_feeds:
+        if not config.feeds:
+            parser.error("--validate-feeds requires a FEEDS_FILE with feeds")
+        return run_feed_validation(config, config.feeds)
+    if args.backfill:
+        from paper_digest.backfill import run_backfill
+
+        return run_backfill(config, args.since, args.until, args.window_days)
+    return run_digest(config)
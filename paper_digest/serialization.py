@@ -0,0 +1,120 @@
+# pyright: reportMissingImports=false, reportUnknownVariableType=false, reportUnknownMemberType=false, reportUnknownArgumentType=false, reportMissingTypeStubs=false
+
+import gc
+import json
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager, nullcontext
+from typing import IO, cast
+
+from paper_digest.models import Paper, PaperDict
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - depends on the environment
+    msgpack = None
+
+JSON_BACKENDS = ("orjson", "json")
+
+
+def available_backends() -> list[str]:
+    backends: list[str] = []
+    if orjson is not None:
+        backends.append("orjson")
+    if msgpack is not None:
+        backends.append("msgpack")
+    backends.append("json")
+    return backends
+
+
+def _resolve_backend(backend: str) -> str:
+    if backend == "auto":
+        return "orjson" if orjson is not None else "json"
+    if backend not in ("orjson", "msgpack", "json"):
+        raise ValueError(f"Unknown serialization backend: {backend}")
+    if backend not in available_backends():
+        raise ValueError(f"Serialization backend not installed: {backend}")
+    return backend
+
+
+def _dumps(payload: object, backend: str) -> bytes:
+    if backend == "orjson":
+        return orjson.dumps(payload)
+    if backend == "msgpack":
+        return msgpack.packb(payload, use_bin_type=True)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode(
+        "utf-8"
+    )
+
+
+def _loads(data: bytes, backend: str) -> object:
+    if backend == "orjson":
+        return orjson.loads(data)
+    if backend == "msgpack":
+        return msgpack.unpackb(data, raw=False)
+    return json.loads(data)
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    # Bulk decoding allocates only acyclic containers, but the sheer number of
+    # them keeps triggering full cyclic-GC passes that dominate decode time.
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def encode_papers(papers: Iterable[Paper], backend: str = "auto") -> bytes:
+    resolved = _resolve_backend(backend)
+    return _dumps([paper.to_dict() for paper in papers], resolved)
+
+
+def decode_papers(
+    data: bytes, backend: str = "auto", pause_gc: bool = False
+) -> list[Paper]:
+    """Decode a batch written by ``encode_papers``.
+
+    ``pause_gc`` disables the cyclic GC for the whole process while decoding,
+    so only single-threaded batch tools should set it.
+    """
+    resolved = _resolve_backend(backend)
+    with _gc_paused() if pause_gc else nullcontext():
+        loaded = _loads(data, resolved)
+        if not isinstance(loaded, list):
+            raise ValueError("Encoded paper batch must be a list")
+        return [Paper.from_dict(cast(PaperDict, item)) for item in loaded]
+
+
+def write_jsonl(
+    stream: IO[bytes], papers: Iterable[Paper], backend: str = "auto"
+) -> int:
+    resolved = _resolve_backend(backend)
+    if resolved not in JSON_BACKENDS:
+        raise ValueError(f"JSONL requires a JSON backend, got: {resolved}")
+
+    count = 0
+    for paper in papers:
+        _ = stream.write(_dumps(paper.to_dict(), resolved))
+        _ = stream.write(b"\n")
+        count += 1
+    return count
+
+
+def iter_jsonl(stream: IO[bytes], backend: str = "auto") -> Iterator[Paper]:
+    resolved = _resolve_backend(backend)
+    if resolved not in JSON_BACKENDS:
+        raise ValueError(f"JSONL requires a JSON backend, got: {resolved}")
+
+    for line in stream:
+        stripped = line.strip()
+        if not stripped:
+            continue
+        yield Paper.from_dict(cast(PaperDict, _loads(stripped, resolved)))
@@ -0,0 +1,144 @@
+# pyright: reportMissingImports=false, reportUnknownVariableType=false, reportUnknownMemberType=false, reportUnknownArgumentType=false
+
+import logging
+import queue
+import smtplib
+from collections.abc import Iterator
+from contextlib import ExitStack, contextmanager
+from email.message import Message
+from types import TracebackType
+
+from paper_digest.config import Config
+from paper_digest.metrics import current
+
+logger = logging.getLogger(__name__)
+
+
+def _is_reconnectable(exc: Exception) -> bool:
+    if isinstance(exc, smtplib.SMTPServerDisconnected):
+        return True
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return exc.smtp_code == 421
+    return isinstance(exc, (ConnectionError, TimeoutError))
+
+
+class SmtpSession:
+    def __init__(
+        self, config: Config, max_messages: int = 100, max_retries: int = 1
+    ) -> None:
+        self.config: Config = config
+        self.max_messages: int = max_messages
+        self.max_retries: int = max_retries
+        self.connections_opened: int = 0
+        self._stack: ExitStack | None = None
+        self._smtp: smtplib.SMTP | None = None
+        self._sent_on_connection: int = 0
+
+    def __enter__(self) -> "SmtpSession":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def send(self, message: Message) -> None:
+        metrics = current()
+        with metrics.stage("send"):
+            self._send(message)
+        metrics.increment("emails_sent")
+
+    def _send(self, message: Message) -> None:
+        attempt = 0
+        while True:
+            smtp = self._connection()
+            try:
+                _ = smtp.send_message(message)
+            except Exception as exc:
+                self.close()
+                if attempt >= self.max_retries or not _is_reconnectable(exc):
+                    raise
+                attempt += 1
+                logger.warning("SMTP connection lost, reconnecting: %s", exc)
+                continue
+
+            self._sent_on_connection += 1
+            return
+
+    def close(self) -> None:
+        stack = self._stack
+        self._stack = None
+        self._smtp = None
+        self._sent_on_connection = 0
+        if stack is None:
+            return
+        try:
+            stack.close()
+        except (smtplib.SMTPException, OSError):
+            logger.debug("Ignoring error while closing SMTP connection", exc_info=True)
+
+    def _connection(self) -> smtplib.SMTP:
+        if self._smtp is not None and (
+            not self.max_messages or self._sent_on_connection < self.max_messages
+        ):
+            return self._smtp
+
+        self.close()
+        self._stack = ExitStack()
+        try:
+            # Without a timeout a hung relay blocks forever instead of
+            # raising a TimeoutError that the reconnect path can handle.
+            smtp = self._stack.enter_context(
+                smtplib.SMTP(
+                    self.config.smtp_host,
+                    self.config.smtp_port,
+                    timeout=self.config.smtp_timeout,
+                )
+            )
+            if self.config.smtp_starttls:
+                _ = smtp.starttls()
+            if self.config.smtp_user:
+                _ = smtp.login(self.config.smtp_user, self.config.smtp_password)
+        except BaseException:
+            self.close()
+            raise
+
+        self._smtp = smtp
+        self.connections_opened += 1
+        return smtp
+
+
+class SmtpSessionPool:
+    def __init__(self, config: Config, size: int) -> None:
+        self._sessions: list[SmtpSession] = [
+            SmtpSession(config) for _ in range(max(1, size))
+        ]
+        self._idle: queue.SimpleQueue[SmtpSession] = queue.SimpleQueue()
+        for session in self._sessions:
+            self._idle.put(session)
+
+    def __enter__(self) -> "SmtpSessionPool":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    @contextmanager
+    def session(self) -> Iterator[SmtpSession]:
+        session = self._idle.get()
+        try:
+            yield session
+        finally:
+            self._idle.put(session)
+
+    def close(self) -> None:
+        for session in self._sessions:
+            session.close()
@@ -2,6 +2,7 @@
 
 import json
 import logging
+from collections.abc import Iterable
 from pathlib import Path
 
 from paper_digest.models import Paper
@@ -12,47 +13,67 @@ logger = logging.getLogger(__name__)
 class PaperStorage:
     def __init__(self, state_file: Path):
         self.state_file: Path = state_file
+        self._seen_links: set[str] = set()
+        self._queued_links: set[str] = set()
         self._ensure_state_file()
-        self._seen_links: set[str] = self._load_seen_links()
+        self._load_state()
 
     def _ensure_state_file(self) -> None:
         self.state_file.parent.mkdir(parents=True, exist_ok=True)
         if not self.state_file.exists():
             self._write_state([])
 
-    def _load_seen_links(self) -> set[str]:
+    def _load_state(self) -> None:
         try:
             raw = self.state_file.read_text(encoding="utf-8")
             loaded: object = json.loads(raw)  # pyright: ignore[reportAny]
         except (OSError, json.JSONDecodeError) as exc:
             logger.warning("Failed to load state file, starting fresh: %s", exc)
             self._write_state([])
-            return set()
+            return
 
         if not isinstance(loaded, dict):
             logger.warning(
                 "Failed to load state file, starting fresh: invalid structure"
             )
             self._write_state([])
-            return set()
+            return
+
+        self._seen_links = self._load_links(loaded.get("seen_links", []))
+        self._queued_links = self._load_links(loaded.get("queued_links", []))
 
-        links_obj: object = loaded.get("seen_links", [])
+    def _load_links(self, links_obj: object) -> set[str]:
         if not isinstance(links_obj, list):
             return set()
 
-        seen_links: set[str] = set()
+        links: set[str] = set()
         for link in links_obj:
             if isinstance(link, str):
-                seen_links.add(link)
-        return seen_links
+                links.add(link)
+        return links
 
-    def _write_state(self, seen_links: list[str]) -> None:
-        payload = json.dumps({"seen_links": seen_links}, indent=2)
+    def _write_state(
+        self, seen_links: list[str], queued_links: list[str] | None = None
+    ) -> None:
+        state: dict[str, list[str]] = {"seen_links": seen_links}
+        if queued_links:
+            state["queued_links"] = queued_links
+        payload = json.dumps(state, indent=2)
         _ = self.state_file.write_text(payload, encoding="utf-8")
 
+    def _save(self) -> None:
+        self._write_state(sorted(self._seen_links), sorted(self._queued_links))
+
     def is_seen(self, paper: Paper) -> bool:
         link = str(paper.link)  # pyright: ignore[reportUnknownArgumentType]
-        return link in self._seen_links
+        return link in self._seen_links or link in self._queued_links
+
+    def is_seen_link(self, link: str) -> bool:
+        stripped = link.strip()
+        return stripped in self._seen_links or stripped in self._queued_links
+
+    def is_queued(self, paper: Paper) -> bool:
+        return paper.link in self._queued_links
 
     def mark_seen(self, paper: Paper) -> None:
         link = str(paper.link)  # pyright: ignore[reportUnknownArgumentType]
@@ -60,4 +81,27 @@ class PaperStorage:
             return
 
         self._seen_links.add(link)
-        self._write_state(sorted(self._seen_links))
+        self._queued_links.discard(link)
+        self._save()
+
+    def mark_queued(self, papers: Iterable[Paper]) -> None:
+        added = False
+        for paper in papers:
+            if paper.link in self._seen_links or paper.link in self._queued_links:
+                continue
+            self._queued_links.add(paper.link)
+            added = True
+        if added:
+            self._save()
+
+    def mark_delivered(self, links: Iterable[str]) -> None:
+        changed = False
+        for link in links:
+            if link in self._queued_links:
+                self._queued_links.discard(link)
+                changed = True
+            if link not in self._seen_links:
+                self._seen_links.add(link)
+                changed = True
+        if changed:
+            self._save()
@@ -0,0 +1,137 @@
+# pyright: reportMissingImports=false, reportUnknownVariableType=false, reportUnknownMemberType=false, reportUnknownArgumentType=false
+
+import json
+import logging
+import re
+import threading
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass, fields, replace
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_ARXIV_ID_PATTERN = re.compile(r"(\d{4})\.(\d{4,5})")
+
+
+@dataclass
+class Watermark:
+    published: str = ""
+    arxiv_id: str = ""
+    feed_updated: str = ""
+    etag: str = ""
+    last_modified: str = ""
+
+    def advance_published(self, published: str) -> None:
+        if published > self.published:
+            self.published = published
+
+    def is_before_published(self, published: str) -> bool:
+        return bool(published and self.published and published < self.published)
+
+    def advance_arxiv_id(self, arxiv_id: str) -> None:
+        if arxiv_id_key(arxiv_id) > arxiv_id_key(self.arxiv_id):
+            self.arxiv_id = arxiv_id
+
+    def to_dict(self) -> dict[str, str]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, object]) -> "Watermark":
+        known = {field.name for field in fields(cls)}
+        return cls(
+            **{
+                key: value
+                for key, value in data.items()
+                if key in known and isinstance(value, str)
+            }
+        )
+
+
+def arxiv_id_key(arxiv_id: str) -> tuple[int, int]:
+    match = _ARXIV_ID_PATTERN.search(arxiv_id)
+    if match is None:
+        return (0, 0)
+    return (int(match.group(1)), int(match.group(2)))
+
+
+class WatermarkStore:
+    def __init__(self, state_file: Path):
+        self.state_file: Path = state_file
+        self._committed: dict[str, Watermark] = self._load()
+        self._staged: dict[str, Watermark] = {}
+        # Fetchers past the run deadline stage while a partial digest commits.
+        self._lock: threading.Lock = threading.Lock()
+
+    def _load(self) -> dict[str, Watermark]:
+        if not self.state_file.exists():
+            return {}
+        try:
+            raw = self.state_file.read_text(encoding="utf-8")
+            loaded: object = json.loads(raw)  # pyright: ignore[reportAny]
+        except (OSError, json.JSONDecodeError) as exc:
+            logger.warning("Failed to load watermarks, starting fresh: %s", exc)
+            return {}
+
+        if not isinstance(loaded, dict):
+            logger.warning("Failed to load watermarks, starting fresh: invalid structure")
+            return {}
+
+        watermarks: dict[str, Watermark] = {}
+        for source, data in loaded.items():
+            if isinstance(source, str) and isinstance(data, dict):
+                watermarks[source] = Watermark.from_dict(data)
+        return watermarks
+
+    def get(self, source: str) -> Watermark:
+        with self._lock:
+            return replace(self._committed.get(source, Watermark()))
+
+    def stage(self, source: str, watermark: Watermark) -> None:
+        with self._lock:
+            self._staged[source] = replace(watermark)
+
+    def changed(self, source: str) -> bool:
+        with self._lock:
+            staged = self._staged.get(source)
+            return staged is not None and staged != self._committed.get(
+                source, Watermark()
+            )
+
+    def _take_staged(self, sources: Iterable[str] | None) -> dict[str, Watermark]:
+        if sources is None:
+            staged, self._staged = self._staged, {}
+            return staged
+        return {
+            source: self._staged.pop(source)
+            for source in sources
+            if source in self._staged
+        }
+
+    def discard(self, sources: Iterable[str] | None = None) -> None:
+        """Drop staged watermarks whose papers were not delivered.
+
+        ``sources`` limits this to those sources; by default all are dropped.
+        """
+        with self._lock:
+            _ = self._take_staged(sources)
+
+    def commit(self, sources: Iterable[str] | None = None) -> None:
+        """Persist staged watermarks, only those of ``sources`` if given.
+
+        Watermarks staged for other sources stay staged, so a source whose
+        papers are still on their way is not committed by another digest.
+        """
+        with self._lock:
+            staged = self._take_staged(sources)
+            if not staged:
+                return
+            self._committed.update(staged)
+            payload = json.dumps(
+                {
+                    source: watermark.to_dict()
+                    for source, watermark in sorted(self._committed.items())
+                },
+                indent=2,
+            )
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        _ = self.state_file.write_text(payload, encoding="utf-8")
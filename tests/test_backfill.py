@@ -0,0 +1,145 @@
+# pyright: reportMissingImports=false, reportUnknownVariableType=false, reportUnknownMemberType=false, reportUnknownParameterType=false, reportMissingParameterType=false, reportUnknownArgumentType=false
+
+from datetime import date
+from unittest.mock import Mock, patch
+
+import requests
+
+from paper_digest.backfill import (
+    DateWindow,
+    arxiv_search_query,
+    canonical_arxiv_link,
+    run_backfill,
+    split_windows,
+)
+from paper_digest.config import Config
+from paper_digest.serialization import iter_jsonl
+from paper_digest.storage import PaperStorage
+
+
+def _config(tmp_path) -> Config:
+    return Config(
+        smtp_host="smtp.example.com",
+        smtp_port=587,
+        smtp_user="",
+        smtp_password="",
+        email_from="from@example.com",
+        email_to="to@example.com",
+        arxiv_url="https://arxiv.org/list/cond-mat/new",
+        nature_url="https://www.nature.com/ncomms.rss",
+        user_agent="PaperDigestTests/1.0",
+        keywords=["mram"],
+        state_dir=tmp_path,
+        backfill_workers=2,
+        backfill_request_interval=0.0,
+        fetch_retries=0,
+    )
+
+
+def _atom(*entries: tuple[str, str]) -> str:
+    items = "".join(
+        f"<entry><id>http://arxiv.org/abs/{arxiv_id}v2</id>"
+        f"<title>{title}</title><summary>Abstract.</summary>"
+        "<published>2025-01-03T10:00:00Z</published>"
+        "<author><name>Alice Example</name></author>"
+        f'<link href="http://arxiv.org/abs/{arxiv_id}v2" rel="alternate" '
+        'type="text/html"/></entry>'
+        for arxiv_id, title in entries
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        f'<feed xmlns="http://www.w3.org/2005/Atom"><title>arXiv</title>{items}</feed>'
+    )
+
+
+def _session(pages: dict[str, str]) -> Mock:
+    def get(_url, params, **_kwargs):
+        for window, body in pages.items():
+            if window in params["search_query"]:
+                if body == "error":
+                    raise requests.ConnectionError("down")
+                response = Mock()
+                response.text = body
+                return response
+        raise AssertionError(params)
+
+    session = Mock()
+    session.get.side_effect = get
+    return session
+
+
+def test_split_windows_covers_range_inclusively():
+    windows = split_windows(date(2025, 1, 1), date(2025, 1, 10), 4)
+
+    assert [window.key for window in windows] == [
+        "2025-01-01..2025-01-04",
+        "2025-01-05..2025-01-08",
+        "2025-01-09..2025-01-10",
+    ]
+
+
+def test_arxiv_query_and_links():
+    window = DateWindow(date(2025, 1, 1), date(2025, 1, 7))
+
+    assert arxiv_search_query("cond-mat", window) == (
+        "cat:cond-mat* AND submittedDate:[202501010000 TO 202501072359]"
+    )
+    assert arxiv_search_query("cond-mat.mes-hall", window).startswith(
+        "cat:cond-mat.mes-hall AND"
+    )
+    assert (
+        canonical_arxiv_link("http://arxiv.org/abs/2501.00001v3")
+        == "https://arxiv.org/abs/2501.00001"
+    )
+
+
+def test_backfill_paces_the_arxiv_api_host(tmp_path):
+    config = _config(tmp_path)
+    config.backfill_request_interval = 3.0
+    http = _session({"[202501010000": _atom()})
+
+    with patch(
+        "paper_digest.backfill.open_http_session", return_value=http
+    ) as open_session:
+        assert run_backfill(config, date(2025, 1, 1), date(2025, 1, 1)) == 0
+
+    (session_config,), _ = open_session.call_args
+    assert session_config.host_rate_limits == {"export.arxiv.org": 1 / 3}
+    http.close.assert_called_once_with()
+
+
+def test_backfill_archives_matches_and_resumes_from_checkpoint(tmp_path):
+    config = _config(tmp_path)
+    since, until = date(2025, 1, 1), date(2025, 1, 14)
+    first = _session(
+        {
+            "[202501010000": _atom(
+                ("2501.00001", "MRAM switching"), ("2501.00002", "Other")
+            ),
+            "[202501080000": "error",
+        }
+    )
+
+    with patch("paper_digest.backfill.open_http_session", return_value=first):
+        assert run_backfill(config, since, until, window_days=7) == 1
+
+    (archive,) = config.backfill_dir.glob("*.jsonl")
+    with archive.open("rb") as stream:
+        papers = list(iter_jsonl(stream))
+    assert [paper.link for paper in papers] == ["https://arxiv.org/abs/2501.00001"]
+    assert PaperStorage(config.state_file).is_seen_link(
+        "https://arxiv.org/abs/2501.00001"
+    )
+
+    second = _session({"[202501080000": _atom(("2501.00100", "More MRAM"))})
+    with patch("paper_digest.backfill.open_http_session", return_value=second):
+        assert run_backfill(config, since, until, window_days=7) == 0
+
+    # Only the failed window is harvested again.
+    assert second.get.call_count == 1
+    with archive.open("rb") as stream:
+        papers = list(iter_jsonl(stream))
+    assert [paper.link for paper in papers] == [
+        "https://arxiv.org/abs/2501.00001",
+        "https://arxiv.org/abs/2501.00100",
+    ]
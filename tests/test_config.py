@@ -1,8 +1,9 @@
 import sys
 import importlib
 from pathlib import Path
-from typing import Protocol, cast
+from typing import Any, Protocol, cast
 
+import pytest
 from _pytest.monkeypatch import MonkeyPatch
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -40,6 +41,20 @@ class ConfigProtocol(Protocol):
     nature_journal_rss_url: str
     nature_journal_category_allowlist: list[str]
     rss_max_entries: int
+    outbox_enabled: bool
+    recipient_profiles: list[Any]
+    delivery_workers: int
+    poll_interval: int
+    source_poll_intervals: dict[str, int]
+    feeds: list[Any]
+
+    state_dir: Path
+    state_file: Path
+    watermark_file: Path
+    outbox_dir: Path
+    smtp_starttls: bool
+
+    def poll_interval_for(self, source: str) -> int: ...
 
     @classmethod
     def from_env(cls) -> "ConfigProtocol": ...
@@ -49,6 +64,7 @@ class ConfigModuleProtocol(Protocol):
     Config: type[ConfigProtocol]
     STATE_DIR: Path
     STATE_FILE: Path
+    DATE_FIELDS: tuple[str, ...]
 
     def get_config(self) -> ConfigProtocol: ...
 
@@ -87,6 +103,7 @@ def test_from_env_parses_and_normalizes_keywords(monkeypatch: MonkeyPatch):
         " Research Highlights, Physics, ,  condensed matter  ",
     )
     monkeypatch.setenv("RSS_MAX_ENTRIES", "321")
+    monkeypatch.setenv("OUTBOX_ENABLED", "true")
     monkeypatch.setenv("USER_AGENT", "paper-digest-test")
     monkeypatch.setenv("KEYWORDS", " Spintronics,  MRAM ,spin-orbit torque,,   ")
 
@@ -104,6 +121,7 @@ def test_from_env_parses_and_normalizes_keywords(monkeypatch: MonkeyPatch):
         "condensed matter",
     ]
     assert config.rss_max_entries == 321
+    assert config.outbox_enabled is True
 
 
 def test_from_env_defaults_include_rss_fields(monkeypatch: MonkeyPatch):
@@ -114,6 +132,7 @@ def test_from_env_defaults_include_rss_fields(monkeypatch: MonkeyPatch):
     monkeypatch.delenv("NATURE_JOURNAL_RSS_URL", raising=False)
     monkeypatch.delenv("NATURE_JOURNAL_CATEGORY_ALLOWLIST", raising=False)
     monkeypatch.delenv("RSS_MAX_ENTRIES", raising=False)
+    monkeypatch.delenv("OUTBOX_ENABLED", raising=False)
 
     config = config_module.Config.from_env()
 
@@ -126,6 +145,7 @@ def test_from_env_defaults_include_rss_fields(monkeypatch: MonkeyPatch):
     )
     assert config.nature_journal_category_allowlist == []
     assert config.rss_max_entries == 200
+    assert config.outbox_enabled is False
 
 
 def test_get_config_returns_config_from_env(monkeypatch: MonkeyPatch):
@@ -169,3 +189,120 @@ def test_config_can_be_constructed_without_rss_fields():
     )
     assert config.nature_journal_category_allowlist == []
     assert config.rss_max_entries == 200
+
+
+def test_from_env_loads_recipient_profiles_file(monkeypatch: MonkeyPatch, tmp_path):
+    config_module = load_config_module()
+    recipients_file = tmp_path / "recipients.json"
+    recipients_file.write_text(
+        """[
+          {"name": "alice", "email": "alice@example.com", "keywords": [" MRAM "]},
+          {"email": "bob@example.com", "keywords": ["Magnonics"]}
+        ]""",
+        encoding="utf-8",
+    )
+    monkeypatch.setenv("KEYWORDS", "spintronics")
+    monkeypatch.setenv("RECIPIENTS_FILE", str(recipients_file))
+    monkeypatch.setenv("DELIVERY_WORKERS", "8")
+
+    config = config_module.Config.from_env()
+
+    assert [profile.name for profile in config.recipient_profiles] == [
+        "alice",
+        "bob@example.com",
+    ]
+    assert config.recipient_profiles[0].keywords == ["mram"]
+    assert config.keywords == ["mram", "magnonics"]
+    assert config.delivery_workers == 8
+
+
+def test_from_env_rejects_duplicate_recipient_profile_names(
+    monkeypatch: MonkeyPatch, tmp_path
+):
+    config_module = load_config_module()
+    recipients_file = tmp_path / "recipients.json"
+    recipients_file.write_text(
+        """[
+          {"name": "lab", "email": "alice@example.com", "keywords": ["mram"]},
+          {"name": "lab", "email": "bob@example.com", "keywords": ["magnonics"]}
+        ]""",
+        encoding="utf-8",
+    )
+    monkeypatch.setenv("RECIPIENTS_FILE", str(recipients_file))
+
+    with pytest.raises(ValueError, match="Duplicate recipient profile name"):
+        config_module.Config.from_env()
+
+
+def test_from_env_loads_feeds_file(monkeypatch: MonkeyPatch, tmp_path):
+    config_module = load_config_module()
+    feeds_file = tmp_path / "feeds.json"
+    feeds_file.write_text(
+        """[
+          {"source": " PRB ", "url": "https://feeds.aps.org/rss/recent/prb.xml",
+           "name": "Physical Review B", "section_filter": "Magnetism"},
+          {"source": "science", "url": "https://www.science.org/rss/news.xml",
+           "categories": [" Research "], "date_fields": []}
+        ]""",
+        encoding="utf-8",
+    )
+    monkeypatch.setenv("FEEDS_FILE", str(feeds_file))
+
+    config = config_module.Config.from_env()
+
+    prb, science = config.feeds
+    assert (prb.source, prb.name, prb.section_filter) == (
+        "prb",
+        "Physical Review B",
+        "Magnetism",
+    )
+    assert prb.date_fields == config_module.DATE_FIELDS
+    assert (science.name, science.categories) == ("science", ["research"])
+    assert science.date_fields == ()
+
+    feeds_file.write_text(
+        '[{"source": "arxiv", "url": "https://example.org/rss"}]', encoding="utf-8"
+    )
+    with pytest.raises(ValueError, match="Duplicate feed source"):
+        _ = config_module.Config.from_env()
+
+
+def test_from_env_parses_per_source_poll_intervals(monkeypatch: MonkeyPatch):
+    config_module = load_config_module()
+    monkeypatch.setenv("POLL_INTERVAL", "900")
+    monkeypatch.setenv("SOURCE_POLL_INTERVALS", " arXiv=86400 , aps-prl=1800,")
+
+    config = config_module.Config.from_env()
+
+    assert config.source_poll_intervals == {"arxiv": 86400, "aps-prl": 1800}
+    assert config.poll_interval_for("arxiv") == 86400
+    assert config.poll_interval_for("nature") == 900
+
+
+def test_from_env_relocates_state_files_with_state_dir(
+    monkeypatch: MonkeyPatch, tmp_path
+):
+    config_module = load_config_module()
+    monkeypatch.setenv("STATE_DIR", str(tmp_path))
+    monkeypatch.setenv("SMTP_STARTTLS", "false")
+
+    config = config_module.Config.from_env()
+
+    assert config.state_dir == tmp_path
+    assert config.state_file == tmp_path / "seen_papers.json"
+    assert config.watermark_file == tmp_path / "watermarks.json"
+    assert config.outbox_dir == tmp_path / "outbox"
+    assert config.metrics_output_dir == tmp_path / "metrics"
+    assert config.smtp_starttls is False
+
+
+def test_from_env_parses_per_source_timeouts(monkeypatch: MonkeyPatch):
+    config_module = load_config_module()
+    monkeypatch.setenv("CONNECT_TIMEOUT", "5")
+    monkeypatch.setenv("SOURCE_TIMEOUTS", "arXiv=3:90, nature=15")
+
+    config = config_module.Config.from_env()
+
+    assert config.timeout_for("arxiv") == (3.0, 90.0)
+    assert config.timeout_for("nature") == (15.0, 15.0)
+    assert config.timeout_for("aps-prl") == (5.0, 30.0)
@@ -0,0 +1,147 @@
+# pyright: reportMissingImports=false, reportUnknownVariableType=false, reportUnknownMemberType=false, reportUnknownParameterType=false, reportMissingParameterType=false, reportUnknownArgumentType=false
+
+from unittest.mock import Mock, patch
+
+from paper_digest.config import Config
+
+
+def _config() -> Config:
+    return Config(
+        smtp_host="smtp.example.com",
+        smtp_port=587,
+        smtp_user="user@example.com",
+        smtp_password="secret",
+        email_from="from@example.com",
+        email_to="to@example.com",
+        arxiv_url="https://arxiv.org/list/cond-mat/new",
+        nature_url="https://www.nature.com/ncomms.rss",
+        user_agent="PaperDigestTests/1.0",
+        keywords=["mram"],
+        poll_interval=600,
+        source_poll_intervals={"arxiv": 3600},
+    )
+
+
+def _fetcher(source: str) -> Mock:
+    fetcher = Mock()
+    fetcher.SOURCE = source
+    fetcher.iter_papers.return_value = []
+    return fetcher
+
+
+def _daemon(fetchers, clock, config=None, **kwargs):
+    from paper_digest.daemon import Daemon
+
+    with (
+        patch("paper_digest.daemon.PaperStorage"),
+        patch("paper_digest.daemon.WatermarkStore"),
+        patch("paper_digest.daemon.build_fetchers", return_value=fetchers),
+    ):
+        return Daemon(config or _config(), clock=clock, **kwargs)
+
+
+@patch("paper_digest.daemon.deliver_papers", return_value=0)
+def test_poll_schedules_each_source_on_its_own_interval(mock_deliver):
+    now = [1000.0]
+    arxiv, nature = _fetcher("arxiv"), _fetcher("nature")
+    daemon = _daemon([arxiv, nature], lambda: now[0])
+
+    assert [source.interval for source in daemon.sources] == [3600, 600]
+    assert daemon.due_sources(now[0]) == daemon.sources
+
+    _ = daemon.poll(daemon.due_sources(now[0]))
+    assert daemon.due_sources(now[0]) == []
+    assert daemon.seconds_until_next(now[0]) == 600
+
+    now[0] += 600
+    due = daemon.due_sources(now[0])
+    assert [source.fetcher for source in due] == [nature]
+    _ = daemon.poll(due)
+
+    assert arxiv.iter_papers.call_count == 1
+    assert nature.iter_papers.call_count == 2
+    assert mock_deliver.call_count == 2
+    assert mock_deliver.call_args.args[2] is daemon.session
+
+
+@patch("paper_digest.daemon.deliver_papers", return_value=0)
+def test_run_stops_gracefully_and_closes_connections(mock_deliver):
+    fetcher = _fetcher("arxiv")
+    daemon = _daemon([fetcher], lambda: 0.0)
+    fetcher.iter_papers.side_effect = lambda: daemon.stop() or []
+    daemon.session = Mock()
+    daemon.http = Mock()
+
+    assert daemon.run() == 0
+
+    fetcher.iter_papers.assert_called_once_with()
+    mock_deliver.assert_called_once()
+    daemon.session.close.assert_called_once_with()
+    daemon.http.close.assert_called_once_with()
+
+
+@patch("paper_digest.daemon.deliver_papers", side_effect=RuntimeError("boom"))
+def test_run_survives_failed_poll(mock_deliver):
+    now = [0.0]
+    fetcher = _fetcher("nature")
+    daemon = _daemon([fetcher], lambda: now[0])
+
+    def advance(timeout):
+        assert timeout == 600
+        now[0] += timeout
+        if mock_deliver.call_count >= 2:
+            daemon.stop()
+        return False
+
+    daemon._stopping.wait = advance
+
+    assert daemon.run() == 0
+    assert mock_deliver.call_count == 2
+    assert daemon.watermarks.discard.call_count == 2
+
+
+def test_failed_delivery_discards_staged_watermarks(tmp_path):
+    from paper_digest.daemon import Daemon
+    from paper_digest.watermarks import Watermark
+
+    config = _config()
+    config.state_dir = tmp_path
+    nature, arxiv = _fetcher("nature"), _fetcher("arxiv")
+    nature.iter_papers.side_effect = lambda: daemon.watermarks.stage(
+        "nature", Watermark(published="2024-01-20")
+    ) or []
+    codes = iter([1, 0])
+
+    def deliver(_config, _emailer, _session, _storage, watermarks, _papers):
+        code = next(codes)
+        if code == 0:
+            watermarks.commit()
+        return code
+
+    with patch("paper_digest.daemon.build_fetchers", return_value=[nature, arxiv]):
+        daemon = Daemon(config, clock=lambda: 0.0)
+
+    with patch("paper_digest.daemon.deliver_papers", side_effect=deliver):
+        assert daemon.poll(daemon.sources[:1]) == 1
+        assert daemon.poll(daemon.sources[1:]) == 0
+
+    assert daemon.watermarks.get("nature") == Watermark()
+
+
+@patch("paper_digest.daemon.deliver_papers", return_value=0)
+def test_adaptive_polling_backs_off_unchanged_sources(mock_deliver, tmp_path):
+    config = _config()
+    config.adaptive_polling = True
+    config.min_poll_interval = 60
+    config.max_poll_interval = 2400
+    arxiv, nature = _fetcher("arxiv"), _fetcher("nature")
+    config.state_dir = tmp_path
+    daemon = _daemon([arxiv, nature], lambda: 0.0, config, wall_clock=lambda: 0.0)
+    daemon.watermarks.changed.side_effect = lambda source: source == "nature"
+
+    _ = daemon.poll(daemon.sources)
+
+    assert [source.next_run for source in daemon.sources] == [2400, 600]
+    assert daemon.poller is not None
+    assert daemon.poller.history("arxiv").unchanged_streak == 1
+    assert daemon.poller.history("nature").changes == [0.0]
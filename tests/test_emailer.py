@@ -1,6 +1,9 @@
 # pyright: reportMissingImports=false, reportUnknownVariableType=false, reportUnknownMemberType=false, reportUnknownParameterType=false, reportMissingParameterType=false, reportUnknownArgumentType=false
 
-from unittest.mock import patch
+import smtplib
+from unittest.mock import Mock, patch
+
+import pytest
 
 from paper_digest.config import Config
 from paper_digest.emailer import Emailer
@@ -34,12 +37,12 @@ def _paper() -> Paper:
 
 
 @patch("smtplib.SMTP")
-def test_send_digest_returns_false_and_does_not_send_for_empty_papers(mock_smtp):
+def test_send_digest_sends_nothing_for_empty_papers(mock_smtp):
     emailer = Emailer(_config())
 
     result = emailer.send_digest([])
 
-    assert result is False
+    assert result == []
     mock_smtp.assert_not_called()
 
 
@@ -49,8 +52,8 @@ def test_send_digest_sends_multipart_email_with_expected_content(mock_smtp):
 
     result = emailer.send_digest([_paper()])
 
-    assert result is True
-    mock_smtp.assert_called_once_with("smtp.example.com", 587)
+    assert [part_papers for _, part_papers in result] == [[_paper()]]
+    mock_smtp.assert_called_once_with("smtp.example.com", 587, timeout=60.0)
     smtp_server = mock_smtp.return_value.__enter__.return_value
     smtp_server.starttls.assert_called_once_with()
     smtp_server.login.assert_called_once_with("user@example.com", "secret")
@@ -90,3 +93,105 @@ def test_send_digest_sends_multipart_email_with_expected_content(mock_smtp):
     ]:
         assert value in plain_text
         assert value in html_text
+
+
+def test_send_digest_reuses_provided_session():
+    session = Mock()
+    emailer = Emailer(_config(), session)
+
+    assert len(emailer.send_digest([_paper()])) == 1
+    assert len(emailer.send_digest([_paper()])) == 1
+
+    assert session.send.call_count == 2
+    session.close.assert_not_called()
+
+
+def _numbered_papers(count: int) -> list[Paper]:
+    return [
+        Paper(
+            title=f"Spin-orbit torque in MRAM {index}",
+            authors=["Ada Lovelace"],
+            link=f"https://arxiv.org/abs/2401.{index:05d}",
+            published_date="2024-01-15",
+            source="arxiv",
+            keywords_matched=["mram"],
+        )
+        for index in range(count)
+    ]
+
+
+def test_build_messages_returns_single_message_when_unlimited():
+    papers = _numbered_papers(5)
+
+    messages = Emailer(_config()).build_messages(papers)
+
+    assert len(messages) == 1
+    message, part_papers = messages[0]
+    assert message["Subject"] == "Paper Digest (5): mram"
+    assert part_papers == papers
+
+
+def test_build_messages_splits_into_numbered_parts_by_paper_count():
+    config = _config()
+    config.max_papers_per_message = 2
+    papers = _numbered_papers(5)
+
+    messages = Emailer(config).build_messages(papers, "alice@example.com")
+
+    assert [part_papers for _, part_papers in messages] == [
+        papers[0:2],
+        papers[2:4],
+        papers[4:5],
+    ]
+    assert [message["Subject"] for message, _ in messages] == [
+        "Paper Digest (5) [part 1/3]: mram",
+        "Paper Digest (5) [part 2/3]: mram",
+        "Paper Digest (5) [part 3/3]: mram",
+    ]
+    plain = messages[2][0].get_payload()[0].get_payload(decode=True).decode()
+    assert "MRAM 4" in plain
+    assert "MRAM 0" not in plain
+    assert all(message["To"] == "alice@example.com" for message, _ in messages)
+
+
+def test_build_messages_keeps_each_part_under_the_byte_limit():
+    config = _config()
+    config.max_message_bytes = 8_000
+    papers = _numbered_papers(60)
+
+    messages = Emailer(config).build_messages(papers)
+
+    assert len(messages) > 1
+    assert sum(len(part_papers) for _, part_papers in messages) == 60
+    for message, _ in messages:
+        assert len(message.as_bytes()) <= config.max_message_bytes
+
+
+def test_send_digest_sends_every_part():
+    config = _config()
+    config.max_papers_per_message = 1
+    session = Mock()
+
+    sent: list[list[Paper]] = []
+
+    parts = Emailer(config, session).send_digest(
+        _numbered_papers(3), on_sent=sent.append
+    )
+
+    assert session.send.call_count == 3
+    assert len(parts) == 3
+    assert sent == [part_papers for _, part_papers in parts]
+
+
+def test_send_digest_reports_parts_sent_before_a_later_part_fails():
+    config = _config()
+    config.max_papers_per_message = 1
+    papers = _numbered_papers(3)
+    session = Mock()
+    session.send.side_effect = [None, smtplib.SMTPDataError(554, b"rejected")]
+    sent: list[list[Paper]] = []
+
+    with pytest.raises(smtplib.SMTPDataError):
+        _ = Emailer(config, session).send_digest(papers, on_sent=sent.append)
+
+    assert sent == [papers[0:1]]
@@ -0,0 +1,133 @@
+# pyright: reportMissingImports=false, reportUnknownVariableType=false, reportUnknownMemberType=false, reportUnknownParameterType=false, reportMissingParameterType=false, reportUnknownArgumentType=false
+
+import smtplib
+from unittest.mock import patch
+
+from paper_digest.config import Config, RecipientProfile
+from paper_digest.emailer import Emailer
+from paper_digest.fanout import assign_papers, delivered_papers, send_profile_digests
+from paper_digest.models import Paper
+from paper_digest.smtp_session import SmtpSessionPool
+
+PROFILES = [
+    RecipientProfile(name="alice", email="alice@example.com", keywords=["mram"]),
+    RecipientProfile(
+        name="bob", email="bob@example.com", keywords=["spin-orbit torque", "mram"]
+    ),
+]
+
+
+def _config() -> Config:
+    return Config(
+        smtp_host="smtp.example.com",
+        smtp_port=587,
+        smtp_user="user@example.com",
+        smtp_password="secret",
+        email_from="from@example.com",
+        email_to="to@example.com",
+        arxiv_url="https://arxiv.org/list/cond-mat/new",
+        nature_url="https://www.nature.com/subjects/physical-sciences/ncomms",
+        user_agent="PaperDigestTests/1.0",
+        keywords=["antiferromagnet"],
+        recipient_profiles=PROFILES,
+        delivery_workers=2,
+    )
+
+
+def _paper(link: str, keywords: list[str]) -> Paper:
+    return Paper(
+        title="Spin-orbit torque in MRAM",
+        authors=["Ada Lovelace"],
+        link=link,
+        published_date="2024-01-15",
+        source="arxiv",
+        keywords_matched=keywords,
+    )
+
+
+def test_profiles_replace_keywords_with_union_of_profile_keywords():
+    assert _config().keywords == ["mram", "spin-orbit torque"]
+
+
+def test_assign_papers_narrows_keywords_per_profile():
+    both = _paper("https://arxiv.org/abs/1", ["spin-orbit torque", "mram"])
+    sot_only = _paper("https://arxiv.org/abs/2", ["spin-orbit torque"])
+    nobody = _paper("https://arxiv.org/abs/3", ["antiferromagnet"])
+
+    assignments = assign_papers([both, sot_only, nobody], PROFILES)
+
+    assert [paper.link for paper in assignments["alice"]] == [both.link]
+    assert assignments["alice"][0].keywords_matched == ["mram"]
+    assert assignments["bob"] == [both, sot_only]
+    assert assignments["bob"][0] is both
+
+
+@patch("smtplib.SMTP")
+def test_send_profile_digests_sends_one_message_per_profile(mock_smtp):
+    server = mock_smtp.return_value.__enter__.return_value
+    paper = _paper("https://arxiv.org/abs/1", ["spin-orbit torque", "mram"])
+    config = _config()
+    assignments = assign_papers([paper], PROFILES)
+
+    with SmtpSessionPool(config, 2) as pool:
+        results = send_profile_digests(
+            Emailer(config), pool, PROFILES, assignments, max_workers=2
+        )
+
+    assert {name: delivery.ok for name, delivery in results.items()} == {
+        "alice": True,
+        "bob": True,
+    }
+    recipients = sorted(
+        call.args[0]["To"] for call in server.send_message.call_args_list
+    )
+    assert recipients == ["alice@example.com", "bob@example.com"]
+    assert server.login.call_count <= 2
+
+
+@patch("smtplib.SMTP")
+def test_failed_profile_keeps_its_papers_unseen(mock_smtp):
+    server = mock_smtp.return_value.__enter__.return_value
+
+    def send_message(message):
+        if message["To"] == "alice@example.com":
+            raise smtplib.SMTPRecipientsRefused({})
+        return {}
+
+    server.send_message.side_effect = send_message
+    shared = _paper("https://arxiv.org/abs/1", ["spin-orbit torque", "mram"])
+    bob_only = _paper("https://arxiv.org/abs/2", ["spin-orbit torque"])
+    config = _config()
+    assignments = assign_papers([shared, bob_only], PROFILES)
+
+    with SmtpSessionPool(config, 1) as pool:
+        results = send_profile_digests(
+            Emailer(config), pool, PROFILES, assignments, max_workers=1
+        )
+
+    assert {name: delivery.ok for name, delivery in results.items()} == {
+        "alice": False,
+        "bob": True,
+    }
+    assert delivered_papers([shared, bob_only], assignments, results) == [bob_only]
+
+
+@patch("smtplib.SMTP")
+def test_parts_sent_before_a_failed_part_count_as_delivered(mock_smtp):
+    server = mock_smtp.return_value.__enter__.return_value
+    server.send_message.side_effect = [{}, smtplib.SMTPDataError(554, b"rejected")]
+    first = _paper("https://arxiv.org/abs/1", ["mram"])
+    second = _paper("https://arxiv.org/abs/2", ["mram"])
+    config = _config()
+    config.max_papers_per_message = 1
+    profiles = PROFILES[:1]
+    assignments = assign_papers([first, second], profiles)
+
+    with SmtpSessionPool(config, 1) as pool:
+        results = send_profile_digests(
+            Emailer(config), pool, profiles, assignments, max_workers=1
+        )
+
+    assert results["alice"].ok is False
+    assert [part for _, part in results["alice"].sent] == [[first]]
+    assert delivered_papers([first, second], assignments, results) == [first]
@@ -0,0 +1,149 @@
+# pyright: reportMissingImports=false, reportUnknownVariableType=false, reportUnknownMemberType=false, reportUnknownParameterType=false, reportMissingParameterType=false, reportUnknownArgumentType=false
+
+import json
+from unittest.mock import Mock, patch
+
+import requests
+
+from paper_digest.config import Config, FeedSource, load_feed_sources
+from paper_digest.feedlist import (
+    check_feed,
+    import_opml,
+    load_feed_metadata,
+    with_recorded_parsers,
+)
+
+OPML = """<?xml version="1.0"?>
+<opml version="2.0">
+  <body>
+    <outline text="Physics">
+      <outline type="rss" text="Phys. Rev. B" title="Physical Review B"
+               xmlUrl="https://feeds.aps.org/rss/recent/prb.xml"/>
+      <outline type="rss" text="Science" xmlUrl="https://example.org/science.rss"/>
+      <outline type="rss" text="Science" xmlUrl="https://example.org/science.rss"/>
+      <outline type="rss" text="Science" xmlUrl="https://example.net/science.rss"/>
+    </outline>
+  </body>
+</opml>
+"""
+
+RSS = """<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Feed</title>
+<item><title>One</title><link>https://example.org/1</link></item>
+<item><title>Two</title><link>https://example.org/2</link></item>
+</channel></rss>
+"""
+
+
+def _config(tmp_path) -> Config:
+    return Config(
+        smtp_host="smtp.example.com",
+        smtp_port=587,
+        smtp_user="",
+        smtp_password="",
+        email_from="from@example.com",
+        email_to="to@example.com",
+        arxiv_url="https://arxiv.org/list/cond-mat/new",
+        nature_url="https://www.nature.com/ncomms.rss",
+        user_agent="PaperDigestTests/1.0",
+        keywords=["mram"],
+        state_dir=tmp_path,
+        feeds_file=tmp_path / "feeds.json",
+    )
+
+
+def _response(url: str, status: int = 200, body: str = RSS) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.url = url
+    response._content = body.encode("utf-8")
+    response.encoding = "utf-8"
+    return response
+
+
+def _session(bodies: dict[str, str | Exception]) -> Mock:
+    def get(url, **_kwargs):
+        body = bodies[url]
+        if isinstance(body, Exception):
+            raise body
+        return _response(url, body=body)
+
+    session = Mock()
+    session.get.side_effect = get
+    return session
+
+
+def test_import_opml_merges_feeds_and_records_validation(tmp_path) -> None:
+    config = _config(tmp_path)
+    opml = tmp_path / "reader.opml"
+    _ = opml.write_text(OPML, encoding="utf-8")
+    _ = config.feeds_file.write_text(
+        json.dumps([{"source": "science", "url": "https://example.com/old.rss"}]),
+        encoding="utf-8",
+    )
+    session = _session(
+        {
+            "https://example.com/old.rss": "<html><body>Moved</body></html>",
+            "https://feeds.aps.org/rss/recent/prb.xml": RSS,
+            "https://example.org/science.rss": RSS,
+            "https://example.net/science.rss": requests.ConnectionError("down"),
+        }
+    )
+
+    with patch("paper_digest.feedlist.open_http_session", return_value=session):
+        code = import_opml(config, opml)
+
+    assert code == 1
+    feeds = load_feed_sources(config.feeds_file)
+    assert [(feed.source, feed.name) for feed in feeds] == [
+        ("science", "science"),
+        ("physical-review-b", "Physical Review B"),
+        ("science-2", "Science"),
+        ("science-3", "Science"),
+    ]
+
+    metadata = load_feed_metadata(config.feed_metadata_file)
+    assert metadata["physical-review-b"].ok
+    assert metadata["physical-review-b"].format == "rss20"
+    assert metadata["physical-review-b"].entries == 2
+    assert metadata["physical-review-b"].parser == "inline"
+    assert metadata["science"].error == "not an RSS or Atom feed"
+    assert metadata["science-3"].error == "down"
+    session.close.assert_called_once_with()
+
+
+def test_check_feed_reports_http_errors(tmp_path) -> None:
+    config = _config(tmp_path)
+    feed = FeedSource(source="gone", url="https://example.org/gone.rss", name="Gone")
+    session = Mock()
+    session.get.return_value = _response(feed.url, status=404, body="")
+
+    check = check_feed(config, feed, session, clock=lambda: 1000.0)
+
+    assert (check.ok, check.status, check.checked_at) == (False, 404, 1000.0)
+    assert "404" in check.error
+
+
+def test_recorded_parser_applies_to_unpinned_feeds_with_same_url(tmp_path) -> None:
+    config = _config(tmp_path)
+    _ = config.feed_metadata_file.write_text(
+        json.dumps(
+            {
+                "prb": {"source": "prb", "url": "https://x/prb", "parser": "inline"},
+                "prl": {"source": "prl", "url": "https://x/old", "parser": "inline"},
+                "big": {"source": "big", "url": "https://x/big", "parser": "inline"},
+            }
+        ),
+        encoding="utf-8",
+    )
+    config.feeds = [
+        FeedSource(source="prb", url="https://x/prb", name="PRB"),
+        FeedSource(source="prl", url="https://x/prl", name="PRL"),
+        FeedSource(source="big", url="https://x/big", name="Big", parser="process"),
+    ]
+
+    assert [feed.parser for feed in with_recorded_parsers(config)] == [
+        "inline",
+        "",
+        "process",
+    ]
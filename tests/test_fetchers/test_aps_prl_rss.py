@@ -2,8 +2,10 @@
 
 from unittest.mock import Mock, patch
 
-from paper_digest.config import Config
+from paper_digest.config import AUTHOR_FIELDS, DATE_FIELDS, SECTION_FIELDS, Config
+from paper_digest.fetchers.common import never_seen
 from paper_digest.fetchers.aps_prl_rss import ApsPrlRssFetcher
+from paper_digest.resilience import RetryPolicy
 
 
 def _config() -> Config:
@@ -24,7 +26,7 @@ def _config() -> Config:
     )
 
 
-@patch("paper_digest.fetchers.aps_prl_rss.fetch_feed_entries")
+@patch("paper_digest.fetchers.feed.iter_feed_entries")
 def test_fetch_returns_only_matching_prl_section_entries(mock_fetch: Mock) -> None:
     mock_fetch.return_value = [
         {
@@ -34,7 +36,7 @@ def test_fetch_returns_only_matching_prl_section_entries(mock_fetch: Mock) -> No
             "authors": ["Alice", "Bob"],
             "summary": "MRAM-relevant physics in condensed matter systems.",
             "categories": ["Condensed Matter and Materials"],
-            "raw": {},
+            "extra": {},
         },
         {
             "title": "Optics with keyword spintronics",
@@ -43,7 +45,7 @@ def test_fetch_returns_only_matching_prl_section_entries(mock_fetch: Mock) -> No
             "authors": ["Carol"],
             "summary": "Has keyword but wrong section.",
             "categories": ["Quantum Optics"],
-            "raw": {},
+            "extra": {},
         },
     ]
 
@@ -54,6 +56,13 @@ def test_fetch_returns_only_matching_prl_section_entries(mock_fetch: Mock) -> No
         config.aps_prl_rss_url,
         config.user_agent,
         max_entries=config.rss_max_entries,
+        extra_fields=SECTION_FIELDS + DATE_FIELDS + AUTHOR_FIELDS,
+        is_seen=never_seen,
+        watermark=None,
+        http=None,
+        timeout=(config.connect_timeout, config.read_timeout),
+        retry=RetryPolicy.from_config(config),
+        parser=None,
     )
     assert len(papers) == 1
     assert papers[0].title == "Spin-orbit torque switching"
@@ -63,7 +72,7 @@ def test_fetch_returns_only_matching_prl_section_entries(mock_fetch: Mock) -> No
     assert papers[0].keywords_matched == ["spin-orbit torque", "mram"]
 
 
-@patch("paper_digest.fetchers.aps_prl_rss.fetch_feed_entries")
+@patch("paper_digest.fetchers.feed.iter_feed_entries")
 def test_fetch_uses_raw_field_fallbacks_for_section_date_and_authors(
     mock_fetch: Mock,
 ) -> None:
@@ -75,7 +84,7 @@ def test_fetch_uses_raw_field_fallbacks_for_section_date_and_authors(
             "authors": [],
             "summary": "New approach for MRAM writing.",
             "categories": [],
-            "raw": {
+            "extra": {
                 "prism_section": "condensed matter and materials",
                 "dc_date": "Mon, 22 Jan 2024 12:00:00 GMT",
                 "dc_creator": "Dana and Evan, Frank",
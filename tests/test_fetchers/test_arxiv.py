@@ -4,6 +4,7 @@ from unittest.mock import Mock, patch
 
 from paper_digest.config import Config
 from paper_digest.fetchers.arxiv import ArxivFetcher
+from paper_digest.watermarks import Watermark, WatermarkStore
 
 
 def _config() -> Config:
@@ -78,10 +79,83 @@ def test_fetch_uses_user_agent_and_returns_only_keyword_matches(mock_get: Mock)
     mock_get.assert_called_once_with(
         config.arxiv_url,
         headers={"User-Agent": config.user_agent},
-        timeout=30,
+        timeout=(config.connect_timeout, config.read_timeout),
     )
     assert len(papers) == 1
     assert papers[0].title == "Spin-Orbit Torque in Devices"
     assert papers[0].source == "arxiv"
     assert papers[0].published_date == "2024-01-15"
     assert papers[0].keywords_matched == ["spin-orbit torque", "mram"]
+
+
+def test_parse_html_skips_seen_links_before_matching() -> None:
+    html = """
+    <dl>
+      <dt><a href="/abs/2401.00001">arXiv:2401.00001</a></dt>
+      <dd><div class="list-title">Title: Spintronics one</div></dd>
+      <dt><a href="/abs/2401.00002">arXiv:2401.00002</a></dt>
+      <dd><div class="list-title">Title: Spintronics two</div></dd>
+    </dl>
+    """
+    fetcher = ArxivFetcher(
+        _config(), is_seen=lambda link: link == "https://arxiv.org/abs/2401.00001"
+    )
+
+    with patch.object(
+        fetcher, "_match_keywords", return_value=["spintronics"]
+    ) as mock_match:
+        papers = fetcher._parse_html(html)
+
+    assert [paper.link for paper in papers] == ["https://arxiv.org/abs/2401.00002"]
+    mock_match.assert_called_once()
+
+
+def test_parse_html_keeps_lower_ids_and_only_records_the_highest() -> None:
+    # Cross-lists follow new submissions in /new listings with lower IDs.
+    html = """
+    <dl>
+      <dt><a href="/abs/2401.00003">arXiv:2401.00003</a></dt>
+      <dd><div class="list-title">Title: Spintronics three</div></dd>
+      <dt><a href="/abs/2312.00009">arXiv:2312.00009</a></dt>
+      <dd><div class="list-title">Title: Spintronics cross-list</div></dd>
+      <dt><a href="/abs/2401.00001">arXiv:2401.00001</a></dt>
+      <dd><div class="list-title">Title: Spintronics one</div></dd>
+    </dl>
+    """
+    watermark = Watermark(arxiv_id="2401.00002")
+
+    papers = ArxivFetcher(_config())._parse_html(html, watermark)
+
+    assert [paper.link for paper in papers] == [
+        "https://arxiv.org/abs/2401.00003",
+        "https://arxiv.org/abs/2312.00009",
+        "https://arxiv.org/abs/2401.00001",
+    ]
+    assert watermark.arxiv_id == "2401.00003"
+
+
+def test_iter_papers_stages_watermark_only_once_exhausted(tmp_path) -> None:
+    response = Mock()
+    response.status_code = 200
+    response.headers = {}
+    response.text = """
+    <dl>
+      <dt><a href="/abs/2401.00001">arXiv:2401.00001</a></dt>
+      <dd><div class="list-title">Title: Spintronics one</div></dd>
+      <dt><a href="/abs/2401.00002">arXiv:2401.00002</a></dt>
+      <dd><div class="list-title">Title: Spintronics two</div></dd>
+    </dl>
+    """
+    http = Mock()
+    http.get.return_value = response
+    watermarks = WatermarkStore(tmp_path / "watermarks.json")
+    fetcher = ArxivFetcher(_config(), watermarks=watermarks, http=http)
+
+    papers = fetcher.iter_papers()
+    http.get.assert_not_called()
+
+    assert next(papers).link == "https://arxiv.org/abs/2401.00001"
+    assert not watermarks.changed("arxiv")
+
+    assert [paper.link for paper in papers] == ["https://arxiv.org/abs/2401.00002"]
+    assert watermarks.changed("arxiv")
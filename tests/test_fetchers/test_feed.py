@@ -0,0 +1,121 @@
+# pyright: reportMissingImports=false, reportUnknownVariableType=false, reportUnknownMemberType=false, reportUnknownParameterType=false, reportMissingParameterType=false, reportUnknownArgumentType=false
+
+from dataclasses import replace
+from unittest.mock import Mock, patch
+
+from paper_digest.config import Config, FeedSource
+from paper_digest.emailer import source_names
+from paper_digest.fetchers.common import never_seen
+from paper_digest.fetchers.feed import FeedFetcher
+from paper_digest.parsing import INLINE_PARSER
+from paper_digest.resilience import RetryPolicy
+from paper_digest.runner import build_fetchers
+from paper_digest.storage import PaperStorage
+from paper_digest.watermarks import WatermarkStore
+
+PRB = FeedSource(
+    source="prb",
+    url="https://feeds.aps.org/rss/recent/prb.xml",
+    name="Physical Review B",
+    section_filter="Magnetism",
+)
+
+
+def _config() -> Config:
+    return Config(
+        smtp_host="",
+        smtp_port=587,
+        smtp_user="",
+        smtp_password="",
+        email_from="",
+        email_to="",
+        arxiv_url="https://arxiv.org/list/cond-mat/new",
+        nature_url="https://www.nature.com/ncomms.rss",
+        user_agent="PaperDigestTest/1.0",
+        keywords=["spintronics", "mram"],
+        rss_max_entries=50,
+        source_timeouts={"prb": (3.0, 7.0)},
+    )
+
+
+@patch("paper_digest.fetchers.feed.iter_feed_entries")
+def test_feed_fetcher_is_driven_by_its_feed_source(mock_fetch: Mock) -> None:
+    mock_fetch.return_value = [
+        {
+            "title": "MRAM with spintronics",
+            "link": "https://journals.aps.org/prb/abstract/1",
+            "published": "",
+            "authors": [],
+            "summary": "<p>Spin torque.</p>",
+            "categories": [],
+            "extra": {
+                "prism_section": "Magnetism",
+                "dc_date": "2024-01-22",
+                "dc_creator": "Dana and Evan",
+            },
+        },
+        {
+            "title": "Spintronics in optics",
+            "link": "https://journals.aps.org/prb/abstract/2",
+            "published": "2024-01-23",
+            "authors": ["Carol"],
+            "summary": "",
+            "categories": ["Optics"],
+            "extra": {},
+        },
+    ]
+
+    config = _config()
+    papers = FeedFetcher(config, PRB).fetch()
+
+    mock_fetch.assert_called_once_with(
+        PRB.url,
+        config.user_agent,
+        max_entries=config.rss_max_entries,
+        extra_fields=PRB.extra_fields,
+        is_seen=never_seen,
+        watermark=None,
+        http=None,
+        timeout=(3.0, 7.0),
+        retry=RetryPolicy.from_config(config),
+        parser=None,
+    )
+    assert len(papers) == 1
+    assert papers[0].source == "prb"
+    assert papers[0].authors == ["Dana", "Evan"]
+    assert papers[0].published_date == "2024-01-22"
+    assert papers[0].keywords_matched == ["spintronics", "mram"]
+
+
+def test_configured_feeds_replace_the_built_in_journal_fetchers(tmp_path) -> None:
+    config = _config()
+    config.state_dir = tmp_path
+    storage = PaperStorage(tmp_path / "seen_papers.json")
+    watermarks = WatermarkStore(tmp_path / "watermarks.json")
+
+    assert [f.SOURCE for f in build_fetchers(config, storage, watermarks)] == [
+        "arxiv",
+        "nature",
+        "aps-prl",
+        "nature-journal",
+    ]
+    assert "nature" in source_names(config)
+
+    config.feeds = [PRB]
+    assert [f.SOURCE for f in build_fetchers(config, storage, watermarks)] == [
+        "arxiv",
+        "prb",
+    ]
+    assert list(source_names(config).values()) == [
+        "arXiv (cond-mat/new)",
+        "Physical Review B",
+    ]
+
+
+@patch("paper_digest.fetchers.feed.iter_feed_entries")
+def test_feed_fetcher_parses_inline_when_recorded(mock_fetch: Mock) -> None:
+    mock_fetch.return_value = []
+
+    _ = FeedFetcher(_config(), replace(PRB, parser="inline")).fetch()
+
+    assert mock_fetch.call_args.kwargs["parser"] is INLINE_PARSER
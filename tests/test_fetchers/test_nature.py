@@ -3,7 +3,9 @@
 from unittest.mock import Mock, patch
 
 from paper_digest.config import Config
+from paper_digest.fetchers.common import never_seen
 from paper_digest.fetchers.nature import NatureFetcher
+from paper_digest.resilience import RetryPolicy
 
 
 def _config() -> Config:
@@ -33,19 +35,11 @@ def test_match_keywords_uses_title_and_summary() -> None:
     assert matched == ["spin-orbit torque", "antiferromagnet", "mram"]
 
 
-def test_parse_date_handles_common_inputs() -> None:
-    fetcher = NatureFetcher(_config())
-
-    assert fetcher._parse_date("15 January 2024") == "2024-01-15"
-    assert fetcher._parse_date("2024-01-15T12:00:00Z") == "2024-01-15"
-    assert fetcher._parse_date("2024-01-15") == "2024-01-15"
-
-
-@patch("paper_digest.fetchers.nature.fetch_feed_entries")
+@patch("paper_digest.fetchers.feed.iter_feed_entries")
 def test_fetch_rss_returns_only_keyword_matches(
-    mock_fetch_feed_entries: Mock,
+    mock_iter_feed_entries: Mock,
 ) -> None:
-    mock_fetch_feed_entries.return_value = [
+    mock_iter_feed_entries.return_value = [
         {
             "title": "Spin-orbit torque in antiferromagnetic devices",
             "link": "https://www.nature.com/articles/s41586-024-12345",
@@ -53,7 +47,7 @@ def test_fetch_rss_returns_only_keyword_matches(
             "authors": ["Alice", "Bob"],
             "summary": "<p>A route to MRAM-compatible switching.</p>",
             "categories": ["physics"],
-            "raw": {},
+            "extra": {},
         },
         {
             "title": "Thermal transport in thin films",
@@ -62,7 +56,7 @@ def test_fetch_rss_returns_only_keyword_matches(
             "authors": ["Carol"],
             "summary": "No matching terms here.",
             "categories": ["materials"],
-            "raw": {},
+            "extra": {},
         },
     ]
 
@@ -72,10 +66,17 @@ def test_fetch_rss_returns_only_keyword_matches(
 
     papers = fetcher.fetch()
 
-    mock_fetch_feed_entries.assert_called_once_with(
+    mock_iter_feed_entries.assert_called_once_with(
         config.nature_url,
         config.user_agent,
         max_entries=config.rss_max_entries,
+        extra_fields=(),
+        is_seen=never_seen,
+        watermark=None,
+        http=None,
+        timeout=(config.connect_timeout, config.read_timeout),
+        retry=RetryPolicy.from_config(config),
+        parser=None,
     )
     assert len(papers) == 1
     assert papers[0].title == "Spin-orbit torque in antiferromagnetic devices"
@@ -91,9 +92,9 @@ def test_fetch_rss_returns_only_keyword_matches(
 
 
 @patch("paper_digest.fetchers.nature.requests.get")
-@patch("paper_digest.fetchers.nature.fetch_feed_entries")
+@patch("paper_digest.fetchers.feed.iter_feed_entries")
 def test_fetch_returns_empty_for_non_rss_url(
-    mock_fetch_feed_entries: Mock,
+    mock_iter_feed_entries: Mock,
     mock_get: Mock,
 ) -> None:
     config = _config()
@@ -102,6 +103,6 @@ def test_fetch_returns_empty_for_non_rss_url(
 
     papers = fetcher.fetch()
 
-    mock_fetch_feed_entries.assert_not_called()
+    mock_iter_feed_entries.assert_not_called()
     mock_get.assert_not_called()
     assert papers == []
@@ -2,8 +2,10 @@
 
 from unittest.mock import Mock, patch
 
-from paper_digest.config import Config
+from paper_digest.config import AUTHOR_FIELDS, Config
+from paper_digest.fetchers.common import never_seen
 from paper_digest.fetchers.nature_journal_rss import NatureJournalRssFetcher
+from paper_digest.resilience import RetryPolicy
 
 
 def _config() -> Config:
@@ -24,7 +26,7 @@ def _config() -> Config:
     )
 
 
-@patch("paper_digest.fetchers.nature_journal_rss.fetch_feed_entries")
+@patch("paper_digest.fetchers.feed.iter_feed_entries")
 def test_fetch_matches_keywords_and_builds_nature_journal_paper(
     mock_fetch: Mock,
 ) -> None:
@@ -36,7 +38,7 @@ def test_fetch_matches_keywords_and_builds_nature_journal_paper(
             "authors": ["Alice", "Bob"],
             "summary": "We demonstrate spin-orbit torque switching suitable for MRAM.",
             "categories": ["Research Highlights"],
-            "raw": {},
+            "extra": {},
         }
     ]
 
@@ -47,6 +49,13 @@ def test_fetch_matches_keywords_and_builds_nature_journal_paper(
         config.nature_journal_rss_url,
         config.user_agent,
         max_entries=config.rss_max_entries,
+        extra_fields=AUTHOR_FIELDS,
+        is_seen=never_seen,
+        watermark=None,
+        http=None,
+        timeout=(config.connect_timeout, config.read_timeout),
+        retry=RetryPolicy.from_config(config),
+        parser=None,
     )
     assert len(papers) == 1
     assert papers[0].title == "Materials advances for storage"
@@ -56,7 +65,7 @@ def test_fetch_matches_keywords_and_builds_nature_journal_paper(
     assert papers[0].keywords_matched == ["spin-orbit torque", "mram"]
 
 
-@patch("paper_digest.fetchers.nature_journal_rss.fetch_feed_entries")
+@patch("paper_digest.fetchers.feed.iter_feed_entries")
 def test_fetch_applies_category_allowlist_when_configured(mock_fetch: Mock) -> None:
     mock_fetch.return_value = [
         {
@@ -66,7 +75,7 @@ def test_fetch_applies_category_allowlist_when_configured(mock_fetch: Mock) -> N
             "authors": ["Carol"],
             "summary": "A spintronics overview.",
             "categories": [" News ", "Research"],
-            "raw": {},
+            "extra": {},
         },
         {
             "title": "MRAM device physics",
@@ -75,7 +84,7 @@ def test_fetch_applies_category_allowlist_when_configured(mock_fetch: Mock) -> N
             "authors": ["Dana"],
             "summary": "MRAM optimization details.",
             "categories": ["Comment"],
-            "raw": {},
+            "extra": {},
         },
     ]
 
@@ -88,7 +97,7 @@ def test_fetch_applies_category_allowlist_when_configured(mock_fetch: Mock) -> N
     assert papers[0].title == "Spintronics roundup"
 
 
-@patch("paper_digest.fetchers.nature_journal_rss.fetch_feed_entries")
+@patch("paper_digest.fetchers.feed.iter_feed_entries")
 def test_fetch_drops_entries_missing_title_or_link_even_if_keyword_matches(
     mock_fetch: Mock,
 ) -> None:
@@ -100,7 +109,7 @@ def test_fetch_drops_entries_missing_title_or_link_even_if_keyword_matches(
             "authors": [],
             "summary": "spintronics",
             "categories": ["news"],
-            "raw": {},
+            "extra": {},
         },
         {
             "title": "Valid title",
@@ -109,7 +118,7 @@ def test_fetch_drops_entries_missing_title_or_link_even_if_keyword_matches(
             "authors": [],
             "summary": "spintronics",
             "categories": ["news"],
-            "raw": {},
+            "extra": {},
         },
     ]
 
@@ -1,8 +1,11 @@
 # pyright: reportMissingImports=false, reportUnknownVariableType=false, reportUnknownMemberType=false, reportUnknownParameterType=false, reportMissingParameterType=false, reportUnknownArgumentType=false
 
+import pickle
 from unittest.mock import Mock, patch
 
 from paper_digest.fetchers.rss import fetch_feed_entries
+from paper_digest.metrics import Metrics, collecting
+from paper_digest.watermarks import Watermark
 
 
 def _rss_fixture() -> str:
@@ -97,7 +100,7 @@ def test_fetch_feed_entries_normalizes_and_drops_invalid_entries(
     assert entries[0]["authors"] == ["Alice Example"]
     assert entries[0]["summary"] == "A summary for the first paper."
     assert entries[0]["categories"] == ["Condensed Matter"]
-    assert entries[0]["raw"] is not None
+    assert entries[0]["extra"] == {}
 
 
 @patch("paper_digest.fetchers.rss.requests.get")
@@ -148,3 +151,166 @@ def test_fetch_feed_entries_supports_rdf_content_updated_and_many_authors(
     assert entries[0]["published"] == "2024-02-20"
     assert len(entries[0]["authors"]) > 1
     assert entries[0]["summary"] == "<p>RDF content summary only.</p>"
+
+
+@patch("paper_digest.fetchers.rss.requests.get")
+def test_fetch_feed_entries_extracts_declared_extra_fields_only(
+    mock_get: Mock,
+) -> None:
+    response = Mock()
+    response.text = ""
+    response.raise_for_status = Mock()
+    mock_get.return_value = response
+
+    parsed_feed = Mock()
+    parsed_feed.entries = [
+        {
+            "title": "PRL Paper",
+            "link": "https://journals.aps.org/prl/abstract/10.1103/PhysRevLett.1",
+            "dc_creator": "Dana and Evan",
+            "dc_subject": ["Condensed Matter", "Magnetism"],
+            "prism_section": "",
+            "content": [{"value": "<p>Large HTML body.</p>"}],
+        }
+    ]
+
+    with patch("paper_digest.fetchers.rss.feedparser.parse", return_value=parsed_feed):
+        entries = fetch_feed_entries(
+            "https://example.com/prl.xml",
+            user_agent="PaperDigestTest/1.0",
+            extra_fields=("dc_creator", "dc_subject", "prism_section", "dc_date"),
+        )
+
+    assert entries[0]["extra"] == {
+        "dc_creator": "Dana and Evan",
+        "dc_subject": ["Condensed Matter", "Magnetism"],
+    }
+    assert pickle.loads(pickle.dumps(entries)) == entries
+
+
+@patch("paper_digest.fetchers.rss._extract_extra_fields", return_value={})
+@patch("paper_digest.fetchers.rss.normalize_date")
+@patch("paper_digest.fetchers.rss.requests.get")
+def test_fetch_feed_entries_skips_seen_links_before_extracting_and_normalizing(
+    mock_get: Mock,
+    mock_normalize_date: Mock,
+    mock_extract_extra_fields: Mock,
+) -> None:
+    response = Mock()
+    response.text = _rss_fixture()
+    response.raise_for_status = Mock()
+    mock_get.return_value = response
+    mock_normalize_date.return_value = "2024-01-18"
+
+    entries = fetch_feed_entries(
+        "https://example.com/feed.xml",
+        user_agent="PaperDigestTest/1.0",
+        is_seen=lambda link: link == "https://example.com/p1?id=1",
+    )
+
+    assert [entry["title"] for entry in entries] == ["Second Paper"]
+    mock_normalize_date.assert_called_once_with("Thu, 18 Jan 2024 09:30:00 GMT")
+    assert mock_extract_extra_fields.call_count == 1
+
+
+@patch("paper_digest.fetchers.rss.requests.get")
+def test_fetch_feed_entries_records_bytes_parsed_and_filtered_counts(
+    mock_get: Mock,
+) -> None:
+    response = Mock()
+    response.text = _rss_fixture()
+    response.content = response.text.encode("utf-8")
+    response.raise_for_status = Mock()
+    mock_get.return_value = response
+    metrics = Metrics()
+
+    with collecting(metrics), metrics.stage("fetch", source="test"):
+        _ = fetch_feed_entries(
+            "https://example.com/feed.xml",
+            user_agent="PaperDigestTest/1.0",
+            is_seen=lambda link: link == "https://example.com/p1?id=1",
+        )
+
+    source = (("source", "test"),)
+    assert metrics.counters[("bytes_downloaded", source)] == len(response.content)
+    assert metrics.counters[("entries_parsed", source)] >= 2
+    assert metrics.counters[("entries_filtered", (("reason", "seen"),) + source)] == 1
+    assert ("download", source) in metrics.durations
+    assert ("parse", source) in metrics.durations
+
+
+@patch("paper_digest.fetchers.rss.requests.get")
+def test_fetch_feed_entries_sends_validators_and_returns_empty_on_not_modified(
+    mock_get: Mock,
+) -> None:
+    response = Mock()
+    response.status_code = 304
+    response.raise_for_status = Mock()
+    mock_get.return_value = response
+    watermark = Watermark(etag='"abc"', last_modified="Mon, 15 Jan 2024 00:00:00 GMT")
+
+    entries = fetch_feed_entries(
+        "https://example.com/feed.xml",
+        user_agent="PaperDigestTest/1.0",
+        watermark=watermark,
+    )
+
+    assert entries == []
+    mock_get.assert_called_once_with(
+        "https://example.com/feed.xml",
+        headers={
+            "User-Agent": "PaperDigestTest/1.0",
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Mon, 15 Jan 2024 00:00:00 GMT",
+        },
+        timeout=30,
+    )
+
+
+@patch("paper_digest.fetchers.rss.requests.get")
+def test_fetch_feed_entries_skips_entries_older_than_watermark_and_advances_it(
+    mock_get: Mock,
+) -> None:
+    response = Mock()
+    response.status_code = 200
+    response.headers = {"ETag": '"v2"'}
+    response.text = _rss_fixture()
+    response.raise_for_status = Mock()
+    mock_get.return_value = response
+    watermark = Watermark(published="2024-01-16")
+
+    entries = fetch_feed_entries(
+        "https://example.com/feed.xml",
+        user_agent="PaperDigestTest/1.0",
+        watermark=watermark,
+    )
+
+    assert [entry["title"] for entry in entries] == ["Second Paper"]
+    assert watermark.published == "2024-01-18"
+    assert watermark.etag == '"v2"'
+
+
+@patch("paper_digest.fetchers.rss.requests.get")
+def test_fresh_watermark_keeps_every_entry_of_a_newest_first_feed(
+    mock_get: Mock,
+) -> None:
+    items = "".join(
+        f"<item><title>{title}</title><link>https://example.com/{title}</link>"
+        f"<pubDate>{day} Jan 2024 00:00:00 GMT</pubDate></item>"
+        for title, day in (("A", 20), ("B", 19), ("C", 18))
+    )
+    response = Mock()
+    response.status_code = 200
+    response.headers = {}
+    response.text = f'<rss version="2.0"><channel>{items}</channel></rss>'
+    mock_get.return_value = response
+    watermark = Watermark()
+
+    entries = fetch_feed_entries(
+        "https://example.com/feed.xml",
+        user_agent="PaperDigestTest/1.0",
+        watermark=watermark,
+    )
+
+    assert [entry["title"] for entry in entries] == ["A", "B", "C"]
+    assert watermark.published == "2024-01-20"
@@ -0,0 +1,150 @@
+# pyright: reportMissingImports=false, reportUnknownVariableType=false, reportUnknownMemberType=false, reportUnknownParameterType=false, reportMissingParameterType=false, reportUnknownArgumentType=false
+
+import gzip
+import json
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from paper_digest.config import Config
+from paper_digest.fetchers.rss import fetch_feed_entries
+from paper_digest.http_archive import (
+    RecordingSession,
+    ReplaySession,
+    open_http_session,
+)
+from paper_digest.ratelimit import RateLimitedAdapter
+
+FEED = (
+    '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+    "<title>Feed</title><item><title>Spintronics in MRAM</title>"
+    "<link>https://example.org/papers/1</link>"
+    "<description>Magnon transport</description></item></channel></rss>"
+)
+
+
+def _config(tmp_path, **overrides) -> Config:
+    return Config(
+        smtp_host="smtp.example.com",
+        smtp_port=587,
+        smtp_user="",
+        smtp_password="",
+        email_from="from@example.com",
+        email_to="to@example.com",
+        arxiv_url="https://arxiv.org/list/cond-mat/new",
+        nature_url="https://www.nature.com/ncomms.rss",
+        user_agent="PaperDigestTests/1.0",
+        keywords=["mram"],
+        state_dir=tmp_path,
+        **overrides,
+    )
+
+
+def _network_response(_session, request, **_kwargs):
+    response = requests.Response()
+    response.status_code = 200
+    response.reason = "OK"
+    response.headers = requests.structures.CaseInsensitiveDict(
+        {
+            "Content-Type": "application/rss+xml; charset=utf-8",
+            "Content-Encoding": "gzip",
+            "ETag": '"v1"',
+        }
+    )
+    response._content = FEED.encode("utf-8")
+    response.url = request.url
+    response.request = request
+    return response
+
+
+def _record(path, urls):
+    session = RecordingSession(path)
+    with patch.object(requests.Session, "send", _network_response):
+        for url in urls:
+            _ = session.get(url)
+    session.close()
+
+
+def test_recording_archives_compressed_responses_with_headers(tmp_path):
+    path = tmp_path / "run.jsonl.gz"
+    _record(path, ["https://example.org/feed.xml", "https://example.org/other.xml"])
+
+    with gzip.open(path, "rt", encoding="utf-8") as archive:
+        entries = [json.loads(line) for line in archive]
+
+    assert [entry["url"] for entry in entries] == [
+        "https://example.org/feed.xml",
+        "https://example.org/other.xml",
+    ]
+    assert entries[0]["status"] == 200
+    assert entries[0]["headers"]["ETag"] == '"v1"'
+    assert entries[0]["offset"] == 0
+    assert entries[1]["offset"] >= 0
+
+
+def test_replay_serves_recorded_feed_to_fetchers(tmp_path):
+    path = tmp_path / "run.jsonl.gz"
+    _record(path, ["https://example.org/feed.xml"])
+
+    replay = ReplaySession(path, realtime=False)
+    entries = fetch_feed_entries(
+        "https://example.org/feed.xml", "PaperDigestTests/1.0", http=replay
+    )
+
+    assert [entry["link"] for entry in entries] == ["https://example.org/papers/1"]
+    response = replay.get("https://example.org/feed.xml")
+    assert response.headers["ETag"] == '"v1"'
+    assert "Content-Encoding" not in response.headers
+    assert response.text == FEED
+
+
+def test_replay_rejects_unrecorded_requests(tmp_path):
+    path = tmp_path / "run.jsonl.gz"
+    _record(path, ["https://example.org/feed.xml"])
+
+    with pytest.raises(requests.ConnectionError):
+        _ = ReplaySession(path, realtime=False).get("https://example.org/missing.xml")
+
+
+def test_replay_waits_for_recorded_duration(tmp_path):
+    path = tmp_path / "run.jsonl.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as archive:
+        _ = archive.write(
+            json.dumps(
+                {
+                    "method": "GET",
+                    "url": "https://example.org/feed.xml",
+                    "status": 200,
+                    "headers": {},
+                    "body": "",
+                    "elapsed": 1.5,
+                    "offset": 0.0,
+                }
+            )
+            + "\n"
+        )
+
+    with patch("paper_digest.http_archive.time.sleep") as sleep:
+        response = ReplaySession(path).get("https://example.org/feed.xml")
+
+    sleep.assert_called_once_with(1.5)
+    assert response.elapsed.total_seconds() == 1.5
+
+
+def test_open_http_session_follows_config(tmp_path):
+    plain = open_http_session(_config(tmp_path))
+    assert type(plain) is requests.Session
+    assert isinstance(plain.get_adapter("https://example.org/"), RateLimitedAdapter)
+
+    recording = open_http_session(_config(tmp_path, http_record=True))
+    assert isinstance(recording, RecordingSession)
+    assert recording.archive_path.parent == tmp_path / "http_archive"
+
+    path = tmp_path / "run.jsonl.gz"
+    _record(path, ["https://example.org/feed.xml"])
+    replay = open_http_session(
+        _config(tmp_path, http_replay=path, http_replay_realtime=False)
+    )
+    assert isinstance(replay, ReplaySession)
+    assert not replay.realtime
@@ -15,10 +15,16 @@ def test_imports_work():
     """Smoke test: verify all modules can be imported without network calls."""
     module_names = [
         "paper_digest.config",
+        "paper_digest.fanout",
         "paper_digest.models",
         "paper_digest.storage",
         "paper_digest.emailer",
+        "paper_digest.outbox",
+        "paper_digest.rendering",
         "paper_digest.runner",
+        "paper_digest.serialization",
+        "paper_digest.smtp_session",
+        "paper_digest.watermarks",
         "paper_digest.fetchers.arxiv",
         "paper_digest.fetchers.nature",
         "paper_digest.fetchers.rss",
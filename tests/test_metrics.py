@@ -0,0 +1,70 @@
+# pyright: reportMissingImports=false, reportUnknownVariableType=false, reportUnknownMemberType=false, reportUnknownParameterType=false, reportMissingParameterType=false, reportUnknownArgumentType=false
+
+import json
+
+from paper_digest.metrics import (
+    NULL_METRICS,
+    PROMETHEUS_FILE,
+    SUMMARY_FILE,
+    Metrics,
+    collecting,
+    current,
+)
+
+
+def test_nested_stages_and_counters_inherit_stage_labels():
+    metrics = Metrics()
+
+    with metrics.stage("fetch", source="arxiv"):
+        with metrics.stage("download"):
+            pass
+        metrics.increment("entries_filtered", reason="seen")
+        metrics.increment("entries_filtered", 2, reason="seen")
+    metrics.increment("emails_sent")
+
+    assert set(metrics.durations) == {
+        ("fetch", (("source", "arxiv"),)),
+        ("download", (("source", "arxiv"),)),
+    }
+    assert metrics.counters == {
+        ("entries_filtered", (("reason", "seen"), ("source", "arxiv"))): 3,
+        ("emails_sent", ()): 1,
+    }
+
+
+def test_prometheus_text_and_summary_are_written(tmp_path):
+    metrics = Metrics()
+    with metrics.stage("render"):
+        pass
+    metrics.increment("bytes_downloaded", 512, source='we"ird')
+    metrics.set_gauge("last_run_exit_code", 0)
+
+    metrics.write(tmp_path / "metrics")
+
+    text = (tmp_path / "metrics" / PROMETHEUS_FILE).read_text(encoding="utf-8")
+    assert 'paper_digest_stage_seconds{stage="render"} ' in text
+    assert "# TYPE paper_digest_bytes_downloaded_total counter" in text
+    assert 'paper_digest_bytes_downloaded_total{source="we\\"ird"} 512' in text
+    assert "paper_digest_last_run_exit_code 0" in text
+    summary = json.loads((tmp_path / "metrics" / SUMMARY_FILE).read_text("utf-8"))
+    assert summary["stages"][0]["stage"] == "render"
+    assert summary["counters"] == [
+        {"name": "bytes_downloaded", "labels": {"source": 'we"ird'}, "value": 512}
+    ]
+    assert summary["gauges"] == {"last_run_exit_code": 0}
+
+
+def test_null_metrics_record_nothing_and_collecting_restores(tmp_path):
+    assert current() is NULL_METRICS
+    with NULL_METRICS.stage("fetch", source="arxiv"):
+        NULL_METRICS.increment("emails_sent")
+    NULL_METRICS.write(tmp_path / "metrics")
+
+    assert NULL_METRICS.durations == {}
+    assert NULL_METRICS.counters == {}
+    assert not (tmp_path / "metrics").exists()
+
+    metrics = Metrics()
+    with collecting(metrics):
+        assert current() is metrics
+    assert current() is NULL_METRICS
@@ -1,5 +1,7 @@
 # pyright: reportMissingImports=false, reportUnknownVariableType=false, reportUnknownMemberType=false, reportUnknownArgumentType=false
 
+from dataclasses import fields
+
 from paper_digest.models import Paper
 
 
@@ -51,6 +53,10 @@ def test_paper_hash_uses_normalized_link():
 
     assert hash(paper) == hash("https://arxiv.org/abs/2401.00001")
 
+    paper.link = "https://arxiv.org/abs/2401.00002"
+    assert hash(paper) == hash("https://arxiv.org/abs/2401.00002")
+    assert "_hash" not in {item.name for item in fields(paper)}
+
 
 def test_to_dict_from_dict_round_trip():
     original = Paper(
@@ -67,3 +73,48 @@ def test_to_dict_from_dict_round_trip():
 
     assert restored == original
     assert restored.to_dict() == serialized
+
+
+def test_paper_is_slotted_and_interns_repeated_fields():
+    first = Paper.from_dict(
+        {
+            "title": "A",
+            "authors": [],
+            "link": "https://arxiv.org/abs/2401.00001",
+            "published_date": "".join(["2024-", "01-15"]),
+            "source": "".join(["ar", "xiv"]),
+            "keywords_matched": ["".join(["mr", "am"])],
+        }
+    )
+    second = Paper(
+        title="B",
+        authors=[],
+        link="https://arxiv.org/abs/2401.00002",
+        published_date="2024-01-15",
+        source="arxiv",
+        keywords_matched=["mram"],
+    )
+
+    assert not hasattr(first, "__dict__")
+    assert first.source is second.source
+    assert first.published_date is second.published_date
+    assert first.keywords_matched[0] is second.keywords_matched[0]
+
+
+def test_paper_survives_pickle_round_trip():
+    import pickle
+
+    original = Paper(
+        title="Spintronic Memory",
+        authors=["A"],
+        link="https://www.nature.com/articles/example",
+        published_date="2024-02-01",
+        source="nature",
+        keywords_matched=["mram"],
+    )
+
+    restored = pickle.loads(pickle.dumps(original))
+
+    assert restored == original
+    assert hash(restored) == hash(original)
+    assert restored.to_dict() == original.to_dict()
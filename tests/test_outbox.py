@@ -0,0 +1,96 @@
+# pyright: reportMissingImports=false, reportUnknownVariableType=false, reportUnknownMemberType=false, reportUnknownParameterType=false, reportMissingParameterType=false, reportUnknownArgumentType=false
+
+import smtplib
+from email.message import EmailMessage
+from unittest.mock import Mock
+
+from paper_digest.outbox import Outbox, make_message_id
+
+LINKS = ["https://arxiv.org/abs/2401.00002", "https://arxiv.org/abs/2401.00001"]
+
+
+def _message() -> EmailMessage:
+    message = EmailMessage()
+    message["To"] = "to@example.com"
+    message["Subject"] = "Paper Digest (2)"
+    message.set_content("digest body")
+    return message
+
+
+def test_message_id_is_stable_for_same_recipient_and_papers():
+    assert make_message_id("to@example.com", LINKS) == make_message_id(
+        "to@example.com", list(reversed(LINKS))
+    )
+    assert make_message_id("to@example.com", LINKS) != make_message_id(
+        "other@example.com", LINKS
+    )
+
+
+def test_spool_is_idempotent_and_sets_message_id(tmp_path):
+    outbox = Outbox(tmp_path)
+
+    first = outbox.spool(_message(), LINKS)
+    second = outbox.spool(_message(), LINKS)
+
+    assert first == second
+    pending = outbox.pending()
+    assert len(pending) == 1
+    assert pending[0].links == LINKS
+    assert pending[0].recipients == "to@example.com"
+
+
+def test_deliver_sends_pending_messages_and_moves_them_to_sent(tmp_path):
+    outbox = Outbox(tmp_path)
+    message_id = outbox.spool(_message(), LINKS)
+    session = Mock()
+
+    delivered = outbox.deliver(session)
+
+    assert [item.message_id for item in delivered] == [message_id]
+    sent_message = session.send.call_args.args[0]
+    assert sent_message["Message-ID"] == message_id
+    assert sent_message["Subject"] == "Paper Digest (2)"
+    assert outbox.pending() == []
+    assert outbox.spool(_message(), LINKS) == message_id
+    assert outbox.pending() == []
+
+
+def test_deliver_backs_off_after_failure(tmp_path):
+    outbox = Outbox(tmp_path, base_delay=60.0)
+    _ = outbox.spool(_message(), LINKS)
+    session = Mock()
+    session.send.side_effect = smtplib.SMTPServerDisconnected("down")
+
+    assert outbox.deliver(session, now=1000.0) == []
+    [item] = outbox.pending()
+    assert item.attempts == 1
+    assert item.next_attempt_at == 1060.0
+
+    session.send.reset_mock()
+    assert outbox.deliver(session, now=1030.0) == []
+    session.send.assert_not_called()
+
+    session.send.side_effect = None
+    assert len(outbox.deliver(session, now=1061.0)) == 1
+
+
+def test_deliver_gives_up_after_max_attempts(tmp_path):
+    outbox = Outbox(tmp_path, max_attempts=1)
+    message_id = outbox.spool(_message(), LINKS)
+    session = Mock()
+    session.send.side_effect = smtplib.SMTPDataError(554, b"rejected")
+
+    assert outbox.deliver(session) == []
+
+    stem = message_id.strip("<>").split("@")[0]
+    assert outbox.pending() == []
+    assert (tmp_path / "failed" / f"{stem}.json").exists()
+    assert (tmp_path / "failed" / f"{stem}.eml").exists()
+    assert not (tmp_path / f"{stem}.eml").exists()
+
+    [requeued] = outbox.requeue_failed()
+    assert (requeued.attempts, requeued.links) == (0, LINKS)
+    assert not list((tmp_path / "failed").iterdir())
+
+    session.send.side_effect = None
+    assert [item.message_id for item in outbox.deliver(session)] == [message_id]
@@ -0,0 +1,99 @@
+# pyright: reportMissingImports=false, reportUnknownVariableType=false, reportUnknownMemberType=false, reportUnknownParameterType=false, reportMissingParameterType=false, reportUnknownArgumentType=false
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+
+from paper_digest.fetchers.arxiv import parse_listing
+from paper_digest.fetchers.common import never_seen
+from paper_digest.fetchers.rss import fetch_feed_entries, parse_feed
+from paper_digest.parsing import (
+    INLINE_PARSER,
+    ParseExecutor,
+    ProcessParseExecutor,
+    create_parse_executor,
+    current,
+    parsing_with,
+)
+
+FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>Feed</title>
+<item><title>Spintronics</title><link>https://example.org/p1?utm_source=rss</link>
+<pubDate>Mon, 15 Jan 2024 12:34:56 GMT</pubDate><category>Physics</category></item>
+<item><title>Magnons</title><link>https://example.org/p2</link>
+<author>Alice Example</author><description>Summary.</description></item>
+</channel></rss>
+"""
+
+LISTING = """
+<dl>
+  <dt><a href="/abs/2401.00001">arXiv:2401.00001</a></dt>
+  <dd>
+    <div class="list-title mathjax">Title: Spin-Orbit Torque</div>
+    <div class="list-authors"><a>Alice</a><a>Bob</a></div>
+    <p class="mathjax">Abstract: We study MRAM switching.</p>
+  </dd>
+</dl>
+"""
+
+
+def test_create_parse_executor_picks_inline_or_process_pool():
+    assert type(create_parse_executor(0)) is ParseExecutor
+    executor = create_parse_executor(2)
+    assert isinstance(executor, ProcessParseExecutor)
+    assert executor.workers == 2
+
+
+def test_process_pool_returns_same_entries_as_inline_parsing():
+    with ProcessParseExecutor(2) as executor:
+        assert executor.run(parse_feed, FEED, ("category",)) == parse_feed(
+            FEED, ("category",)
+        )
+        assert executor.run(parse_listing, LISTING) == parse_listing(LISTING)
+
+
+def test_concurrent_first_runs_start_a_single_pool():
+    started = threading.Barrier(4)
+
+    def slow_pool(**_kwargs):
+        time.sleep(0.05)
+        return ThreadPoolExecutor(max_workers=1)
+
+    with patch(
+        "paper_digest.parsing.ProcessPoolExecutor", side_effect=slow_pool
+    ) as pool_class:
+        executor = ProcessParseExecutor(2)
+
+        def parse(_index):
+            _ = started.wait()
+            return executor.run(parse_listing, LISTING)
+
+        with ThreadPoolExecutor(max_workers=4) as threads:
+            results = list(threads.map(parse, range(4)))
+        executor.close()
+
+    assert pool_class.call_count == 1
+    assert results == [parse_listing(LISTING)] * 4
+
+
+def test_fetchers_parse_through_the_current_executor():
+    response = Mock()
+    response.text = FEED
+    response.content = response.text.encode("utf-8")
+    http = Mock()
+    http.get.return_value = response
+
+    executor = Mock(wraps=ParseExecutor())
+    with parsing_with(executor):
+        assert current() is executor
+        entries = fetch_feed_entries(
+            "https://example.org/feed.xml", "PaperDigestTests/1.0", http=http
+        )
+    assert current() is INLINE_PARSER
+
+    executor.run.assert_called_once_with(parse_feed, response.text, (), never_seen)
+    assert [entry["link"] for entry in entries] == [
+        "https://example.org/p1",
+        "https://example.org/p2",
+    ]
@@ -0,0 +1,80 @@
+# pyright: reportMissingImports=false, reportUnknownVariableType=false, reportUnknownMemberType=false, reportUnknownParameterType=false, reportMissingParameterType=false, reportUnknownArgumentType=false
+
+import json
+
+from paper_digest.polling import WEEK_SECONDS, AdaptivePoller
+
+DAY = 24 * 3600
+HOUR = 3600
+
+
+def test_unchanged_polls_back_off_up_to_max_interval(tmp_path):
+    poller = AdaptivePoller(tmp_path / "history.json", max_interval=4 * HOUR)
+
+    assert poller.next_delay("nature", HOUR, 0.0) == HOUR
+    poller.record("nature", False, 0.0)
+    assert poller.next_delay("nature", HOUR, 0.0) == 2 * HOUR
+    poller.record("nature", False, 0.0)
+    poller.record("nature", False, 0.0)
+    assert poller.next_delay("nature", HOUR, 0.0) == 4 * HOUR
+
+    poller.record("nature", True, 0.0)
+    assert poller.next_delay("nature", HOUR, 0.0) == HOUR
+
+
+def test_polling_tightens_around_recurring_release_time(tmp_path):
+    poller = AdaptivePoller(
+        tmp_path / "history.json", min_interval=300, max_interval=6 * HOUR
+    )
+    release = 20 * HOUR
+    for week in range(2):
+        poller.record("arxiv", True, week * WEEK_SECONDS + release)
+
+    next_week = 2 * WEEK_SECONDS
+    assert poller.release_slots("arxiv") == [release, release]
+
+    # Long before the release: sleep until the window opens, no longer.
+    now = next_week + release - 2 * HOUR
+    assert poller.next_delay("arxiv", 6 * HOUR, now) == 2 * HOUR - poller.window
+
+    # Inside the window: poll at the minimum interval until the change is seen.
+    now = next_week + release - 600
+    assert poller.next_delay("arxiv", 6 * HOUR, now) == 300
+    poller.record("arxiv", False, now)
+    assert poller.next_delay("arxiv", 6 * HOUR, now + 300) == 300
+
+    poller.record("arxiv", True, next_week + release + 120)
+    assert poller.next_delay("arxiv", 6 * HOUR, next_week + release + 300) == (
+        6 * HOUR
+    )
+
+
+def test_single_change_is_not_treated_as_a_release_window(tmp_path):
+    poller = AdaptivePoller(tmp_path / "history.json")
+    poller.record("aps-prl", True, 10 * HOUR)
+
+    assert poller.release_slots("aps-prl") == []
+    assert poller.next_delay("aps-prl", HOUR, DAY + 10 * HOUR) == HOUR
+
+
+def test_history_persists_across_instances(tmp_path):
+    state_file = tmp_path / "history.json"
+    poller = AdaptivePoller(state_file)
+    poller.record("arxiv", True, 100.0)
+    poller.record("arxiv", False, 200.0)
+
+    reloaded = AdaptivePoller(state_file).history("arxiv")
+
+    assert reloaded.changes == [100.0]
+    assert reloaded.unchanged_streak == 1
+    assert json.loads(state_file.read_text(encoding="utf-8"))["arxiv"] == {
+        "changes": [100.0],
+        "unchanged_streak": 1,
+    }
+
+
+def test_corrupted_history_starts_fresh(tmp_path):
+    state_file = tmp_path / "history.json"
+    state_file.write_text("{broken", encoding="utf-8")
+
+    assert AdaptivePoller(state_file).history("arxiv").changes == []
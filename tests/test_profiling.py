@@ -0,0 +1,101 @@
+# pyright: reportMissingImports=false, reportUnknownVariableType=false, reportUnknownMemberType=false, reportUnknownParameterType=false, reportMissingParameterType=false, reportUnknownArgumentType=false
+
+import pstats
+import time
+import tracemalloc
+from unittest.mock import patch
+
+from paper_digest.config import Config
+from paper_digest.profiling import Profiler
+
+
+def _allocate_titles() -> list[str]:
+    return [f"Spin-orbit torque {index}" for index in range(5_000)]
+
+
+def test_profiles_each_outermost_stage_with_allocations():
+    with Profiler(top=5) as profiler:
+        assert tracemalloc.is_tracing()
+        with profiler.stage("fetch", source="arxiv"):
+            with profiler.stage("render"):
+                titles = _allocate_titles()
+        with profiler.stage("fetch", source="nature"):
+            pass
+    assert not tracemalloc.is_tracing()
+    assert len(titles) == 5_000
+
+    assert set(profiler.profiles) == {"fetch-arxiv", "fetch-nature"}
+    report = profiler.report()
+    assert "== fetch-arxiv" in report
+    assert "_allocate_titles" in report
+    assert "test_profiling.py" in report.split("== fetch-nature")[0]
+    # Nested stages are still timed for the metrics export.
+    assert ("render", (("source", "arxiv"),)) in profiler.durations
+
+
+def test_save_writes_loadable_profiles_and_report(tmp_path):
+    profiler = Profiler()
+    with profiler.stage("send"):
+        _ = _allocate_titles()
+
+    run_directory = profiler.save(tmp_path)
+
+    stats = pstats.Stats(str(run_directory / "send.prof"))
+    assert any(name == "_allocate_titles" for _, _, name in stats.stats)
+    report = (run_directory / "report.txt").read_text(encoding="utf-8")
+    assert "(none recorded)" in report
+
+
+def _config(tmp_path) -> Config:
+    return Config(
+        smtp_host="smtp.example.com",
+        smtp_port=587,
+        smtp_user="",
+        smtp_password="",
+        email_from="from@example.com",
+        email_to="to@example.com",
+        arxiv_url="https://arxiv.org/list/cond-mat/new",
+        nature_url="https://www.nature.com/ncomms.rss",
+        user_agent="PaperDigestTests/1.0",
+        keywords=["mram"],
+        state_dir=tmp_path,
+        fetch_workers=4,
+    )
+
+
+class _SlowFetcher:
+    def __init__(self, source: str) -> None:
+        self.SOURCE: str = source
+
+    def iter_papers(self):
+        time.sleep(0.05)
+        return iter(())
+
+
+@patch("paper_digest.runner.run_digest", return_value=0)
+def test_main_profile_runs_once_under_profiler(mock_run_digest, tmp_path, capsys):
+    from paper_digest.runner import main
+
+    with patch("paper_digest.runner.get_config", return_value=_config(tmp_path)):
+        assert main(["--profile", "--profile-top", "3"]) == 0
+
+    config, profiler = mock_run_digest.call_args.args
+    assert config.state_dir == tmp_path
+    assert config.fetch_workers == 1
+    assert isinstance(profiler, Profiler)
+    assert profiler.top == 3
+    assert len(list(tmp_path.glob("profiles/*/report.txt"))) == 1
+    _ = capsys.readouterr()
+
+
+def test_profile_digest_profiles_every_fetcher(tmp_path, capsys):
+    from paper_digest.runner import profile_digest
+
+    fetchers = [_SlowFetcher("arxiv"), _SlowFetcher("nature")]
+    with patch("paper_digest.runner.build_fetchers", return_value=fetchers):
+        assert profile_digest(_config(tmp_path)) == 0
+
+    (run_directory,) = (tmp_path / "profiles").iterdir()
+    assert (run_directory / "fetch-arxiv.prof").exists()
+    assert (run_directory / "fetch-nature.prof").exists()
+    _ = capsys.readouterr()
@@ -0,0 +1,161 @@
+# pyright: reportMissingImports=false, reportUnknownVariableType=false, reportUnknownMemberType=false, reportUnknownParameterType=false, reportMissingParameterType=false, reportUnknownArgumentType=false
+
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from paper_digest.ratelimit import (
+    HostBackoffError,
+    HostRateLimiter,
+    TokenBucket,
+    mount_rate_limiter,
+    parse_retry_after,
+)
+
+
+def _limiter(now: list[float], sleeps: list[float], **kwargs) -> HostRateLimiter:
+    def sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    options = {"respect_robots": False, **kwargs}
+    return HostRateLimiter(
+        clock=lambda: now[0], wall_clock=lambda: now[0], sleep=sleep, **options
+    )
+
+
+def _response(status: int, retry_after: str | None = None) -> Mock:
+    response = Mock()
+    response.status_code = status
+    response.headers = {} if retry_after is None else {"Retry-After": retry_after}
+    return response
+
+
+def test_token_bucket_allows_burst_then_queues_callers():
+    bucket = TokenBucket(rate=2.0, burst=2, now=0.0)
+
+    assert [bucket.reserve(0.0) for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+    assert bucket.reserve(10.0) == 0.0
+
+
+def test_parse_retry_after_accepts_seconds_and_http_dates():
+    assert parse_retry_after("120", now=0.0) == 120.0
+    assert parse_retry_after("Thu, 01 Jan 1970 00:01:00 GMT", now=30.0) == 30.0
+    assert parse_retry_after("soon", now=0.0) is None
+
+
+def test_limiter_paces_each_host_independently():
+    now, sleeps = [0.0], []
+    limiter = _limiter(now, sleeps, rate=1.0, host_rates={"export.arxiv.org": 0.5})
+
+    limiter.acquire("https://export.arxiv.org/api/query")
+    limiter.acquire("https://export.arxiv.org/api/query?start=200")
+    limiter.acquire("https://www.nature.com/ncomms.rss")
+    limiter.acquire("https://www.nature.com/nature.rss")
+
+    # Nature's first request does not wait behind arXiv's slower rate.
+    assert sleeps == [2.0, 1.0]
+
+
+def test_crawl_delay_caps_host_rate():
+    now, sleeps = [0.0], []
+    crawl_delay = Mock(return_value=5.0)
+    limiter = _limiter(
+        now, sleeps, rate=1.0, burst=3, respect_robots=True, crawl_delay=crawl_delay
+    )
+
+    limiter.acquire("https://journals.aps.org/rss/recent/prl.xml")
+    limiter.acquire("https://journals.aps.org/rss/recent/prx.xml")
+
+    crawl_delay.assert_called_once_with("https://journals.aps.org", "", None)
+    assert sleeps == [5.0]
+
+
+def test_slow_robots_fetch_only_holds_up_its_own_host():
+    now, sleeps = [0.0], []
+    release = threading.Event()
+
+    def crawl_delay(base_url, _user_agent, _http):
+        if base_url == "https://slow.example.org":
+            _ = release.wait(timeout=5)
+        return None
+
+    limiter = _limiter(
+        now, sleeps, rate=0.0, respect_robots=True, crawl_delay=crawl_delay
+    )
+    slow = threading.Thread(
+        target=limiter.acquire, args=("https://slow.example.org/feed.xml",)
+    )
+    slow.start()
+
+    limiter.acquire("https://arxiv.org/list/cond-mat/new")
+    fast_done_first = not release.is_set()
+    release.set()
+    slow.join()
+
+    assert fast_done_first
+
+
+def test_robots_txt_is_fetched_through_the_mounted_session():
+    now, sleeps = [0.0], []
+    limiter = _limiter(now, sleeps, rate=1.0, respect_robots=True)
+    session = requests.Session()
+    mount_rate_limiter(session, limiter)
+    sent: list[str] = []
+
+    def send(_adapter, request, **_kwargs):
+        sent.append(request.url)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b"User-agent: *\nCrawl-delay: 4\n"
+        response.url = request.url
+        return response
+
+    with patch("requests.adapters.HTTPAdapter.send", send):
+        _ = session.get("https://www.nature.com/ncomms.rss")
+        _ = session.get("https://www.nature.com/ncomms.rss")
+
+    assert sent == [
+        "https://www.nature.com/robots.txt",
+        "https://www.nature.com/ncomms.rss",
+        "https://www.nature.com/ncomms.rss",
+    ]
+    assert sleeps == [4.0]
+
+
+def test_retry_after_blocks_host_until_it_expires():
+    now, sleeps = [0.0], []
+    limiter = _limiter(now, sleeps, rate=0.0, max_wait=60.0)
+    url = "https://www.nature.com/ncomms.rss"
+
+    limiter.observe(url, _response(429, "30"))
+    limiter.acquire(url)
+    assert sleeps == [30.0]
+
+    limiter.observe(url, _response(503, "600"))
+    with pytest.raises(HostBackoffError):
+        limiter.acquire(url)
+    limiter.acquire("https://arxiv.org/list/cond-mat/new")
+    assert sleeps == [30.0]
+
+
+def test_mounted_adapter_waits_and_observes_responses():
+    now, sleeps = [0.0], []
+    limiter = _limiter(now, sleeps, rate=1.0)
+    session = requests.Session()
+    mount_rate_limiter(session, limiter)
+
+    def send(_adapter, request, **_kwargs):
+        response = requests.Response()
+        response.status_code = 429
+        response.headers["Retry-After"] = "10"
+        response.url = request.url
+        return response
+
+    with patch("requests.adapters.HTTPAdapter.send", send):
+        _ = session.get("https://www.nature.com/ncomms.rss")
+        _ = session.get("https://www.nature.com/ncomms.rss")
+
+    assert sleeps == [10.0]
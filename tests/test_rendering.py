@@ -0,0 +1,94 @@
+# pyright: reportMissingImports=false, reportUnknownVariableType=false, reportUnknownMemberType=false, reportUnknownParameterType=false, reportMissingParameterType=false, reportUnknownArgumentType=false
+
+from unittest.mock import patch
+
+from paper_digest.models import Paper
+from paper_digest.rendering import (
+    DigestRenderer,
+    DigestTemplates,
+    compile_template,
+    matched_keywords,
+    source_counts,
+)
+
+
+def _paper(title: str = "Spin-orbit torque in MRAM", source: str = "arxiv") -> Paper:
+    return Paper(
+        title=title,
+        authors=["Ada Lovelace", "Grace Hopper"],
+        link="https://arxiv.org/abs/2401.00001?a=1&b=2",
+        published_date="2024-01-15",
+        source=source,
+        keywords_matched=["spin-orbit torque", "mram"],
+    )
+
+
+def test_compile_template_is_cached_and_renders_placeholders():
+    template = compile_template("Hello {name}, {count} papers")
+
+    assert compile_template("Hello {name}, {count} papers") is template
+    assert template.render({"name": "Ada", "count": 3}) == "Hello Ada, 3 papers"
+
+
+def test_html_templates_escape_values_but_plain_templates_do_not():
+    renderer = DigestRenderer()
+    paper = _paper(title="Skyrmions <10 nm & beyond")
+
+    plain, html = renderer.paper_fragments(paper)
+
+    assert "Title: Skyrmions <10 nm & beyond" in plain
+    assert "<strong>Skyrmions &lt;10 nm &amp; beyond</strong>" in html
+    assert 'href="https://arxiv.org/abs/2401.00001?a=1&amp;b=2"' in html
+
+
+def test_paper_fragments_are_rendered_once_per_paper_and_keywords():
+    renderer = DigestRenderer()
+    paper = _paper()
+
+    template = renderer._compiled["plain_paper"]
+
+    with patch.object(template, "render", wraps=template.render) as mock_render:
+        renderer.render_parts([paper], ["mram"])
+        renderer.render_parts([paper], ["mram"])
+
+    assert mock_render.call_count == 1
+
+
+def test_render_parts_uses_configured_source_names_and_templates():
+    renderer = DigestRenderer(
+        templates=DigestTemplates(plain_paper="* {title}\n"),
+        source_names={"arxiv": "arXiv", "custom": "Custom Journal"},
+    )
+    papers = [_paper(), _paper(source="custom")]
+
+    parts = renderer.render_parts(papers, matched_keywords(papers))
+
+    assert "Sources checked: arXiv, Custom Journal" in parts.plain
+    assert "Custom Journal: 1" in parts.plain
+    assert parts.plain_papers == ["* Spin-orbit torque in MRAM\n"] * 2
+    assert parts.html.startswith("<html><body>")
+
+
+def test_matched_keywords_and_source_counts():
+    papers = [_paper(), _paper(source="nature")]
+
+    assert matched_keywords(papers) == ["spin-orbit torque", "mram"]
+    assert source_counts(papers) == {"arxiv": 1, "nature": 1}
+
+
+def test_digest_parts_split_never_leaves_an_oversized_paper_behind():
+    long_paper = _paper(title="x" * 5_000)
+    short_paper = Paper(
+        title="Short",
+        authors=[],
+        link="https://arxiv.org/abs/2401.00002",
+        published_date="2024-01-15",
+        source="arxiv",
+        keywords_matched=["mram"],
+    )
+    parts = DigestRenderer().render_parts([long_paper, short_paper], ["mram"])
+
+    assert parts.split() == [range(0, 2)]
+    assert parts.split(max_bytes=1_000) == [range(0, 1), range(1, 2)]
+    assert parts.plain_for(range(1, 2)).startswith(parts.plain_header)
+    assert "Short" in parts.html_for(range(1, 2))
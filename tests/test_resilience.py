@@ -0,0 +1,106 @@
+# pyright: reportMissingImports=false, reportUnknownVariableType=false, reportUnknownMemberType=false, reportUnknownParameterType=false, reportMissingParameterType=false, reportUnknownArgumentType=false
+
+from unittest.mock import Mock
+
+import pytest
+import requests
+
+from paper_digest.fetchers.common import GuardedFetcher
+from paper_digest.ratelimit import HostBackoffError
+from paper_digest.resilience import CircuitBreakers, RetryPolicy, get_with_retries
+
+URL = "https://www.nature.com/ncomms.rss"
+
+
+def _response(status: int) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.url = URL
+    return response
+
+
+def test_retry_delay_is_jittered_and_capped():
+    policy = RetryPolicy(retries=5, base_delay=2.0, max_delay=10.0)
+
+    assert policy.delay(0, rng=lambda: 1.0) == 2.0
+    assert policy.delay(2, rng=lambda: 0.5) == 4.0
+    assert policy.delay(4, rng=lambda: 1.0) == 10.0
+
+
+def test_get_with_retries_retries_transient_failures():
+    get = Mock(
+        side_effect=[requests.ConnectTimeout("slow"), _response(503), _response(200)]
+    )
+    sleeps: list[float] = []
+
+    response = get_with_retries(
+        get, URL, RetryPolicy(retries=3), sleep=sleeps.append, timeout=(5, 20)
+    )
+
+    assert response.status_code == 200
+    assert get.call_count == 3
+    get.assert_called_with(URL, timeout=(5, 20))
+    assert len(sleeps) == 2
+
+
+def test_get_with_retries_gives_up_and_raises():
+    get = Mock(return_value=_response(502))
+
+    with pytest.raises(requests.HTTPError):
+        _ = get_with_retries(get, URL, RetryPolicy(retries=2), sleep=lambda _s: None)
+    assert get.call_count == 3
+
+    get = Mock(return_value=_response(404))
+    with pytest.raises(requests.HTTPError):
+        _ = get_with_retries(get, URL, RetryPolicy(retries=2), sleep=lambda _s: None)
+    assert get.call_count == 1
+
+    get = Mock(side_effect=HostBackoffError("paused"))
+    with pytest.raises(HostBackoffError):
+        _ = get_with_retries(get, URL, RetryPolicy(retries=2), sleep=lambda _s: None)
+    assert get.call_count == 1
+
+
+def test_circuit_opens_after_threshold_and_probes_after_cooldown(tmp_path):
+    now = [1000.0]
+    path = tmp_path / "circuit_breakers.json"
+    breakers = CircuitBreakers(path, threshold=2, cooldown=600, clock=lambda: now[0])
+
+    breakers.record_failure("nature")
+    assert breakers.allow("nature")
+    breakers.record_failure("nature")
+    assert not breakers.allow("nature")
+    assert breakers.allow("arxiv")
+
+    # State survives into the next run.
+    reloaded = CircuitBreakers(path, threshold=2, cooldown=600, clock=lambda: now[0])
+    assert not reloaded.allow("nature")
+
+    now[0] += 600
+    assert reloaded.allow("nature")
+    reloaded.record_failure("nature")
+    assert not reloaded.allow("nature")
+
+    now[0] += 600
+    reloaded.record_success("nature")
+    assert reloaded.allow("nature")
+    assert CircuitBreakers(path, threshold=2).allow("nature")
+
+
+def test_guarded_fetcher_skips_open_source_and_records_outcome(tmp_path):
+    breakers = CircuitBreakers(tmp_path / "circuit_breakers.json", threshold=1)
+    fetcher = Mock()
+    fetcher.SOURCE = "nature"
+    fetcher.iter_papers.side_effect = requests.ConnectionError("down")
+    guarded = GuardedFetcher(fetcher, breakers)
+
+    with pytest.raises(requests.ConnectionError):
+        _ = guarded.fetch()
+    assert guarded.fetch() == []
+    assert fetcher.iter_papers.call_count == 1
+
+    fetcher.iter_papers.side_effect = None
+    fetcher.iter_papers.return_value = []
+    breakers.cooldown = 0
+    assert guarded.fetch() == []
+    assert breakers.allow("nature")
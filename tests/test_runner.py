@@ -1,8 +1,14 @@
 # pyright: reportMissingImports=false, reportUnknownVariableType=false, reportUnknownMemberType=false, reportUnknownParameterType=false, reportMissingParameterType=false, reportUnknownArgumentType=false
 
-from unittest.mock import call, patch
+import json
+import smtplib
+import time
+from unittest.mock import ANY, Mock, call, patch
 
-from paper_digest.config import Config
+import pytest
+
+from paper_digest.config import Config, RecipientProfile
+from paper_digest.fanout import ProfileDelivery
 from paper_digest.models import Paper
 
 
@@ -21,6 +27,12 @@ def _config() -> Config:
     )
 
 
+def _send_all(papers, to=None, on_sent=None):
+    if on_sent is not None:
+        on_sent(papers)
+    return [(Mock(), papers)]
+
+
 def _paper(link: str, source: str = "arxiv") -> Paper:
     return Paper(
         title="Spin-orbit torque in MRAM",
@@ -32,6 +44,7 @@ def _paper(link: str, source: str = "arxiv") -> Paper:
     )
 
 
+@patch("paper_digest.runner.WatermarkStore")
 @patch("paper_digest.runner.Emailer")
 @patch("paper_digest.runner.PaperStorage")
 @patch("paper_digest.runner.NatureJournalRssFetcher")
@@ -45,28 +58,35 @@ def test_run_digest_sends_unseen_and_marks_seen_on_success(
     mock_nature_journal_rss_fetcher,
     mock_storage_cls,
     mock_emailer_cls,
+    mock_watermark_store_cls,
 ):
     from paper_digest.runner import run_digest
 
     seen_paper = _paper("https://arxiv.org/abs/2401.00001")
     new_paper = _paper("https://www.nature.com/articles/s41467-024-00001", "nature")
 
-    mock_arxiv_fetcher.return_value.fetch.return_value = [seen_paper]
-    mock_nature_fetcher.return_value.fetch.return_value = [new_paper]
-    mock_aps_prl_rss_fetcher.return_value.fetch.return_value = []
-    mock_nature_journal_rss_fetcher.return_value.fetch.return_value = []
+    mock_arxiv_fetcher.return_value.iter_papers.return_value = [seen_paper]
+    mock_nature_fetcher.return_value.iter_papers.return_value = [new_paper]
+    mock_aps_prl_rss_fetcher.return_value.iter_papers.return_value = []
+    mock_nature_journal_rss_fetcher.return_value.iter_papers.return_value = []
     storage = mock_storage_cls.return_value
     storage.is_seen.side_effect = [True, False]
     emailer = mock_emailer_cls.return_value
-    emailer.send_digest.return_value = True
+    emailer.send_digest.side_effect = _send_all
 
-    code = run_digest(_config())
+    config = _config()
+    code = run_digest(config)
 
     assert code == 0
-    emailer.send_digest.assert_called_once_with([new_paper])
+    mock_arxiv_fetcher.assert_called_once_with(
+        config, storage.is_seen_link, mock_watermark_store_cls.return_value, ANY
+    )
+    mock_watermark_store_cls.return_value.commit.assert_called_once_with(None)
+    emailer.send_digest.assert_called_once_with([new_paper], on_sent=ANY)
     storage.mark_seen.assert_called_once_with(new_paper)
 
 
+@patch("paper_digest.runner.WatermarkStore")
 @patch("paper_digest.runner.Emailer")
 @patch("paper_digest.runner.PaperStorage")
 @patch("paper_digest.runner.NatureJournalRssFetcher")
@@ -80,26 +100,69 @@ def test_run_digest_does_not_mark_seen_when_email_fails(
     mock_nature_journal_rss_fetcher,
     mock_storage_cls,
     mock_emailer_cls,
+    mock_watermark_store_cls,
 ):
     from paper_digest.runner import run_digest
 
     new_paper = _paper("https://arxiv.org/abs/2401.00001")
-    mock_arxiv_fetcher.return_value.fetch.return_value = [new_paper]
-    mock_nature_fetcher.return_value.fetch.return_value = []
-    mock_aps_prl_rss_fetcher.return_value.fetch.return_value = []
-    mock_nature_journal_rss_fetcher.return_value.fetch.return_value = []
+    mock_arxiv_fetcher.return_value.iter_papers.return_value = [new_paper]
+    mock_nature_fetcher.return_value.iter_papers.return_value = []
+    mock_aps_prl_rss_fetcher.return_value.iter_papers.return_value = []
+    mock_nature_journal_rss_fetcher.return_value.iter_papers.return_value = []
     storage = mock_storage_cls.return_value
     storage.is_seen.return_value = False
     emailer = mock_emailer_cls.return_value
-    emailer.send_digest.return_value = False
+    emailer.send_digest.side_effect = smtplib.SMTPDataError(554, b"rejected")
 
     code = run_digest(_config())
 
     assert code == 1
-    emailer.send_digest.assert_called_once_with([new_paper])
+    emailer.send_digest.assert_called_once_with([new_paper], on_sent=ANY)
     storage.mark_seen.assert_not_called()
+    mock_watermark_store_cls.return_value.commit.assert_not_called()
+
+
+@patch("paper_digest.runner.WatermarkStore")
+@patch("paper_digest.runner.Emailer")
+@patch("paper_digest.runner.PaperStorage")
+@patch("paper_digest.runner.NatureJournalRssFetcher")
+@patch("paper_digest.runner.ApsPrlRssFetcher")
+@patch("paper_digest.runner.NatureFetcher")
+@patch("paper_digest.runner.ArxivFetcher")
+def test_run_digest_marks_parts_sent_before_a_later_part_fails(
+    mock_arxiv_fetcher,
+    mock_nature_fetcher,
+    mock_aps_prl_rss_fetcher,
+    mock_nature_journal_rss_fetcher,
+    mock_storage_cls,
+    mock_emailer_cls,
+    mock_watermark_store_cls,
+):
+    from paper_digest.runner import run_digest
 
+    first = _paper("https://arxiv.org/abs/2401.00001")
+    second = _paper("https://arxiv.org/abs/2401.00002")
+    mock_arxiv_fetcher.return_value.iter_papers.return_value = [first, second]
+    mock_nature_fetcher.return_value.iter_papers.return_value = []
+    mock_aps_prl_rss_fetcher.return_value.iter_papers.return_value = []
+    mock_nature_journal_rss_fetcher.return_value.iter_papers.return_value = []
+    storage = mock_storage_cls.return_value
+    storage.is_seen.return_value = False
+
+    def send_first_part_only(papers, on_sent):
+        on_sent(papers[:1])
+        raise smtplib.SMTPDataError(554, b"rejected")
 
+    mock_emailer_cls.return_value.send_digest.side_effect = send_first_part_only
+
+    code = run_digest(_config())
+
+    assert code == 1
+    storage.mark_seen.assert_called_once_with(first)
+    mock_watermark_store_cls.return_value.commit.assert_not_called()
+
+
+@patch("paper_digest.runner.WatermarkStore")
 @patch("paper_digest.runner.Emailer")
 @patch("paper_digest.runner.PaperStorage")
 @patch("paper_digest.runner.NatureJournalRssFetcher")
@@ -113,14 +176,15 @@ def test_run_digest_returns_zero_when_no_new_papers(
     mock_nature_journal_rss_fetcher,
     mock_storage_cls,
     mock_emailer_cls,
+    mock_watermark_store_cls,
 ):
     from paper_digest.runner import run_digest
 
     seen_paper = _paper("https://arxiv.org/abs/2401.00001")
-    mock_arxiv_fetcher.return_value.fetch.return_value = [seen_paper]
-    mock_nature_fetcher.return_value.fetch.return_value = []
-    mock_aps_prl_rss_fetcher.return_value.fetch.return_value = []
-    mock_nature_journal_rss_fetcher.return_value.fetch.return_value = []
+    mock_arxiv_fetcher.return_value.iter_papers.return_value = [seen_paper]
+    mock_nature_fetcher.return_value.iter_papers.return_value = []
+    mock_aps_prl_rss_fetcher.return_value.iter_papers.return_value = []
+    mock_nature_journal_rss_fetcher.return_value.iter_papers.return_value = []
     storage = mock_storage_cls.return_value
     storage.is_seen.return_value = True
 
@@ -131,6 +195,7 @@ def test_run_digest_returns_zero_when_no_new_papers(
     storage.mark_seen.assert_not_called()
 
 
+@patch("paper_digest.runner.WatermarkStore")
 @patch("paper_digest.runner.Emailer")
 @patch("paper_digest.runner.PaperStorage")
 @patch("paper_digest.runner.NatureJournalRssFetcher")
@@ -144,24 +209,85 @@ def test_run_digest_continues_if_one_fetcher_raises(
     mock_nature_journal_rss_fetcher,
     mock_storage_cls,
     mock_emailer_cls,
+    mock_watermark_store_cls,
+    tmp_path,
 ):
     from paper_digest.runner import run_digest
 
     new_paper = _paper("https://www.nature.com/articles/s41467-024-00001", "nature")
-    mock_arxiv_fetcher.return_value.fetch.side_effect = RuntimeError("arxiv boom")
-    mock_nature_fetcher.return_value.fetch.return_value = [new_paper]
-    mock_aps_prl_rss_fetcher.return_value.fetch.return_value = []
-    mock_nature_journal_rss_fetcher.return_value.fetch.return_value = []
+    mock_arxiv_fetcher.return_value.SOURCE = "arxiv"
+    mock_arxiv_fetcher.return_value.iter_papers.side_effect = RuntimeError("arxiv boom")
+    mock_nature_fetcher.return_value.iter_papers.return_value = [new_paper]
+    mock_aps_prl_rss_fetcher.return_value.iter_papers.return_value = []
+    mock_nature_journal_rss_fetcher.return_value.iter_papers.return_value = []
     storage = mock_storage_cls.return_value
     storage.is_seen.return_value = False
     emailer = mock_emailer_cls.return_value
-    emailer.send_digest.return_value = True
+    emailer.send_digest.side_effect = _send_all
 
-    code = run_digest(_config())
+    config = _config()
+    config.state_dir = tmp_path
+    code = run_digest(config)
 
     assert code == 0
-    emailer.send_digest.assert_called_once_with([new_paper])
+    emailer.send_digest.assert_called_once_with([new_paper], on_sent=ANY)
     storage.mark_seen.assert_called_once_with(new_paper)
+    assert json.loads(config.circuit_breaker_file.read_text("utf-8")) == {
+        "arxiv": {"failures": 1, "opened_at": 0.0}
+    }
+
+
+@patch("paper_digest.runner.WatermarkStore")
+@patch("paper_digest.runner.Emailer")
+@patch("paper_digest.runner.PaperStorage")
+@patch("paper_digest.runner.NatureJournalRssFetcher")
+@patch("paper_digest.runner.ApsPrlRssFetcher")
+@patch("paper_digest.runner.NatureFetcher")
+@patch("paper_digest.runner.ArxivFetcher")
+def test_run_digest_writes_metrics_when_enabled(
+    mock_arxiv_fetcher,
+    mock_nature_fetcher,
+    mock_aps_prl_rss_fetcher,
+    mock_nature_journal_rss_fetcher,
+    mock_storage_cls,
+    mock_emailer_cls,
+    mock_watermark_store_cls,
+    tmp_path,
+):
+    from paper_digest.runner import run_digest
+
+    new_paper = _paper("https://www.nature.com/articles/s41467-024-00001", "nature")
+    for fetcher_cls, source in (
+        (mock_arxiv_fetcher, "arxiv"),
+        (mock_nature_fetcher, "nature"),
+        (mock_aps_prl_rss_fetcher, "aps-prl"),
+        (mock_nature_journal_rss_fetcher, "nature-journal"),
+    ):
+        fetcher_cls.return_value.SOURCE = source
+        fetcher_cls.return_value.iter_papers.return_value = []
+    mock_arxiv_fetcher.return_value.iter_papers.side_effect = RuntimeError("arxiv boom")
+    mock_nature_fetcher.return_value.iter_papers.return_value = [new_paper]
+    mock_storage_cls.return_value.is_seen.return_value = False
+    mock_emailer_cls.return_value.send_digest.side_effect = _send_all
+    config = _config()
+    config.metrics_enabled = True
+    config.metrics_dir = tmp_path
+    config.state_dir = tmp_path
+
+    assert run_digest(config) == 0
+
+    summary = json.loads((tmp_path / "run_summary.json").read_text("utf-8"))
+    counters = {
+        (item["name"], item["labels"].get("source", "")): item["value"]
+        for item in summary["counters"]
+    }
+    assert counters[("fetch_failures", "arxiv")] == 1
+    assert counters[("papers_matched", "nature")] == 1
+    assert counters[("papers_new", "")] == 1
+    stages = {item["stage"] for item in summary["stages"]}
+    assert {"run", "fetch", "dedup"} <= stages
+    assert summary["gauges"] == {"last_run_exit_code": 0}
+    assert (tmp_path / "paper_digest.prom").exists()
 
 
 @patch("paper_digest.runner.PaperStorage", side_effect=RuntimeError("fatal"))
@@ -173,6 +299,7 @@ def test_run_digest_returns_one_on_fatal_error(_mock_storage_cls):
     assert code == 1
 
 
+@patch("paper_digest.runner.WatermarkStore")
 @patch("paper_digest.runner.Emailer")
 @patch("paper_digest.runner.PaperStorage")
 @patch("paper_digest.runner.NatureJournalRssFetcher")
@@ -186,6 +313,7 @@ def test_run_digest_includes_rss_fetchers_in_dedupe_and_send_flow(
     mock_nature_journal_rss_fetcher,
     mock_storage_cls,
     mock_emailer_cls,
+    mock_watermark_store_cls,
 ):
     from paper_digest.runner import run_digest
 
@@ -197,19 +325,274 @@ def test_run_digest_includes_rss_fetchers_in_dedupe_and_send_flow(
         "https://www.nature.com/articles/d41586-024-00001-1", "nature-journal"
     )
 
-    mock_arxiv_fetcher.return_value.fetch.return_value = [arxiv_seen]
-    mock_nature_fetcher.return_value.fetch.return_value = []
-    mock_aps_prl_rss_fetcher.return_value.fetch.return_value = [prl_new]
-    mock_nature_journal_rss_fetcher.return_value.fetch.return_value = [nature_rss_new]
+    mock_arxiv_fetcher.return_value.iter_papers.return_value = [arxiv_seen]
+    mock_nature_fetcher.return_value.iter_papers.return_value = []
+    mock_aps_prl_rss_fetcher.return_value.iter_papers.return_value = [prl_new]
+    mock_nature_journal_rss_fetcher.return_value.iter_papers.return_value = [nature_rss_new]
 
     storage = mock_storage_cls.return_value
     storage.is_seen.side_effect = [True, False, False]
 
     emailer = mock_emailer_cls.return_value
-    emailer.send_digest.return_value = True
+    emailer.send_digest.side_effect = _send_all
 
     code = run_digest(_config())
 
     assert code == 0
-    emailer.send_digest.assert_called_once_with([prl_new, nature_rss_new])
+    emailer.send_digest.assert_called_once_with([prl_new, nature_rss_new], on_sent=ANY)
     assert storage.mark_seen.call_args_list == [call(prl_new), call(nature_rss_new)]
+
+
+@patch("paper_digest.runner.Outbox")
+@patch("paper_digest.runner.WatermarkStore")
+@patch("paper_digest.runner.Emailer")
+@patch("paper_digest.runner.PaperStorage")
+@patch("paper_digest.runner.NatureJournalRssFetcher")
+@patch("paper_digest.runner.ApsPrlRssFetcher")
+@patch("paper_digest.runner.NatureFetcher")
+@patch("paper_digest.runner.ArxivFetcher")
+def test_run_digest_spools_to_outbox_and_marks_queued_when_enabled(
+    mock_arxiv_fetcher,
+    mock_nature_fetcher,
+    mock_aps_prl_rss_fetcher,
+    mock_nature_journal_rss_fetcher,
+    mock_storage_cls,
+    mock_emailer_cls,
+    mock_watermark_store_cls,
+    mock_outbox_cls,
+):
+    from paper_digest.runner import run_digest
+
+    new_paper = _paper("https://arxiv.org/abs/2401.00001")
+    mock_arxiv_fetcher.return_value.iter_papers.return_value = [new_paper]
+    mock_nature_fetcher.return_value.iter_papers.return_value = []
+    mock_aps_prl_rss_fetcher.return_value.iter_papers.return_value = []
+    mock_nature_journal_rss_fetcher.return_value.iter_papers.return_value = []
+    storage = mock_storage_cls.return_value
+    storage.is_seen.return_value = False
+    emailer = mock_emailer_cls.return_value
+    message = Mock()
+    emailer.build_messages.return_value = [(message, [new_paper])]
+    outbox = mock_outbox_cls.return_value
+    delivered_item = Mock(links=[new_paper.link])
+    outbox.deliver.return_value = [delivered_item]
+    outbox.pending.return_value = []
+    config = _config()
+    config.outbox_enabled = True
+
+    code = run_digest(config)
+
+    assert code == 0
+    emailer.send_digest.assert_not_called()
+    outbox.spool.assert_called_once_with(message, [new_paper.link])
+    storage.mark_queued.assert_called_once_with([new_paper])
+    storage.mark_delivered.assert_called_once_with([new_paper.link])
+    mock_watermark_store_cls.return_value.commit.assert_called_once_with(None)
+
+
+@patch("paper_digest.runner.send_profile_digests")
+@patch("paper_digest.runner.SmtpSessionPool")
+@patch("paper_digest.runner.WatermarkStore")
+@patch("paper_digest.runner.Emailer")
+@patch("paper_digest.runner.PaperStorage")
+@patch("paper_digest.runner.NatureJournalRssFetcher")
+@patch("paper_digest.runner.ApsPrlRssFetcher")
+@patch("paper_digest.runner.NatureFetcher")
+@patch("paper_digest.runner.ArxivFetcher")
+def test_run_digest_fans_out_to_recipient_profiles_from_one_fetch(
+    mock_arxiv_fetcher,
+    mock_nature_fetcher,
+    mock_aps_prl_rss_fetcher,
+    mock_nature_journal_rss_fetcher,
+    mock_storage_cls,
+    mock_emailer_cls,
+    mock_watermark_store_cls,
+    mock_pool_cls,
+    mock_send_profile_digests,
+):
+    from paper_digest.runner import run_digest
+
+    new_paper = _paper("https://arxiv.org/abs/2401.00001")
+    mock_arxiv_fetcher.return_value.iter_papers.return_value = [new_paper]
+    mock_nature_fetcher.return_value.iter_papers.return_value = []
+    mock_aps_prl_rss_fetcher.return_value.iter_papers.return_value = []
+    mock_nature_journal_rss_fetcher.return_value.iter_papers.return_value = []
+    storage = mock_storage_cls.return_value
+    storage.is_seen.return_value = False
+    mock_send_profile_digests.return_value = {
+        "alice": ProfileDelivery(sent=[(Mock(), [new_paper])], ok=True),
+        "bob": ProfileDelivery(sent=[(Mock(), [new_paper])], ok=True),
+    }
+    config = _config()
+    config.recipient_profiles = [
+        RecipientProfile(name="alice", email="alice@example.com", keywords=["mram"]),
+        RecipientProfile(name="bob", email="bob@example.com", keywords=["mram"]),
+    ]
+
+    code = run_digest(config)
+
+    assert code == 0
+    mock_arxiv_fetcher.return_value.iter_papers.assert_called_once_with()
+    mock_emailer_cls.return_value.send_digest.assert_not_called()
+    assignments = mock_send_profile_digests.call_args.args[3]
+    assert assignments["alice"][0].link == new_paper.link
+    assert assignments["bob"][0].link == new_paper.link
+    assert list(storage.mark_delivered.call_args.args[0]) == [new_paper.link]
+    mock_watermark_store_cls.return_value.commit.assert_called_once_with(None)
+
+
+def test_fetch_new_papers_keeps_fetcher_order_when_fetching_concurrently():
+    from paper_digest.runner import fetch_new_papers
+
+    slow, fast, broken = Mock(), Mock(), Mock()
+    slow.SOURCE, fast.SOURCE, broken.SOURCE = "arxiv", "nature", "aps-prl"
+    slow_paper = _paper("https://arxiv.org/abs/2401.00001", "arxiv")
+    fast_paper = _paper("https://www.nature.com/articles/s41467-024-00001", "nature")
+
+    def slow_fetch():
+        time.sleep(0.05)
+        return [slow_paper]
+
+    slow.iter_papers.side_effect = slow_fetch
+    fast.iter_papers.return_value = [fast_paper]
+    broken.iter_papers.side_effect = RuntimeError("boom")
+    storage = Mock()
+    storage.is_seen.return_value = False
+
+    papers = fetch_new_papers([slow, fast, broken], storage, workers=3)
+
+    assert papers == [slow_paper, fast_paper]
+
+
+def test_stream_papers_hands_over_papers_before_fetchers_finish():
+    import threading
+
+    from paper_digest.runner import stream_papers
+
+    first = _paper("https://arxiv.org/abs/2401.00001")
+    second = _paper("https://arxiv.org/abs/2401.00002")
+    consumed = threading.Event()
+
+    def iter_papers():
+        yield first
+        assert consumed.wait(timeout=5)
+        yield second
+
+    fetcher = Mock()
+    fetcher.SOURCE = "arxiv"
+    fetcher.iter_papers.side_effect = iter_papers
+
+    stream = stream_papers([fetcher])
+    assert next(stream) == (0, first)
+    consumed.set()
+    assert list(stream) == [(0, second)]
+
+
+def test_stream_papers_stops_producers_when_closed_early():
+    from paper_digest.runner import STREAM_BUFFER, stream_papers
+
+    papers = (
+        _paper(f"https://www.nature.com/articles/{index}", "nature")
+        for index in range(STREAM_BUFFER * 10)
+    )
+    endless = Mock()
+    endless.SOURCE = "nature"
+    endless.iter_papers.return_value = papers
+
+    stream = stream_papers([endless])
+    _ = next(stream)
+    stream.close()
+
+    # The producer stopped at the full buffer instead of draining the fetcher.
+    assert next(papers, None) is not None
+
+
+@pytest.mark.parametrize(
+    ("partial_fails", "follow_up_fails", "committed", "expected_code"),
+    [
+        (False, False, {"arxiv", "nature"}, 0),
+        (False, True, {"arxiv"}, 1),
+        (True, False, {"nature"}, 1),
+    ],
+)
+@patch("paper_digest.runner.Emailer")
+@patch("paper_digest.runner.PaperStorage")
+@patch("paper_digest.runner.NatureJournalRssFetcher")
+@patch("paper_digest.runner.ApsPrlRssFetcher")
+@patch("paper_digest.runner.NatureFetcher")
+@patch("paper_digest.runner.ArxivFetcher")
+def test_run_deadline_commits_each_digest_with_its_own_sources(
+    mock_arxiv_fetcher,
+    mock_nature_fetcher,
+    mock_aps_prl_rss_fetcher,
+    mock_nature_journal_rss_fetcher,
+    mock_storage_cls,
+    mock_emailer_cls,
+    partial_fails,
+    follow_up_fails,
+    committed,
+    expected_code,
+    tmp_path,
+):
+    import threading
+
+    from paper_digest.runner import run_digest
+    from paper_digest.watermarks import Watermark
+
+    fast_paper = _paper("https://arxiv.org/abs/2401.00001")
+    slow_paper = _paper("https://www.nature.com/articles/s41467-024-00001", "nature")
+    partial_sent = threading.Event()
+
+    def papers_then_watermark(fetcher_cls, papers, wait=False):
+        # Like the real fetchers, stage the watermark once the last paper
+        # has been handed over.
+        def iter_papers():
+            if wait:
+                assert partial_sent.wait(timeout=5)
+            yield from papers
+            store = fetcher_cls.call_args.args[2]
+            store.stage(fetcher_cls.return_value.SOURCE, Watermark(published="x"))
+
+        return iter_papers
+
+    for fetcher_cls, source in (
+        (mock_arxiv_fetcher, "arxiv"),
+        (mock_nature_fetcher, "nature"),
+        (mock_aps_prl_rss_fetcher, "aps-prl"),
+        (mock_nature_journal_rss_fetcher, "nature-journal"),
+    ):
+        fetcher_cls.return_value.SOURCE = source
+        fetcher_cls.return_value.iter_papers.return_value = []
+    mock_arxiv_fetcher.return_value.iter_papers.side_effect = papers_then_watermark(
+        mock_arxiv_fetcher, [fast_paper]
+    )
+    mock_nature_fetcher.return_value.iter_papers.side_effect = papers_then_watermark(
+        mock_nature_fetcher, [slow_paper], wait=True
+    )
+    mock_storage_cls.return_value.is_seen.return_value = False
+
+    def send_digest(papers, on_sent):
+        if papers == [fast_paper]:
+            partial_sent.set()
+            # Give the late source time to stage its watermark mid-send.
+            time.sleep(0.2)
+            if partial_fails:
+                raise smtplib.SMTPDataError(554, b"rejected")
+        elif follow_up_fails:
+            raise smtplib.SMTPDataError(554, b"rejected")
+        return _send_all(papers, on_sent=on_sent)
+
+    emailer = mock_emailer_cls.return_value
+    emailer.send_digest.side_effect = send_digest
+    config = _config()
+    config.state_dir = tmp_path
+    config.run_deadline = 0.2
+
+    assert run_digest(config) == expected_code
+
+    assert emailer.send_digest.call_args_list == [
+        call([fast_paper], on_sent=ANY),
+        call([slow_paper], on_sent=ANY),
+    ]
+    saved = json.loads(config.watermark_file.read_text())
+    assert set(saved) == committed
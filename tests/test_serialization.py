@@ -0,0 +1,91 @@
+# pyright: reportMissingImports=false, reportUnknownVariableType=false, reportUnknownMemberType=false, reportUnknownParameterType=false, reportMissingParameterType=false, reportUnknownArgumentType=false
+
+import gc
+import io
+import json
+from unittest.mock import patch
+
+import pytest
+
+from paper_digest.models import Paper
+from paper_digest.serialization import (
+    available_backends,
+    decode_papers,
+    encode_papers,
+    iter_jsonl,
+    write_jsonl,
+)
+
+
+def _papers() -> list[Paper]:
+    return [
+        Paper(
+            title="Spin-orbit torque in MRAM",
+            authors=["Ada Lovelace", "Grace Hopper"],
+            link="https://arxiv.org/abs/2401.00001",
+            published_date="2024-01-15",
+            source="arxiv",
+            keywords_matched=["spin-orbit torque", "mram"],
+        ),
+        Paper(
+            title="Magnonique à température ambiante",
+            authors=[],
+            link="https://www.nature.com/articles/s41467-024-00001",
+            published_date="2024-01-16",
+            source="nature",
+            keywords_matched=["spintronics"],
+        ),
+    ]
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_encode_decode_round_trip_for_every_installed_backend(backend):
+    papers = _papers()
+
+    restored = decode_papers(encode_papers(papers, backend=backend), backend=backend)
+
+    assert [paper.to_dict() for paper in restored] == [
+        paper.to_dict() for paper in papers
+    ]
+
+
+def test_decode_leaves_gc_enabled_unless_asked_to_pause():
+    encoded = encode_papers(_papers(), backend="json")
+    seen: list[bool] = []
+
+    with patch(
+        "paper_digest.serialization.Paper.from_dict",
+        side_effect=lambda item: seen.append(gc.isenabled()),
+    ):
+        _ = decode_papers(encoded, backend="json")
+        _ = decode_papers(encoded, backend="json", pause_gc=True)
+
+    assert seen == [True, True, False, False]
+    assert gc.isenabled()
+
+
+def test_json_backend_output_is_plain_json_of_to_dict():
+    papers = _papers()
+
+    encoded = encode_papers(papers, backend="json")
+
+    assert json.loads(encoded) == [paper.to_dict() for paper in papers]
+
+
+def test_unknown_backend_raises_value_error():
+    with pytest.raises(ValueError):
+        _ = encode_papers(_papers(), backend="pickle")
+
+
+def test_jsonl_writer_and_reader_stream_papers():
+    stream = io.BytesIO()
+
+    written = write_jsonl(stream, _papers())
+    stream.seek(0)
+    lines = stream.getvalue().splitlines()
+    restored = list(iter_jsonl(io.BytesIO(stream.getvalue() + b"\n\n")))
+
+    assert written == 2
+    assert len(lines) == 2
+    assert json.loads(lines[0])["link"] == "https://arxiv.org/abs/2401.00001"
+    assert restored == _papers()
@@ -0,0 +1,124 @@
+# pyright: reportMissingImports=false, reportUnknownVariableType=false, reportUnknownMemberType=false, reportUnknownParameterType=false, reportMissingParameterType=false, reportUnknownArgumentType=false
+
+import smtplib
+from email.message import EmailMessage
+from unittest.mock import patch
+
+import pytest
+
+from paper_digest.config import Config
+from paper_digest.smtp_session import SmtpSession
+
+
+def _config() -> Config:
+    return Config(
+        smtp_host="smtp.example.com",
+        smtp_port=587,
+        smtp_user="user@example.com",
+        smtp_password="secret",
+        email_from="from@example.com",
+        email_to="to@example.com",
+        arxiv_url="https://arxiv.org/list/cond-mat/new",
+        nature_url="https://www.nature.com/subjects/physical-sciences/ncomms",
+        user_agent="PaperDigestTests/1.0",
+        keywords=["spin-orbit torque", "mram"],
+    )
+
+
+def _message(to: str) -> EmailMessage:
+    message = EmailMessage()
+    message["To"] = to
+    message.set_content("digest")
+    return message
+
+
+@patch("smtplib.SMTP")
+def test_session_does_not_connect_until_first_send(mock_smtp):
+    with SmtpSession(_config()):
+        pass
+
+    mock_smtp.assert_not_called()
+
+
+@patch("smtplib.SMTP")
+def test_session_sends_many_messages_over_one_login(mock_smtp):
+    server = mock_smtp.return_value.__enter__.return_value
+
+    with SmtpSession(_config()) as session:
+        for index in range(3):
+            session.send(_message(f"reader{index}@example.com"))
+
+    mock_smtp.assert_called_once_with("smtp.example.com", 587, timeout=60.0)
+    server.starttls.assert_called_once_with()
+    server.login.assert_called_once_with("user@example.com", "secret")
+    assert server.send_message.call_count == 3
+    mock_smtp.return_value.__exit__.assert_called_once()
+    assert session.connections_opened == 1
+
+
+@patch("smtplib.SMTP")
+def test_session_skips_starttls_and_login_for_plain_local_relays(mock_smtp):
+    server = mock_smtp.return_value.__enter__.return_value
+    config = _config()
+    config.smtp_starttls = False
+    config.smtp_user = ""
+
+    with SmtpSession(config) as session:
+        session.send(_message("reader@example.com"))
+
+    server.starttls.assert_not_called()
+    server.login.assert_not_called()
+    server.send_message.assert_called_once()
+
+
+@patch("smtplib.SMTP")
+def test_session_reconnects_once_when_server_disconnects(mock_smtp):
+    server = mock_smtp.return_value.__enter__.return_value
+    server.send_message.side_effect = [
+        smtplib.SMTPServerDisconnected("gone"),
+        {},
+    ]
+
+    with SmtpSession(_config()) as session:
+        session.send(_message("reader@example.com"))
+
+    assert mock_smtp.call_count == 2
+    assert server.login.call_count == 2
+    assert server.send_message.call_count == 2
+    assert session.connections_opened == 2
+
+
+@patch("smtplib.SMTP")
+def test_session_reconnects_when_the_relay_times_out(mock_smtp):
+    config = _config()
+    config.smtp_timeout = 5.0
+    server = mock_smtp.return_value.__enter__.return_value
+    server.send_message.side_effect = [TimeoutError("timed out"), {}]
+
+    with SmtpSession(config) as session:
+        session.send(_message("reader@example.com"))
+
+    mock_smtp.assert_called_with("smtp.example.com", 587, timeout=5.0)
+    assert mock_smtp.call_count == 2
+    assert server.send_message.call_count == 2
+
+
+@patch("smtplib.SMTP")
+def test_session_does_not_retry_rejected_recipients(mock_smtp):
+    server = mock_smtp.return_value.__enter__.return_value
+    server.send_message.side_effect = smtplib.SMTPRecipientsRefused({})
+
+    with SmtpSession(_config()) as session:
+        with pytest.raises(smtplib.SMTPRecipientsRefused):
+            session.send(_message("reader@example.com"))
+
+    assert server.send_message.call_count == 1
+
+
+@patch("smtplib.SMTP")
+def test_session_rotates_connection_after_max_messages(mock_smtp):
+    with SmtpSession(_config(), max_messages=2) as session:
+        for index in range(5):
+            session.send(_message(f"reader{index}@example.com"))
+
+    assert session.connections_opened == 3
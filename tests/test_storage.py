@@ -67,3 +67,32 @@ def test_corrupted_state_file_warns_and_starts_fresh(tmp_path, caplog):
 
     assert not storage.is_seen(make_paper("https://arxiv.org/abs/2401.00001"))
     assert "starting fresh" in caplog.text.lower()
+
+
+def test_is_seen_link_matches_normalized_paper_links(tmp_path):
+    storage = PaperStorage(tmp_path / "seen.json")
+    storage.mark_seen(make_paper("https://arxiv.org/abs/2401.00001"))
+
+    assert storage.is_seen_link("  https://arxiv.org/abs/2401.00001 ")
+    assert not storage.is_seen_link("https://arxiv.org/abs/2401.00002")
+
+
+def test_queued_papers_count_as_seen_until_delivered(tmp_path):
+    state_file = tmp_path / "seen.json"
+    paper = make_paper("https://arxiv.org/abs/2401.00001")
+
+    storage = PaperStorage(state_file)
+    storage.mark_queued([paper])
+
+    reloaded = PaperStorage(state_file)
+    assert reloaded.is_seen(paper)
+    assert reloaded.is_queued(paper)
+
+    reloaded.mark_delivered([paper.link])
+
+    final = PaperStorage(state_file)
+    assert final.is_seen(paper)
+    assert not final.is_queued(paper)
+    assert json.loads(state_file.read_text(encoding="utf-8")) == {
+        "seen_links": ["https://arxiv.org/abs/2401.00001"]
+    }
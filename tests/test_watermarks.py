@@ -0,0 +1,85 @@
+# pyright: reportMissingImports=false, reportUnknownVariableType=false, reportUnknownMemberType=false, reportUnknownParameterType=false, reportMissingParameterType=false, reportUnknownArgumentType=false
+
+import json
+import logging
+
+from paper_digest.watermarks import Watermark, WatermarkStore, arxiv_id_key
+
+
+def test_arxiv_id_key_orders_across_months_and_digit_counts():
+    assert arxiv_id_key("1412.9999") < arxiv_id_key("1501.00001")
+    assert arxiv_id_key("2401.00010") > arxiv_id_key("2401.00009")
+    assert arxiv_id_key("not-an-id") == (0, 0)
+
+
+def test_watermark_comparisons_ignore_empty_values():
+    watermark = Watermark()
+
+    assert not watermark.is_before_published("2024-01-01")
+
+    watermark.advance_published("2024-01-15")
+    watermark.advance_published("2024-01-10")
+    watermark.advance_arxiv_id("2401.00005")
+    watermark.advance_arxiv_id("2401.00002")
+
+    assert watermark.published == "2024-01-15"
+    assert watermark.arxiv_id == "2401.00005"
+    assert watermark.is_before_published("2024-01-14")
+    assert not watermark.is_before_published("2024-01-15")
+    assert not watermark.is_before_published("")
+
+
+def test_store_does_not_create_file_until_commit(tmp_path):
+    state_file = tmp_path / "watermarks.json"
+    store = WatermarkStore(state_file)
+
+    store.commit()
+
+    assert not state_file.exists()
+    assert store.get("arxiv") == Watermark()
+
+
+def test_staged_watermarks_persist_only_after_commit(tmp_path):
+    state_file = tmp_path / "watermarks.json"
+    store = WatermarkStore(state_file)
+
+    watermark = store.get("arxiv")
+    watermark.arxiv_id = "2401.00005"
+    store.stage("arxiv", watermark)
+
+    assert store.get("arxiv").arxiv_id == ""
+    assert WatermarkStore(state_file).get("arxiv").arxiv_id == ""
+
+    store.commit()
+
+    assert store.get("arxiv").arxiv_id == "2401.00005"
+    assert WatermarkStore(state_file).get("arxiv").arxiv_id == "2401.00005"
+    loaded = json.loads(state_file.read_text(encoding="utf-8"))
+    assert loaded["arxiv"]["arxiv_id"] == "2401.00005"
+
+
+def test_corrupted_watermarks_warn_and_start_fresh(tmp_path, caplog):
+    state_file = tmp_path / "watermarks.json"
+    state_file.write_text("[not valid", encoding="utf-8")
+
+    with caplog.at_level(logging.WARNING):
+        store = WatermarkStore(state_file)
+
+    assert store.get("nature") == Watermark()
+    assert "starting fresh" in caplog.text.lower()
+
+
+def test_changed_compares_staged_against_committed(tmp_path):
+    store = WatermarkStore(tmp_path / "watermarks.json")
+    assert store.changed("nature") is False
+
+    store.stage("nature", store.get("nature"))
+    assert store.changed("nature") is False
+
+    watermark = store.get("nature")
+    watermark.etag = '"v2"'
+    store.stage("nature", watermark)
+    assert store.changed("nature") is True
+
+    store.commit()
+    assert store.changed("nature") is False